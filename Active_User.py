@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
+
+from engine import TokenomicsParams, passive_earnings, simulate
 
 st.set_page_config(page_title="Active User", layout="wide")
 st.title("🚀 Active User Fee Earnings")
@@ -14,30 +15,17 @@ with st.sidebar:
     st.markdown(f"**Current Value:** ${my_tokens * initial_price:,.2f}")
 
 # Constants
-initial_xtokens = 16_000_000
-locked_tokens = 84_000_000
-weekly_fees = 20_000
-base_emission = 800_000
-decay_percent = 2.0
-decay_rate = 1 - (decay_percent / 100)
-weeks = 104
+params = TokenomicsParams(initial_price=initial_price, base_emission=800_000)
 
 # Simulation
-weeks_array = np.arange(weeks)
-weekly_emissions = base_emission * (decay_rate ** weeks_array)
-cumulative_emissions = np.cumsum(weekly_emissions)
-circulating_supply = initial_xtokens + cumulative_emissions
-
-user_share = my_tokens / circulating_supply
-user_weekly_fees = user_share * weekly_fees * bonus
-user_cumulative_fees = np.cumsum(user_weekly_fees)
-relative_pct = (user_cumulative_fees / (my_tokens * initial_price)) * 100
+simulation = simulate(params)
+passive = passive_earnings(my_tokens, simulation.supply.circulating, params.weekly_fees * bonus, initial_price)
 
 df = pd.DataFrame({
-    "Week": weeks_array,
-    "Your Weekly Fees": user_weekly_fees,
-    "Cumulative Fees": user_cumulative_fees,
-    "Relative Earnings (%)": relative_pct
+    "Week": simulation.weeks,
+    "Your Weekly Fees": passive.weekly_fees,
+    "Cumulative Fees": passive.cumulative_fees,
+    "Relative Earnings (%)": passive.relative_pct
 }).set_index("Week")
 
 # Plot
@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from engine import TokenomicsParams, lstoken_earnings, passive_earnings, passive_frame, simulate
 
 st.set_page_config(page_title="Passive User", layout="wide")
 st.title("🧍 Passive User Fee Earnings")
@@ -13,53 +13,21 @@ with st.sidebar:
     st.markdown(f"**Current Value:** ${my_tokens * initial_price:,.2f}")
 
 # --- Shared assumptions (from Home.py) ---
-initial_xtokens = 16_000_000
-locked_tokens = 84_000_000
-weekly_fees = 20_000
-base_emission = 800_000
-decay_percent = 2.0
-decay_rate = 1 - (decay_percent / 100)
-weeks = 104
+params = TokenomicsParams(initial_price=initial_price, base_emission=800_000)
+weekly_fees = params.weekly_fees
 
 # --- Simulate emissions and supply ---
-weeks_array = np.arange(weeks)
-weekly_emissions = base_emission * (decay_rate ** weeks_array)
-cumulative_emissions = np.cumsum(weekly_emissions)
-circulating_supply = initial_xtokens + cumulative_emissions
+simulation = simulate(params)
+circulating_supply = simulation.supply.circulating
 
 # --- Passive user: Fixed holding ---
-user_share = my_tokens / circulating_supply
-user_weekly_fees = user_share * weekly_fees
-user_cumulative_fees = np.cumsum(user_weekly_fees)
-relative_pct = (user_cumulative_fees / (my_tokens * initial_price)) * 100
+passive = passive_earnings(my_tokens, circulating_supply, weekly_fees, initial_price)
 
 # --- Self-compounding version (lsToken) ---
-my_ls_tokens = my_tokens
-ls_token_holdings = []
-ls_fees = []
-
-for i in range(weeks):
-    supply = circulating_supply[i]
-    share = my_ls_tokens / supply
-    weekly_fee = share * weekly_fees
-    my_ls_tokens += weekly_fee / initial_price  # reinvest fees at fixed price
-    ls_token_holdings.append(my_ls_tokens)
-    ls_fees.append(weekly_fee)
-
-cumulative_ls_fees = np.cumsum(ls_fees)
-relative_ls_pct = (cumulative_ls_fees / (my_tokens * initial_price)) * 100
+ls_token = lstoken_earnings(my_tokens, circulating_supply, weekly_fees, initial_price)
 
 # --- DataFrame ---
-df = pd.DataFrame({
-    "Week": weeks_array,
-    "Your Weekly Fees": user_weekly_fees,
-    "Cumulative Fees": user_cumulative_fees,
-    "Relative Earnings (%)": relative_pct,
-    "lsToken Weekly Fees": ls_fees,
-    "lsToken Cumulative Fees": cumulative_ls_fees,
-    "lsToken Relative Earnings (%)": relative_ls_pct,
-    "lsToken Holdings": ls_token_holdings,
-}).set_index("Week")
+df = passive_frame(simulation.weeks, passive, ls_token)
 
 # --- Plots ---
 st.subheader("📊 Fee Earnings Over Time")
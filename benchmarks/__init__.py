@@ -0,0 +1 @@
+"""Timing benchmarks for the simulation kernels and full page reruns (``python -m benchmarks.run``)."""
@@ -0,0 +1,191 @@
+"""Benchmark the engine kernels and full page reruns.
+
+    python -m benchmarks.run -o bench.json
+    python -m benchmarks.run -o bench.json --compare baseline.json --threshold 1.25
+
+Kernels are timed across horizons (one configuration, 10 weeks to 1M steps)
+and across batch sizes (1 to 1M holders or configurations at a short
+horizon). Pages are executed end to end through Streamlit's ``AppTest``;
+the cold sample of each page starts from an empty ``RESULT_CACHE``.
+Results are written as JSON; ``--compare`` flags every case that got slower
+than ``threshold`` times its baseline and exits non-zero if any did.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from engine import (
+    DEFAULT_PARAMS,
+    DEFAULT_USER,
+    RESULT_CACHE,
+    emission_schedule,
+    lstoken_earnings,
+    passive_earnings,
+    supply_curve,
+    volume_rewards,
+    voting_earnings,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+HORIZONS = (10, 104, 520, 10_000, 100_000, 1_000_000)
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+QUICK_LIMIT = 10_000
+BATCH_WEEKS = 10
+PAGES = ("streamlit_app.py", "pages/1_Passive_User.py", "pages/2_Active_User.py")
+DEFAULT_THRESHOLD = 1.25
+
+
+# --- Timing ---
+def measure(func, min_time=0.2, repeat=5):
+    """Best and median seconds per call, looping each sample until it lasts ``min_time / repeat``."""
+    started = time.perf_counter()
+    func()
+    single = time.perf_counter() - started
+    loops = max(1, int(min_time / repeat / max(single, 1e-9)))
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return min(samples), statistics.median(samples)
+
+
+# --- Kernel cases ---
+def _kernels(weeks, batch):
+    """Callables for every kernel at ``weeks`` steps over a leading axis of ``batch`` rows."""
+    p, u = DEFAULT_PARAMS, DEFAULT_USER
+    column = (lambda value: np.full((batch, 1), value, dtype=float)) if batch > 1 else (lambda value: value)
+    base, decay = column(p.base_emission), column(p.decay_percent)
+    emission = emission_schedule(base, decay, weeks)
+    supply = supply_curve(emission.cumulative, p.initial_xtokens, p.locked_tokens).circulating
+    # holder batches share one supply curve; configuration batches (emission/supply) do not
+    shared = emission_schedule(p.base_emission, p.decay_percent, weeks)
+    shared_supply = supply_curve(shared.cumulative, p.initial_xtokens, p.locked_tokens).circulating
+    holders = column(u.my_tokens)
+
+    return {
+        "emission": lambda: emission_schedule(base, decay, weeks),
+        "supply": lambda: supply_curve(emission.cumulative, p.initial_xtokens, p.locked_tokens),
+        "passive": lambda: passive_earnings(holders, shared_supply, p.weekly_fees, p.initial_price),
+        "lstoken": lambda: lstoken_earnings(holders, shared_supply, p.weekly_fees, p.initial_price),
+        "voting": lambda: voting_earnings(column(u.voting_tokens), holders, shared_supply,
+                                          p.weekly_fees, p.initial_price),
+        "volume": lambda: volume_rewards(shared.weekly, column(u.multiplier_tokens), u.reference_stake,
+                                         u.asset_weight, u.total_volume, u.user_volume),
+    }
+
+
+def kernel_cases(quick=False):
+    horizons = [h for h in HORIZONS if not quick or h <= QUICK_LIMIT]
+    batches = [b for b in BATCH_SIZES if not quick or b <= QUICK_LIMIT]
+    for weeks in horizons:
+        yield weeks, 1
+    for batch in batches:
+        if batch > 1:
+            yield BATCH_WEEKS, batch
+
+
+def run_kernels(quick=False, only=None):
+    results = []
+    for weeks, batch in kernel_cases(quick):
+        for kernel, func in _kernels(weeks, batch).items():
+            if only and kernel not in only:
+                continue
+            best, median = measure(func)
+            results.append({"name": f"kernel/{kernel}/weeks={weeks}/batch={batch}", "kind": "kernel",
+                            "kernel": kernel, "weeks": weeks, "batch": batch, "best": best, "median": median})
+            print(f"{results[-1]['name']:<48} {best * 1e3:>10.3f} ms", file=sys.stderr)
+    return results
+
+
+# --- Page cases ---
+def run_pages(weeks_values=(104, 520), repeat=5):
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(ROOT))
+    results = []
+    for page in PAGES:
+        for weeks in weeks_values:
+            samples = []
+            # a discarded run pays the imports. The cold sample then starts from an empty RESULT_CACHE, which holds
+            # every memoized result (the ROI surface included); the Active page graph lives in each app's own session
+            for run in range(repeat + 2):
+                if run == 1:
+                    RESULT_CACHE.clear()
+                app = AppTest.from_file(str(ROOT / page), default_timeout=120)
+                for key, value in DEFAULT_PARAMS.replace(weeks=weeks).to_dict().items():
+                    app.session_state[key] = value
+                started = time.perf_counter()
+                app.run()
+                samples.append(time.perf_counter() - started)
+                if app.exception:
+                    raise RuntimeError(f"{page} raised: {app.exception[0].message}")
+            for label, values in (("cold", samples[1:2]), ("warm", samples[2:])):
+                name = f"page/{page}/weeks={weeks}/{label}"
+                results.append({"name": name, "kind": "page", "page": page, "weeks": weeks,
+                                "best": min(values), "median": statistics.median(values)})
+                print(f"{name:<48} {statistics.median(values) * 1e3:>10.3f} ms", file=sys.stderr)
+    return results
+
+
+# --- Comparison ---
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """``(name, baseline, current, ratio)`` for every case slower than ``threshold`` x baseline."""
+    before = {case["name"]: case["median"] for case in baseline["results"]}
+    regressions = []
+    for case in current["results"]:
+        if case["name"] in before and before[case["name"]] > 0:
+            ratio = case["median"] / before[case["name"]]
+            if ratio > threshold:
+                regressions.append((case["name"], before[case["name"]], case["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="bench_output.json", help="JSON results file")
+    parser.add_argument("--quick", action="store_true", help=f"skip horizons and batches above {QUICK_LIMIT:,}")
+    parser.add_argument("--kernels", nargs="*", help="only these kernels (default: all)")
+    parser.add_argument("--no-pages", action="store_true", help="skip the AppTest page reruns")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_kernels(args.quick, args.kernels)
+    if not args.no_pages:
+        results += run_pages()
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.2f}x against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
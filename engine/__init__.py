@@ -0,0 +1,133 @@
+"""Headless simulation engine shared by the Streamlit pages, batch jobs and benchmarks.
+
+Nothing in this package imports Streamlit.
+"""
+from .graph import DependencyGraph, Node, active_user_graph
+from .kernels import (
+    active_earnings,
+    check_asset_weights,
+    cumulative_fee_curve,
+    emission_schedule,
+    lstoken_earnings,
+    lstoken_growth,
+    multi_asset_rewards,
+    passive_earnings,
+    simulate,
+    staking_multiplier,
+    supply_curve,
+    valuation_curve,
+    volume_rewards,
+    voting_earnings,
+)
+from .columnar import ColumnarResult
+from .cache import RESULT_CACHE, CacheStats, ResultCache, memoize
+from .params import DEFAULT_PARAMS, DEFAULT_USER, TokenomicsParams, UserParams
+from .results import (
+    ActiveResult,
+    EmissionResult,
+    LsTokenResult,
+    MultiAssetResult,
+    PassiveResult,
+    SimulationResult,
+    SupplyResult,
+    ValuationResult,
+    VolumeResult,
+    VotingResult,
+    passive_columns,
+    passive_frame,
+)
+from .sweep import (
+    BATCH_METRICS,
+    EMISSION_PARAMETERS,
+    SWEEP_METRICS,
+    SWEEP_PARAMETERS,
+    SweepResult,
+    evaluate_batch,
+    run_sweep,
+    swept_parameters,
+)
+from .montecarlo import MC_SERIES, MarketModel, MonteCarloResult, run_monte_carlo
+from .views import (
+    active_view,
+    emission_for,
+    main_frame,
+    market_inputs,
+    passive_view,
+    simulation_for,
+    supply_for,
+    volume_for,
+    voting_for,
+)
+from .population import (
+    STRATEGIES,
+    ActiveStrategy,
+    Population,
+    PopulationResult,
+    read_population_csv,
+    sample_population,
+    sampled_population_for,
+    simulate_population,
+)
+from .optimizer import AllocationResult, optimal_allocation_for, optimize_allocation, pareto_frontier
+from .competition import CompetitionResult, read_traders, sample_traders, solve_competition
+from .series import (
+    FILL_METHODS,
+    SERIES_FIELDS,
+    InputSeries,
+    SeriesFile,
+    align_series,
+    load_series_file,
+    series_from_mapping,
+)
+from .vesting import TRANCHE_FIELDS, VestingSchedule, unlock_schedule
+from .emissions import (
+    Custom,
+    EmissionCurve,
+    Geometric,
+    Halving,
+    LinearTaper,
+    Piecewise,
+    curve_for,
+    load_custom_emission,
+)
+from .resolution import (
+    PERIODS,
+    RESOLUTIONS,
+    Resolution,
+    active_frame_at,
+    main_frame_at,
+    passive_frame_at,
+    resolution_from_mapping,
+)
+from .sensitivity import (
+    ACTIVE_METRICS,
+    PASSIVE_METRICS,
+    SENSITIVITY_METRICS,
+    SENSITIVITY_PARAMETERS,
+    SensitivityResult,
+    sensitivity_analysis,
+    sensitivity_for,
+)
+from .surface import SURFACE_COLUMNS, RoiSurface, roi_surface, roi_surface_for
+from .compare import COMPARE_METRICS, MAX_SCENARIOS, ComparisonResult, compare_scenarios
+from .store import (
+    Scenario,
+    ScenarioStore,
+    default_store,
+    diff_inputs,
+    diff_results,
+    named_arrays,
+    scenario_key,
+)
+from .profiling import (
+    RunProfile,
+    append_profile_log,
+    current_profile,
+    lap,
+    latency_percentiles,
+    read_profile_log,
+    stage,
+    start_profile,
+    stop_profile,
+    timed,
+)
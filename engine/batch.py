@@ -0,0 +1,215 @@
+"""Command-line batch runner for offline scenario files.
+
+    python -m engine.batch scenarios.csv -o results.parquet --workers 4
+
+Each scenario (a CSV row or a YAML mapping) may set any field of
+``TokenomicsParams`` or ``UserParams``; missing fields take the page
+defaults and ``asset_weight`` is a fraction (0.10 for 10%). An optional
+``scenario`` field names the row in the output. Scenarios are read lazily and
+evaluated in worker processes, and each finished chunk is appended to the
+output straight away, so memory stays flat however long the input is.
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import fields
+from itertools import islice
+
+import pandas as pd
+
+from .columnar import ColumnarResult
+from .kernels import active_earnings, lstoken_earnings, passive_earnings, simulate
+from .params import DEFAULT_PARAMS, DEFAULT_USER, TokenomicsParams, UserParams
+from .results import passive_columns
+
+SCENARIO_FIELD = "scenario"
+PARAM_FIELDS = tuple(f.name for f in fields(TokenomicsParams) if f.name not in ("vesting", "emission_curve"))
+USER_FIELDS = tuple(f.name for f in fields(UserParams))
+DEFAULT_CHUNK_SIZE = 64
+
+
+# --- Reading scenarios ---
+def _read_csv(path):
+    with open(path, newline="") as handle:
+        yield from csv.DictReader(handle)
+
+
+def _read_yaml(path):
+    try:
+        import yaml
+    except ImportError as exc:
+        raise SystemExit("Reading YAML scenarios requires PyYAML (pip install pyyaml).") from exc
+    with open(path) as handle:
+        for document in yaml.safe_load_all(handle):
+            if isinstance(document, dict) and "scenarios" in document:
+                document = document["scenarios"]
+            yield from (document if isinstance(document, list) else [document])
+
+
+def read_scenarios(path):
+    """Yield ``(name, TokenomicsParams, UserParams)`` for every scenario in ``path``."""
+    reader = _read_yaml if path.endswith((".yaml", ".yml")) else _read_csv
+    for index, row in enumerate(reader(path)):
+        if None in row:  # csv.DictReader keeps values past the header under None
+            raise ValueError(f"Scenario {index}: row has {len(row[None])} more fields than the header")
+        unknown = set(row) - set(PARAM_FIELDS) - set(USER_FIELDS) - {SCENARIO_FIELD}
+        if unknown:
+            raise ValueError(f"Scenario {index}: unknown fields {sorted(unknown, key=str)}")
+        values = {key: value for key, value in row.items() if value not in (None, "") and key != SCENARIO_FIELD}
+        params = DEFAULT_PARAMS.replace(**{
+            key: int(float(value)) if key == "weeks" else float(value)
+            for key, value in values.items() if key in PARAM_FIELDS
+        })
+        user = DEFAULT_USER.replace(**{key: float(value) for key, value in values.items() if key in USER_FIELDS})
+        yield str(row.get(SCENARIO_FIELD) or index), params, user
+
+
+# --- Evaluating scenarios ---
+def evaluate_scenario(name, params, user, detail="summary"):
+    """All page outputs for one scenario: a dict of final-week values, or a frame with every week."""
+    simulation = simulate(params)
+    supply = simulation.supply.circulating
+    passive = passive_earnings(user.my_tokens, supply, params.weekly_fees, params.initial_price)
+    ls_token = lstoken_earnings(user.my_tokens, supply, params.weekly_fees, params.initial_price)
+    active = active_earnings(simulation, params.weekly_fees, params.initial_price, **user.to_dict())
+
+    if detail == "weekly":
+        frame = ColumnarResult.join(
+            simulation.to_columns(),
+            passive_columns(simulation.weeks, passive, ls_token),
+            active.to_columns(simulation.weeks),
+        ).to_pandas().reset_index()
+        frame.insert(0, SCENARIO_FIELD, name)
+        return frame
+
+    return {
+        SCENARIO_FIELD: name,
+        **{name: getattr(params, name) for name in PARAM_FIELDS},
+        **user.to_dict(),
+        "Circulating Voting Supply": supply[-1],
+        "Valuation ($)": simulation.valuation.valuation[-1],
+        "FDV ($)": simulation.valuation.fdv[-1],
+        "Cumulative Fees ($)": simulation.cumulative_fees[-1],
+        "Cumulative Fees": passive.cumulative_fees[-1],
+        "Relative Earnings (%)": passive.relative_pct[-1],
+        "lsToken Cumulative Fees": ls_token.cumulative_fees[-1],
+        "lsToken Relative Earnings (%)": ls_token.relative_pct[-1],
+        "lsToken Holdings": ls_token.holdings[-1],
+        "Cumulative Voting Fees": active.voting.cumulative_fees[-1],
+        "Relative Voting Earnings (%)": active.voting.relative_pct[-1],
+        "Cumulative Volume Rewards": active.volume.cumulative_rewards[-1],
+        "Voting APR (%)": active.voting.apr[-1],
+        "Volume APR (%)": active.volume.apr[-1],
+    }
+
+
+def _evaluate_chunk(chunk, detail):
+    results = [evaluate_scenario(name, params, user, detail) for name, params, user in chunk]
+    if detail == "weekly":
+        return pd.concat(results, ignore_index=True)
+    return pd.DataFrame(results)
+
+
+# --- Writing results ---
+class CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self._header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    """Appends one row group per finished chunk; the schema is fixed by the first chunk."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise SystemExit("Writing Parquet requires pyarrow (pip install pyarrow).") from exc
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self._writer = None
+
+    def write(self, frame):
+        table = self._pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(path):
+    return ParquetSink(path) if path.endswith(".parquet") else CsvSink(path)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_batch(scenarios, sink, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, detail="summary"):
+    """Evaluate ``scenarios`` and write each chunk to ``sink`` as soon as it finishes.
+
+    At most ``2 * workers`` chunks are in flight, so input is consumed lazily.
+    Returns the number of scenarios written.
+    """
+    written = 0
+    if workers <= 1:
+        for chunk in _chunks(scenarios, chunk_size):
+            sink.write(_evaluate_chunk(chunk, detail))
+            written += len(chunk)
+        return written
+
+    chunks = _chunks(scenarios, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for chunk in islice(chunks, 2 * workers):
+            pending[pool.submit(_evaluate_chunk, chunk, detail)] = len(chunk)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                sink.write(future.result())
+                written += pending.pop(future)
+                for chunk in islice(chunks, 1):
+                    pending[pool.submit(_evaluate_chunk, chunk, detail)] = len(chunk)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m engine.batch",
+        description="Evaluate tokenomics scenarios from a CSV or YAML file and stream results to CSV or Parquet.",
+        epilog=f"Scenario fields: {', '.join([SCENARIO_FIELD, *PARAM_FIELDS, *USER_FIELDS])}.",
+    )
+    parser.add_argument("scenarios", help="scenario file (.csv, .yaml or .yml)")
+    parser.add_argument("-o", "--output", required=True, help="results file (.csv or .parquet)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="scenarios per task")
+    parser.add_argument("--detail", choices=("summary", "weekly"), default="summary",
+                        help="one final-week row per scenario, or every week")
+    args = parser.parse_args(argv)
+
+    sink = open_sink(args.output)
+    try:
+        count = run_batch(read_scenarios(args.scenarios), sink, args.workers, args.chunk_size, args.detail)
+    finally:
+        sink.close()
+    print(f"Wrote {count:,} scenarios to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
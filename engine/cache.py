@@ -0,0 +1,166 @@
+"""Parameter-keyed memoization for simulation results.
+
+The cache lives at module level, so every Streamlit session and page in the
+process shares it: switching pages with the same parameters reuses the
+supply curve instead of recomputing it. Entries are evicted least recently
+used first once either ``max_entries`` or ``max_bytes`` is exceeded.
+"""
+import dataclasses
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def nbytes_of(value):
+    """Approximate memory held by a cached value (arrays, frames, dataclasses and containers)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(getattr(value, "nbytes", None), int):  # e.g. ColumnarResult
+        return value.nbytes
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(nbytes_of(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, dict):
+        return sum(nbytes_of(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes_of(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Mark arrays read-only so a shared cached result cannot be mutated by one caller.
+
+    Returns whether ``value`` holds pandas objects, which cannot be made
+    read-only and are copied for every caller instead (see ``_private``).
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+        return False
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return True
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        values = [getattr(value, f.name) for f in dataclasses.fields(value)]
+    elif isinstance(value, dict):
+        values = list(value.values())
+    elif isinstance(value, (list, tuple)):
+        values = value
+    else:
+        return False
+    return any([_freeze(v) for v in values])
+
+
+def _private(value):
+    """``value`` with every DataFrame and Series in it copied, so one caller's changes stay its own."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        changed = {f.name: _private(getattr(value, f.name)) for f in dataclasses.fields(value) if f.init}
+        return dataclasses.replace(value, **changed)
+    if isinstance(value, dict):
+        return {k: _private(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_private(v) for v in value]
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return tuple(_private(v) for v in value)
+    return value
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                value, _, frames = self._entries[key]
+                return _private(value) if frames else value
+            self._misses += 1
+
+        value = compute()
+        frames = self.put(key, value)
+        return _private(value) if frames else value
+
+    def put(self, key, value):
+        """Store ``value`` (frozen in place); returns whether it holds pandas objects."""
+        frames = _freeze(value)
+        size = nbytes_of(value)
+        if size > self.max_bytes:
+            return frames
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, frames)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+        return frames
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._bytes)
+
+
+RESULT_CACHE = ResultCache()
+
+
+def memoize(func=None, *, cache=None):
+    """Cache ``func`` on its (hashable) arguments in ``cache`` (``RESULT_CACHE`` by default)."""
+    if func is None:
+        return functools.partial(memoize, cache=cache)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        target = RESULT_CACHE if cache is None else cache
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        return target.get_or_compute(key, lambda: func(*args, **kwargs))
+
+    return wrapper
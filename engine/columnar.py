@@ -0,0 +1,87 @@
+"""Compact columnar results: named series sharing one index in a single 2-D block.
+
+Every series is a row of one C-contiguous ``(columns, rows)`` array, so
+``result[name]`` is a zero-copy view and the whole result is one allocation
+that the cache can size exactly. Blocks are read-only once built, which
+makes cached results safe to share. pandas and Arrow objects are built only
+when a page displays or exports the data (``to_pandas``, ``to_arrow``),
+and usually only for the rows and columns it needs.
+"""
+import numpy as np
+import pandas as pd
+
+from .profiling import timed
+
+
+class ColumnarResult:
+    __slots__ = ("index", "index_name", "names", "block", "_positions")
+
+    def __init__(self, index, names, block, index_name="Week"):
+        block = np.ascontiguousarray(block)
+        if block.shape != (len(names), len(index)):
+            raise ValueError(f"Block of shape {block.shape} does not match {len(names)} columns × {len(index)} rows")
+        block.flags.writeable = False
+        self.index = np.asarray(index)
+        self.index_name = index_name
+        self.names = tuple(names)
+        self.block = block
+        self._positions = {name: position for position, name in enumerate(self.names)}
+
+    @classmethod
+    def from_arrays(cls, index, columns, index_name="Week", dtype=np.float64):
+        """Copy ``columns`` (name -> array or scalar) into one block of ``dtype``."""
+        block = np.empty((len(columns), len(index)), dtype=dtype)
+        for row, values in zip(block, columns.values()):
+            row[...] = values
+        return cls(index, tuple(columns), block, index_name)
+
+    @classmethod
+    def join(cls, *results):
+        """Side-by-side columns of results that share one index."""
+        first = results[0]
+        return cls(first.index, sum((result.names for result in results), ()),
+                   np.concatenate([result.block for result in results]), first.index_name)
+
+    def __getitem__(self, name):
+        return self.block[self._positions[name]]
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return f"ColumnarResult({len(self.names)} columns × {len(self):,} rows, {self.dtype})"
+
+    @property
+    def columns(self):
+        return self.names
+
+    @property
+    def dtype(self):
+        return self.block.dtype
+
+    @property
+    def nbytes(self):
+        return self.block.nbytes + self.index.nbytes
+
+    def astype(self, dtype):
+        return self if self.dtype == dtype else ColumnarResult(self.index, self.names, self.block.astype(dtype),
+                                                               self.index_name)
+
+    @timed("dataframe")
+    def to_pandas(self, columns=None, rows=slice(None)):
+        """A DataFrame of ``columns`` (default all) at ``rows`` (a slice or index array)."""
+        names = self.names if columns is None else tuple(columns)
+        block = self.block if columns is None else self.block[[self._positions[name] for name in names]]
+        return pd.DataFrame(block[:, rows].T, columns=list(names),
+                            index=pd.Index(self.index[rows], name=self.index_name))
+
+    def to_arrow(self, columns=None):
+        """A ``pyarrow.Table`` with the index as its first column; the float columns are not copied."""
+        import pyarrow as pa
+
+        names = self.names if columns is None else tuple(columns)
+        return pa.Table.from_arrays([pa.array(self.index), *(pa.array(self[name]) for name in names)],
+                                    names=[self.index_name, *names])
@@ -0,0 +1,139 @@
+"""Side-by-side comparison of pinned tokenomics scenarios.
+
+Scenarios are stacked into one ``(scenarios, weeks)`` block and go through
+``evaluate_batch`` together. Geometric emissions broadcast over a
+``(scenarios, 1)`` column of base emissions and decay rates, while other
+curves and vesting schedules fill their own rows. Each scenario's rows are
+cached on its parameters, so pinning one more scenario evaluates only that
+one, and the comparison is assembled from the cache. Scenarios are evaluated
+on the longest horizon and cut back to their own, padded with NaN beyond it.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .cache import RESULT_CACHE
+from .columnar import ColumnarResult
+from .kernels import emission_schedule
+from .params import DEFAULT_USER
+from .profiling import timed
+from .sweep import evaluate_batch
+
+COMPARE_METRICS = (
+    "Weekly Emission",
+    "Circulating Voting Supply",
+    "Total Supply (FDV)",
+    "Valuation ($)",
+    "FDV ($)",
+    "Cumulative Fees",
+    "Relative Earnings (%)",
+    "lsToken Cumulative Fees",
+    "lsToken Relative Earnings (%)",
+)
+MAX_SCENARIOS = 6
+
+
+@dataclass(frozen=True)
+class ComparisonResult:
+    """One ``(scenarios, weeks)`` array per entry of ``COMPARE_METRICS``, NaN past each scenario's horizon."""
+
+    names: tuple
+    weeks: np.ndarray
+    horizons: tuple
+    series: dict
+    evaluated: int  # scenarios that were not cached and went through the kernels
+
+    @staticmethod
+    def column(metric, name):
+        return f"{metric} · {name}"
+
+    def to_columns(self, metrics=COMPARE_METRICS):
+        """One column per metric and scenario, named by ``column``."""
+        return ColumnarResult.from_arrays(self.weeks, {
+            self.column(metric, name): row
+            for metric in metrics for name, row in zip(self.names, self.series[metric])
+        })
+
+    def final(self, metrics=COMPARE_METRICS):
+        """Every metric in each scenario's final week, one row per scenario."""
+        last = np.array(self.horizons) - 1
+        rows = np.arange(len(self.names))
+        return pd.DataFrame({metric: self.series[metric][rows, last] for metric in metrics},
+                            index=pd.Index(self.names, name="Scenario"))
+
+    def deltas(self, baseline=None, metrics=COMPARE_METRICS):
+        """Final-week values per metric, with each scenario's change against ``baseline`` (default the first)."""
+        final = self.final(metrics).T.rename_axis("Metric")
+        baseline = self.names[0] if baseline is None else baseline
+        table = {}
+        for name in self.names:
+            table[name] = final[name]
+            if name != baseline:
+                table[f"{name} Δ"] = final[name] - final[baseline]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    table[f"{name} Δ%"] = (final[name] / final[baseline] - 1) * 100
+        return pd.DataFrame(table)
+
+
+def _evaluate(scenarios, my_tokens):
+    """Metric rows for each of ``scenarios`` (``TokenomicsParams``), computed as one stacked block."""
+    weeks = max(params.weeks for params in scenarios)
+    count = len(scenarios)
+
+    def column(name):
+        return np.array([float(getattr(params, name)) for params in scenarios])[:, None]
+
+    weekly = np.empty((count, weeks))
+    geometric = [index for index, params in enumerate(scenarios) if params.emission_curve is None]
+    if geometric:
+        weekly[geometric] = emission_schedule(column("base_emission")[geometric], column("decay_percent")[geometric],
+                                              weeks).weekly
+    for index, params in enumerate(scenarios):
+        if params.emission_curve is not None:
+            weekly[index] = params.emission_curve.weekly(weeks)
+
+    unlocked = unlocked_non_voting = None
+    if any(params.vesting is not None for params in scenarios):
+        unlocked, unlocked_non_voting = np.zeros((count, weeks)), np.zeros((count, weeks))
+        for index, params in enumerate(scenarios):
+            if params.vesting is not None:
+                unlocked[index] = params.vesting.cumulative_voting(weeks)
+                non_voting = params.vesting.cumulative_non_voting(weeks)
+                if non_voting is not None:
+                    unlocked_non_voting[index] = non_voting
+
+    columns = {name: column(name) for name in ("initial_xtokens", "locked_tokens", "weekly_fees", "initial_price")}
+    block = evaluate_batch({**columns, "my_tokens": my_tokens}, weeks, COMPARE_METRICS, weekly, unlocked,
+                           unlocked_non_voting)
+    return [
+        {metric: values[index, :params.weeks].copy() for metric, values in block.items()}
+        for index, params in enumerate(scenarios)
+    ]
+
+
+@timed("comparison")
+def compare_scenarios(scenarios, my_tokens=DEFAULT_USER.my_tokens, cache=None):
+    """Compare ``scenarios`` (name -> ``TokenomicsParams``) for a holder of ``my_tokens``.
+
+    Scenarios missing from ``cache`` (``RESULT_CACHE`` by default) are evaluated together in one block.
+    """
+    target = RESULT_CACHE if cache is None else cache
+    keys = {name: (__name__, "scenario", params, my_tokens) for name, params in scenarios.items()}
+    missing = list(dict.fromkeys(params for name, params in scenarios.items() if keys[name] not in target))
+    if missing:
+        for params, rows in zip(missing, _evaluate(missing, my_tokens)):
+            target.get_or_compute((__name__, "scenario", params, my_tokens), lambda rows=rows: rows)
+
+    # evicted in the meantime: evaluate that scenario on its own
+    rows = [target.get_or_compute(keys[name], lambda params=params: _evaluate([params], my_tokens)[0])
+            for name, params in scenarios.items()]
+    horizons = tuple(params.weeks for params in scenarios.values())
+    weeks = max(horizons, default=0)
+    series = {}
+    for metric in COMPARE_METRICS:
+        block = np.full((len(rows), weeks), np.nan)
+        for index, values in enumerate(rows):
+            block[index, :len(values[metric])] = values[metric]
+        series[metric] = block
+    return ComparisonResult(tuple(scenarios), np.arange(weeks), horizons, series, len(missing))
@@ -0,0 +1,120 @@
+"""Volume emissions when many traders stake for the multiplier at once.
+
+The Active page boosts only your own volume and treats everyone else as a
+fixed ``total_volume - user_volume``. Here each of K traders has its own
+volume, stake and reference stake. All boosted volumes are evaluated as one
+traders x weeks array, and each trader's emission share is its boosted volume
+over the pool of every boosted volume plus the unmodelled rest of the market.
+A trader's reference stake defaults to the mean stake of the others, so
+raising the average stake dilutes everyone's multiplier.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .kernels import WEEKS_PER_YEAR, _guarded_apr, staking_multiplier
+from .profiling import timed
+
+TRADER_FIELDS = ("name", "volume", "stake", "reference_stake")
+
+
+@dataclass(frozen=True)
+class CompetitionResult:
+    names: np.ndarray
+    multiplier: np.ndarray      # (traders, weeks)
+    boosted_volume: np.ndarray  # (traders, weeks)
+    share: np.ndarray           # (traders, weeks) fraction of the asset's emissions
+    weekly_rewards: np.ndarray  # (traders, weeks) tokens
+    cumulative_rewards: np.ndarray
+    apr: np.ndarray
+    market_share: np.ndarray    # (weeks,) share left to the unmodelled market
+
+    @property
+    def weeks(self):
+        return np.arange(self.share.shape[-1])
+
+    def summary(self):
+        """Final-week multiplier, share, APR and cumulative rewards per trader."""
+        return pd.DataFrame({
+            "Multiplier": self.multiplier[:, -1],
+            "Emission Share (%)": self.share[:, -1] * 100,
+            "Cumulative Rewards": self.cumulative_rewards[:, -1],
+            "APR (%)": self.apr[:, -1],
+        }, index=pd.Index(self.names, name="Trader"))
+
+    def to_frame(self, values="share", traders=None):
+        """One column per trader (all, or the given row indices), indexed by week."""
+        rows = np.arange(len(self.names)) if traders is None else np.asarray(traders)
+        data = getattr(self, values)[rows]
+        return pd.DataFrame(data.T, columns=self.names[rows], index=pd.Index(self.weeks, name="Week"))
+
+
+def default_references(stakes):
+    """Mean stake of the other traders, for every trader."""
+    stakes = np.asarray(stakes, dtype=float)
+    if len(stakes) < 2:
+        return np.zeros_like(stakes)
+    return (stakes.sum() - stakes) / (len(stakes) - 1)
+
+
+@timed("user kernels")
+def solve_competition(weekly_emissions, volumes, stakes, reference_stakes=None,
+                      asset_weight=0.10, total_volume=None, names=None):
+    """Emission shares of K traders competing for one asset's emissions.
+
+    ``reference_stakes`` entries that are NaN (or all of them, when omitted)
+    fall back to ``default_references``. ``total_volume`` is the asset's whole
+    volume; whatever the traders do not account for competes unboosted. It
+    defaults to the traders' combined volume.
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    stakes = np.asarray(stakes, dtype=float)
+    references = np.full_like(stakes, np.nan) if reference_stakes is None else np.asarray(reference_stakes, float)
+    references = np.where(np.isnan(references), default_references(stakes), references)
+    weeks = np.shape(weekly_emissions)[-1]
+
+    multiplier = staking_multiplier(stakes[:, None], references[:, None], weeks)
+    boosted = volumes[:, None] * multiplier
+    rest = 0.0 if total_volume is None else max(total_volume - volumes.sum(), 0.0)
+    pool = boosted.sum(axis=0) + rest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.nan_to_num(boosted / pool)
+        market_share = np.nan_to_num(rest / pool)
+
+    weekly = share * (weekly_emissions * asset_weight)
+    apr = _guarded_apr(stakes[:, None] > 0, weekly * WEEKS_PER_YEAR, stakes[:, None])
+    return CompetitionResult(
+        names=np.asarray(names if names is not None else [f"Trader {i + 1}" for i in range(len(volumes))], dtype=object),
+        multiplier=multiplier,
+        boosted_volume=boosted,
+        share=share,
+        weekly_rewards=weekly,
+        cumulative_rewards=np.cumsum(weekly, axis=-1),
+        apr=apr,
+        market_share=np.broadcast_to(market_share, (weeks,)),
+    )
+
+
+def read_traders(source):
+    """Traders from a CSV with ``volume`` and ``stake`` columns (``name`` and ``reference_stake`` optional)."""
+    frame = pd.read_csv(source)
+    missing = {"volume", "stake"} - set(frame)
+    if missing:
+        raise ValueError(f"Trader CSV needs columns {sorted(missing)}")
+    if "name" not in frame:
+        frame["name"] = [f"Trader {i + 1}" for i in range(len(frame))]
+    if "reference_stake" not in frame:
+        frame["reference_stake"] = np.nan
+    return frame[list(TRADER_FIELDS)]
+
+
+def sample_traders(n, median_volume=2_000_000, volume_sigma=1.0, median_stake=3000, stake_sigma=1.0, seed=0):
+    """``n`` traders with lognormal volumes and stakes around the given medians."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "name": [f"Trader {i + 1}" for i in range(n)],
+        "volume": median_volume * rng.lognormal(0, volume_sigma, n),
+        "stake": median_stake * rng.lognormal(0, stake_sigma, n),
+        "reference_stake": np.nan,
+    })
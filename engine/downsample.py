@@ -0,0 +1,57 @@
+"""Shape-preserving downsampling for long series (Largest-Triangle-Three-Buckets)."""
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of the ``threshold`` points of ``(x, y)`` that best preserve its visual shape.
+
+    The first and last points are always kept. Series at or under the budget
+    come back unchanged.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    edges = np.minimum(np.floor(np.arange(threshold) * every).astype(int) + 1, n)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < threshold else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_rows(x, series, point_budget):
+    """At most ``point_budget`` rows of a shared ``x`` that preserve the shape of every one of ``series``.
+
+    The budget is split evenly across the series, and the union of the rows
+    LTTB selects for each is thinned evenly if it still exceeds the budget
+    (more series than a third of the budget).
+    """
+    series = [np.nan_to_num(np.asarray(values, dtype=float)) for values in series]
+    n = len(series[0]) if series else len(x)
+    if n <= point_budget:
+        return np.arange(n)
+    share = max(3, point_budget // max(len(series), 1))
+    rows = np.unique(np.concatenate([lttb_indices(x, values, share) for values in series] or [np.arange(n)]))
+    if len(rows) > point_budget:
+        rows = rows[np.unique(np.linspace(0, len(rows) - 1, point_budget).round().astype(int))]
+    return rows
+
+
+def downsample_frame(df, point_budget):
+    """Keep the rows LTTB selects for any column of ``df``."""
+    if len(df) <= point_budget:
+        return df
+    x = np.arange(len(df)) if not np.issubdtype(df.index.dtype, np.number) else df.index.to_numpy()
+    return df.iloc[downsample_rows(x, (df[column].to_numpy(dtype=float) for column in df.columns), point_budget)]
@@ -0,0 +1,263 @@
+"""Emission curves: how many tokens are emitted in each week.
+
+Every curve materializes its weekly array only when asked (``schedule``).
+``cumulative_at(week)`` answers "total emitted by the end of ``week``" in
+closed form, or from prefix sums for data-backed curves. ``weeks_until``
+answers "first week by which ``amount`` tokens have been emitted" by
+inverting that closed form, or by a binary search over it. Either way, no
+array is built.
+
+The main page's base emission and weekly decay form a ``Geometric`` curve;
+``TokenomicsParams.emission`` returns it unless another curve is set.
+"""
+import bisect
+import hashlib
+import io
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .cache import RESULT_CACHE
+from .kernels import emission_schedule
+from .results import EmissionResult
+
+SEARCH_LIMIT = 10**9  # weeks; ``weeks_until`` gives up (returns None) beyond this
+
+
+class EmissionCurve(ABC):
+    """Base class of every curve; subclasses provide ``weekly`` and ``cumulative_at``."""
+
+    @abstractmethod
+    def weekly(self, weeks):
+        """Emission in each of weeks ``0 .. weeks - 1``."""
+
+    @abstractmethod
+    def cumulative_at(self, week):
+        """Total emitted by the end of ``week``."""
+
+    def schedule(self, weeks):
+        """Weekly and cumulative emissions for weeks ``0 .. weeks - 1``."""
+        weekly = self.weekly(weeks)
+        return EmissionResult(np.arange(weeks), weekly, np.cumsum(weekly, axis=-1))
+
+    def per_step(self, steps, steps_per_week):
+        """Emission in each of ``steps`` (step indices) when a week has ``steps_per_week`` steps.
+
+        Each week's emission is spread evenly over its steps.
+        """
+        weeks = steps // steps_per_week
+        return self.weekly(int(weeks[-1]) + 1)[weeks] / steps_per_week
+
+    def weeks_until(self, amount, limit=SEARCH_LIMIT):
+        """First week whose cumulative emission reaches ``amount``, or ``None`` if it never does."""
+        if amount <= 0:
+            return 0
+        high = 1
+        while self.cumulative_at(high) < amount:
+            if high >= limit:
+                return None
+            high = min(high * 2, limit)
+        low = high // 2
+        while low < high:
+            middle = (low + high) // 2
+            if self.cumulative_at(middle) >= amount:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+
+@dataclass(frozen=True)
+class Geometric(EmissionCurve):
+    """``base * (1 - decay%) ** week``; ``base`` and ``decay_percent`` may be ``(n, 1)`` batches."""
+
+    base_emission: float
+    decay_percent: float
+
+    def weekly(self, weeks):
+        return emission_schedule(self.base_emission, self.decay_percent, weeks).weekly
+
+    def schedule(self, weeks):
+        return emission_schedule(self.base_emission, self.decay_percent, weeks)
+
+    def per_step(self, steps, steps_per_week):
+        # decays every step, scaled so each week's steps still add up to its weekly emission
+        ratio = 1 - self.decay_percent / 100
+        step_ratio = ratio ** (1 / steps_per_week)
+        if step_ratio == 1:
+            return np.full(len(steps), self.base_emission / steps_per_week)
+        first = self.base_emission * (1 - step_ratio) / (1 - ratio)
+        return first * step_ratio ** steps
+
+    def cumulative_at(self, week):
+        ratio = 1 - self.decay_percent / 100
+        if ratio == 1:
+            return self.base_emission * (week + 1)
+        return self.base_emission * (1 - ratio ** (week + 1)) / (1 - ratio)
+
+    def weeks_until(self, amount, limit=SEARCH_LIMIT):
+        if amount <= 0:
+            return 0
+        ratio = 1 - self.decay_percent / 100
+        if ratio == 1:
+            week = math.ceil(amount / self.base_emission) - 1
+        else:
+            remaining = 1 - amount * (1 - ratio) / self.base_emission
+            if remaining <= 0:
+                return None  # the series converges below ``amount``
+            week = math.ceil(math.log(remaining) / math.log(ratio)) - 1
+        # step off floating-point boundaries
+        week = max(week, 0)
+        while week > 0 and self.cumulative_at(week - 1) >= amount:
+            week -= 1
+        while self.cumulative_at(week) < amount:
+            week += 1
+        return week if week <= limit else None
+
+
+@dataclass(frozen=True)
+class Halving(EmissionCurve):
+    """``base`` per week, halved every ``period`` weeks."""
+
+    base_emission: float
+    period: int
+
+    def __post_init__(self):
+        if self.period < 1:
+            raise ValueError("The halving period must be at least one week")
+
+    def weekly(self, weeks):
+        return self.base_emission * 0.5 ** (np.arange(weeks) // self.period)
+
+    def cumulative_at(self, week):
+        full, rest = divmod(week + 1, self.period)
+        return self.base_emission * (2 * self.period * (1 - 0.5**full) + rest * 0.5**full)
+
+
+@dataclass(frozen=True)
+class LinearTaper(EmissionCurve):
+    """From ``base`` to ``final`` per week in a straight line over ``taper_weeks``, then flat at ``final``."""
+
+    base_emission: float
+    final_emission: float
+    taper_weeks: int
+
+    def weekly(self, weeks):
+        t = np.arange(weeks)
+        slope = (self.final_emission - self.base_emission) / max(self.taper_weeks, 1)
+        return np.where(t < self.taper_weeks, self.base_emission + slope * t, self.final_emission)
+
+    def cumulative_at(self, week):
+        n = week + 1
+        m = min(n, self.taper_weeks)
+        slope = (self.final_emission - self.base_emission) / max(self.taper_weeks, 1)
+        return m * self.base_emission + slope * m * (m - 1) / 2 + max(n - self.taper_weeks, 0) * self.final_emission
+
+
+@dataclass(frozen=True)
+class Custom(EmissionCurve):
+    """Explicit weekly emissions; nothing is emitted after the last value."""
+
+    digest: str
+    values: np.ndarray = field(compare=False, repr=False)
+    prefix: np.ndarray = field(compare=False, repr=False)
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 1 or (values < 0).any():
+            raise ValueError("Custom emissions must be a flat list of non-negative weekly amounts")
+        return cls(hashlib.sha256(values.tobytes()).hexdigest(), values, np.cumsum(values))
+
+    @classmethod
+    def read_csv(cls, source, column="emission"):
+        frame = pd.read_csv(source)
+        if column not in frame:
+            raise ValueError(f"Custom emission CSV needs an '{column}' column")
+        return cls.from_values(frame[column].dropna())
+
+    def weekly(self, weeks):
+        out = np.zeros(weeks)
+        count = min(weeks, len(self.values))
+        out[:count] = self.values[:count]
+        return out
+
+    def cumulative_at(self, week):
+        if week < 0 or not len(self.prefix):
+            return 0.0
+        return float(self.prefix[min(week, len(self.prefix) - 1)])
+
+    def weeks_until(self, amount, limit=SEARCH_LIMIT):
+        if amount <= 0:
+            return 0
+        week = int(np.searchsorted(self.prefix, amount))
+        return week if week < len(self.prefix) and week <= limit else None
+
+
+def load_custom_emission(data, column="emission"):
+    """Parse uploaded CSV bytes into a ``Custom`` curve, reusing the cached curve for identical bytes."""
+    digest = hashlib.sha256(data).hexdigest()
+    return RESULT_CACHE.get_or_compute(("custom_emission", digest, column),
+                                       lambda: Custom.read_csv(io.BytesIO(data), column))
+
+
+@dataclass(frozen=True)
+class Piecewise(EmissionCurve):
+    """Consecutive segments ``(start_week, curve)``; each curve restarts at its own week 0.
+
+    Nothing is emitted before the first start and the last segment runs forever.
+    """
+
+    segments: tuple
+
+    def __post_init__(self):
+        if not self.segments:
+            raise ValueError("Piecewise emissions need at least one segment")
+        starts = [start for start, _ in self.segments]
+        if starts != sorted(set(starts)) or starts[0] < 0:
+            raise ValueError("Segment start weeks must be distinct, non-negative and increasing")
+
+    @property
+    def _starts(self):
+        return [start for start, _ in self.segments]
+
+    @property
+    def _offsets(self):
+        """Emission before each segment starts."""
+        offsets = [0.0]
+        for (start, curve), (end, _) in zip(self.segments, self.segments[1:]):
+            offsets.append(offsets[-1] + curve.cumulative_at(end - start - 1))
+        return offsets
+
+    def weekly(self, weeks):
+        out = np.zeros(weeks)
+        ends = self._starts[1:] + [weeks]
+        for (start, curve), end in zip(self.segments, ends):
+            if start < weeks:
+                out[start:min(end, weeks)] = curve.weekly(min(end, weeks) - start)
+        return out
+
+    def cumulative_at(self, week):
+        index = bisect.bisect_right(self._starts, week) - 1
+        if index < 0:
+            return 0.0
+        start, curve = self.segments[index]
+        return self._offsets[index] + curve.cumulative_at(week - start)
+
+    def weeks_until(self, amount, limit=SEARCH_LIMIT):
+        if amount <= 0:
+            return 0
+        offsets = self._offsets
+        # the first segment that has not emitted ``amount`` by the time the next one starts
+        index = max(bisect.bisect_left(offsets, amount) - 1, 0)
+        start, curve = self.segments[index]
+        local = curve.weeks_until(amount - offsets[index], limit)
+        return start + local if local is not None and start + local <= limit else None
+
+
+def curve_for(base_emission, decay_percent, emission_curve=None):
+    """``emission_curve`` if one is set, else the main page's geometric decay."""
+    return Geometric(base_emission, decay_percent) if emission_curve is None else emission_curve
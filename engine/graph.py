@@ -0,0 +1,129 @@
+"""Dependency-aware incremental recomputation.
+
+A ``DependencyGraph`` remembers the inputs and node values of its previous
+evaluation. On the next call only nodes downstream of inputs whose values
+changed are recomputed; everything else is reused as is.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .kernels import staking_multiplier, volume_rewards, voting_earnings
+from .results import ActiveResult
+from .emissions import curve_for
+from .profiling import timed
+from .views import emission_for, supply_for
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    func: object
+    inputs: tuple
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.shape(a) == np.shape(b) and np.array_equal(a, b)
+    return type(a) is type(b) and a == b
+
+
+class DependencyGraph:
+    """Nodes are evaluated in topological order; node inputs name either graph inputs or other nodes."""
+
+    def __init__(self, nodes):
+        self.nodes = {node.name: node for node in nodes}
+        self.order = self._topological_order()
+        self.input_names = sorted({name for node in nodes for name in node.inputs} - set(self.nodes))
+        self._inputs = {}
+        self._values = {}
+        self.last_recomputed = ()
+
+    def _topological_order(self):
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in self.nodes[name].inputs:
+                if dependency in self.nodes:
+                    visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
+
+    def downstream(self, changed):
+        """Names of nodes that depend, directly or transitively, on any of ``changed``."""
+        dirty = set()
+        for name in self.order:
+            if any(dependency in changed or dependency in dirty for dependency in self.nodes[name].inputs):
+                dirty.add(name)
+        return dirty
+
+    def evaluate(self, **inputs):
+        missing = [name for name in self.input_names if name not in inputs]
+        if missing:
+            raise KeyError(f"Missing graph inputs: {missing}")
+
+        changed = {name for name in self.input_names
+                   if name not in self._inputs or not _same(self._inputs[name], inputs[name])}
+        dirty = self.downstream(changed) | (set(self.nodes) - set(self._values))
+
+        recomputed = []
+        for name in self.order:
+            if name in dirty:
+                node = self.nodes[name]
+                args = [self._values[dep] if dep in self.nodes else inputs[dep] for dep in node.inputs]
+                self._values[name] = node.func(*args)
+                recomputed.append(name)
+
+        self._inputs = {name: inputs[name] for name in self.input_names}
+        self.last_recomputed = tuple(recomputed)
+        return dict(self._values)
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+
+# --- Active User page ---
+@timed("user kernels")
+def _voting(supply, voting_tokens, my_tokens, weekly_fees, initial_price):
+    return voting_earnings(voting_tokens, my_tokens, supply.circulating, weekly_fees, initial_price)
+
+
+@timed("user kernels")
+def _multiplier(multiplier_tokens, reference_stake, weeks):
+    return staking_multiplier(multiplier_tokens, reference_stake, weeks)
+
+
+@timed("user kernels")
+def _volume(emissions, multiplier, multiplier_tokens, reference_stake, asset_weight, total_volume, user_volume):
+    return volume_rewards(emissions.weekly, multiplier_tokens, reference_stake,
+                          asset_weight, total_volume, user_volume, multiplier=multiplier)
+
+
+def _active_frame(emissions, voting, volume):
+    return ActiveResult(voting, volume).to_columns(emissions.weeks)
+
+
+def active_user_graph():
+    """emissions -> supply -> voting share/APR, and multiplier -> effective volume -> rewards."""
+    return DependencyGraph([
+        Node("curve", curve_for, ("base_emission", "decay_percent", "emission_curve")),
+        Node("emissions", emission_for, ("curve", "weeks")),
+        Node("supply", supply_for, ("curve", "weeks", "initial_xtokens", "locked_tokens", "vesting")),
+        Node("voting", _voting, ("supply", "voting_tokens", "my_tokens", "weekly_fees", "initial_price")),
+        Node("multiplier", _multiplier, ("multiplier_tokens", "reference_stake", "weeks")),
+        Node("volume", _volume, ("emissions", "multiplier", "multiplier_tokens", "reference_stake",
+                                 "asset_weight", "total_volume", "user_volume")),
+        Node("frame", _active_frame, ("emissions", "voting", "volume")),
+    ])
@@ -0,0 +1,213 @@
+"""Pure NumPy kernels behind every page of the simulator.
+
+Week is always the last axis. Scalar inputs give 1-D ``(weeks,)`` series;
+array inputs shaped ``(n, 1)`` broadcast to ``(n, weeks)`` blocks.
+"""
+import numpy as np
+
+from .results import (
+    ActiveResult,
+    EmissionResult,
+    LsTokenResult,
+    MultiAssetResult,
+    PassiveResult,
+    SimulationResult,
+    SupplyResult,
+    ValuationResult,
+    VolumeResult,
+    VotingResult,
+)
+
+WEEKS_PER_YEAR = 52
+MULTIPLIER_GROWTH = 1.05
+MAX_MULTIPLIER_BOOST = 10
+
+
+# --- Emission & Supply ---
+def emission_schedule(base_emission, decay_percent, weeks):
+    decay_rate = 1 - (np.asarray(decay_percent, dtype=float) / 100)
+    weeks_array = np.arange(weeks)
+    weekly = base_emission * (decay_rate ** weeks_array)
+    cumulative = np.cumsum(weekly, axis=-1)
+    return EmissionResult(weeks_array, weekly, cumulative)
+
+
+def supply_curve(cumulative_emissions, initial_xtokens, locked_tokens, unlocked_voting=None, unlocked_non_voting=None):
+    """``unlocked_voting`` (cumulative vested voting tokens) moves locked tokens into the voting supply.
+
+    ``unlocked_non_voting`` tokens circulate, and count towards the market cap, but stay out of the voting supply.
+    Vesting moves tokens out of the locked pool without minting any, so FDV already counts both and is unchanged.
+    """
+    circulating = initial_xtokens + cumulative_emissions
+    if unlocked_voting is not None:
+        circulating = circulating + unlocked_voting
+    total_fdv = locked_tokens + initial_xtokens + cumulative_emissions
+    return SupplyResult(circulating, total_fdv, unlocked_voting, unlocked_non_voting)
+
+
+def valuation_curve(supply, price):
+    return ValuationResult(supply.circulating_total * price, supply.total_fdv * price)
+
+
+def cumulative_fee_curve(weekly_fees, weeks):
+    weekly_fees = np.asarray(weekly_fees, dtype=float)
+    shape = np.broadcast_shapes(weekly_fees.shape, (weeks,))
+    return np.cumsum(np.broadcast_to(weekly_fees, shape), axis=-1)
+
+
+def simulate(params):
+    """Run the main-page model (emissions, supply, valuation, fees) for ``params``."""
+    emission = params.emission.schedule(params.weeks)
+    vesting = params.vesting
+    supply = supply_curve(emission.cumulative, params.initial_xtokens, params.locked_tokens,
+                          None if vesting is None else vesting.cumulative_voting(params.weeks),
+                          None if vesting is None else vesting.cumulative_non_voting(params.weeks))
+    return SimulationResult(
+        emission=emission,
+        supply=supply,
+        valuation=valuation_curve(supply, params.initial_price),
+        cumulative_fees=cumulative_fee_curve(params.weekly_fees, params.weeks),
+    )
+
+
+# --- Passive user ---
+def passive_earnings(my_tokens, circulating_supply, weekly_fees, price):
+    """Fixed holding that receives its pro-rata share of fees every week."""
+    weekly = (my_tokens / circulating_supply) * weekly_fees
+    cumulative = np.cumsum(weekly, axis=-1)
+    relative_pct = (cumulative / (my_tokens * price)) * 100
+    return PassiveResult(weekly, cumulative, relative_pct)
+
+
+def lstoken_growth(circulating_supply, weekly_fees, price):
+    """Per-token lsToken balance after each week's reinvestment.
+
+    The weekly update ``h[t+1] = h[t] * (1 + weekly_fees / (price * supply[t]))``
+    is linear in the starting balance, so the whole path is one cumulative product.
+    """
+    return np.cumprod(1 + weekly_fees / (price * np.asarray(circulating_supply, dtype=float)), axis=-1)
+
+
+def lstoken_earnings(my_tokens, circulating_supply, weekly_fees, price, entry_price=None):
+    """Holding that reinvests all of its weekly fees at ``price``.
+
+    Pass ``my_tokens`` shaped ``(n, 1)`` to evaluate ``n`` wallet sizes in one call;
+    the per-token path is computed once and scaled by each starting balance.
+    ``entry_price`` is the ROI basis and defaults to ``price``; set it when
+    ``price`` is a path rather than a constant.
+    """
+    entry_price = price if entry_price is None else entry_price
+    growth = lstoken_growth(circulating_supply, weekly_fees, price)
+    balance_before = np.concatenate([np.ones_like(growth[..., :1]), growth[..., :-1]], axis=-1)
+    fees_per_token = balance_before * weekly_fees / circulating_supply
+    cumulative_per_token = np.cumsum(fees_per_token, axis=-1)
+
+    # ROI does not depend on the starting balance, so share one row across the batch
+    relative_pct = (cumulative_per_token / entry_price) * 100
+    my_tokens = np.asarray(my_tokens, dtype=float)
+    shape = np.broadcast_shapes(my_tokens.shape, growth.shape)
+    return LsTokenResult(
+        weekly_fees=my_tokens * fees_per_token,
+        cumulative_fees=my_tokens * cumulative_per_token,
+        relative_pct=np.broadcast_to(relative_pct, shape),
+        holdings=my_tokens * growth,
+    )
+
+
+# --- Active user ---
+def _guarded_apr(enabled, numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        apr = np.where(enabled, numerator / denominator * 100, 0)
+    return np.nan_to_num(apr, nan=0.0)
+
+
+def voting_earnings(voting_tokens, my_tokens, circulating_supply, weekly_fees, price, periods_per_year=WEEKS_PER_YEAR):
+    weekly = (voting_tokens / circulating_supply) * weekly_fees
+    cumulative = np.cumsum(weekly, axis=-1)
+    relative_pct = (cumulative / (my_tokens * price)) * 100
+    apr = _guarded_apr(np.asarray(voting_tokens) > 0, weekly * periods_per_year, voting_tokens * price)
+    return VotingResult(weekly, cumulative, relative_pct, apr)
+
+
+def staking_multiplier(multiplier_tokens, reference_stake, weeks, steps_per_week=1, start=0):
+    """``1 + 10 * stake / (stake + reference)`` with the stake growing 5% per week.
+
+    With ``steps_per_week`` > 1 the growth is compounded per step, for steps
+    ``start .. start + weeks - 1``.
+    """
+    effective_stake = multiplier_tokens * (MULTIPLIER_GROWTH ** (np.arange(start, start + weeks) / steps_per_week))
+    stake_ratio = effective_stake / (effective_stake + reference_stake)
+    return 1 + stake_ratio * MAX_MULTIPLIER_BOOST
+
+
+def volume_rewards(weekly_emissions, multiplier_tokens, reference_stake,
+                   asset_weight, total_volume, user_volume, multiplier=None, periods_per_year=WEEKS_PER_YEAR):
+    """Emissions earned by multiplier-boosted trading volume on one asset.
+
+    ``multiplier`` may be passed in when it has already been computed.
+    """
+    weeks = np.shape(weekly_emissions)[-1]
+    asset_weekly_emissions = weekly_emissions * asset_weight
+
+    if multiplier is None:
+        multiplier = staking_multiplier(multiplier_tokens, reference_stake, weeks)
+    effective_volume = user_volume * multiplier
+    adjusted_total_volume = total_volume - user_volume + effective_volume
+    weekly = (effective_volume / adjusted_total_volume) * asset_weekly_emissions
+    apr = _guarded_apr(np.asarray(multiplier_tokens) > 0, weekly * periods_per_year, multiplier_tokens)
+
+    baseline = (user_volume / total_volume) * asset_weekly_emissions
+    return VolumeResult(
+        multiplier=multiplier,
+        weekly_rewards=weekly,
+        cumulative_rewards=np.cumsum(weekly, axis=-1),
+        baseline_weekly_rewards=baseline,
+        baseline_cumulative_rewards=np.cumsum(baseline, axis=-1),
+        apr=apr,
+    )
+
+
+def check_asset_weights(asset_weights):
+    """Raise ``ValueError`` if the asset weights claim more than all emissions in any week."""
+    totals = np.sum(asset_weights, axis=0)
+    if np.any(np.asarray(asset_weights) < 0):
+        raise ValueError("Asset weights must not be negative")
+    if np.any(totals > 1 + 1e-9):
+        raise ValueError(f"Asset weights sum to {np.max(totals):.1%}, more than 100% of emissions")
+
+
+def multi_asset_rewards(weekly_emissions, multiplier_tokens, reference_stake,
+                        asset_weights, total_volumes, user_volumes, names=None):
+    """Volume rewards on K assets at once; the multiplier stake boosts your volume on every asset.
+
+    ``asset_weights``, ``total_volumes`` and ``user_volumes`` are per asset,
+    either ``(K,)`` constants or ``(K, weeks)`` weekly series.
+    """
+    weeks = np.shape(weekly_emissions)[-1]
+
+    def per_asset(values):
+        values = np.asarray(values, dtype=float)
+        return values[:, None] if values.ndim == 1 else values
+
+    weights = per_asset(asset_weights)
+    check_asset_weights(weights)
+    multiplier = staking_multiplier(multiplier_tokens, reference_stake, weeks)
+    assets = volume_rewards(weekly_emissions, multiplier_tokens, reference_stake, weights,
+                            per_asset(total_volumes), per_asset(user_volumes), multiplier=multiplier)
+    weekly = assets.weekly_rewards.sum(axis=0)
+    return MultiAssetResult(
+        names=tuple(names) if names is not None else tuple(f"Asset {i + 1}" for i in range(len(weights))),
+        assets=assets,
+        weekly_rewards=weekly,
+        cumulative_rewards=np.cumsum(weekly),
+        apr=assets.apr.sum(axis=0),
+    )
+
+
+def active_earnings(simulation, weekly_fees, price, my_tokens, voting_tokens,
+                    multiplier_tokens, reference_stake, asset_weight, total_volume, user_volume):
+    """Voting fees plus multiplier-boosted volume rewards for one active wallet."""
+    voting = voting_earnings(voting_tokens, my_tokens, simulation.supply.circulating, weekly_fees, price)
+    volume = volume_rewards(simulation.emission.weekly, multiplier_tokens, reference_stake,
+                            asset_weight, total_volume, user_volume)
+    return ActiveResult(voting, volume)
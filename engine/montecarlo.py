@@ -0,0 +1,105 @@
+"""Monte Carlo mode: stochastic price and fee paths evaluated as paths x weeks arrays.
+
+Paths are generated in fixed-size blocks, each with its own child of the
+master ``SeedSequence``. A block's numbers depend only on ``(seed, block)``,
+so the result is bit-identical however many worker processes share the blocks.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .kernels import WEEKS_PER_YEAR, lstoken_earnings, passive_earnings, simulate, volume_rewards, voting_earnings
+from .profiling import timed
+
+BLOCK_SIZE = 1024
+PERCENTILES = (5, 50, 95)
+MC_SERIES = ("Token Price ($)", "Weekly Fees ($)", "Passive Cumulative Fees ($)",
+             "lsToken Cumulative Fees ($)", "Active Cumulative Earnings ($)")
+
+
+@dataclass(frozen=True)
+class MarketModel:
+    """GBM token price and mean-preserving lognormal weekly fees."""
+
+    price_drift: float = 0.0
+    price_volatility: float = 0.6
+    fee_volatility: float = 0.3
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """One ``(paths, weeks)`` array per entry of ``MC_SERIES``."""
+
+    weeks: np.ndarray
+    series: dict
+    seed: int
+
+    @property
+    def paths(self):
+        return next(iter(self.series.values())).shape[0]
+
+    def bands(self, name, percentiles=PERCENTILES):
+        """Per-week percentiles of one series, one column per percentile (``p5``, ``p50``, ...)."""
+        values = np.percentile(self.series[name], percentiles, axis=0)
+        return pd.DataFrame(
+            {f"p{q:g}": row for q, row in zip(percentiles, values)},
+            index=pd.Index(self.weeks, name="Week"),
+        )
+
+
+def sample_market(rng, n_paths, weeks, initial_price, weekly_fees, market):
+    """Draw ``(n_paths, weeks)`` price and fee paths; week 0 trades at ``initial_price``."""
+    dt = 1 / WEEKS_PER_YEAR
+    sigma = market.price_volatility
+    log_returns = (market.price_drift - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * rng.standard_normal((n_paths, weeks))
+    log_returns[:, 0] = 0.0
+    price = initial_price * np.exp(np.cumsum(log_returns, axis=1))
+
+    s = market.fee_volatility
+    fees = weekly_fees * np.exp(s * rng.standard_normal((n_paths, weeks)) - 0.5 * s**2)
+    return price, fees
+
+
+def _simulate_block(task):
+    params, user, market, seed, block, n_paths = task
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+    price, fees = sample_market(rng, n_paths, params.weeks, params.initial_price, params.weekly_fees, market)
+
+    simulation = simulate(params)
+    supply = simulation.supply.circulating
+    passive = passive_earnings(user.my_tokens, supply, fees, params.initial_price)
+    ls_token = lstoken_earnings(user.my_tokens, supply, fees, price, entry_price=params.initial_price)
+    voting = voting_earnings(user.voting_tokens, user.my_tokens, supply, fees, params.initial_price)
+    volume = volume_rewards(simulation.emission.weekly, user.multiplier_tokens, user.reference_stake,
+                            user.asset_weight, user.total_volume, user.user_volume)
+    # volume rewards are paid in tokens; value them at each week's price
+    active = voting.cumulative_fees + np.cumsum(volume.weekly_rewards * price, axis=1)
+
+    return {
+        "Token Price ($)": price,
+        "Weekly Fees ($)": fees,
+        "Passive Cumulative Fees ($)": passive.cumulative_fees,
+        "lsToken Cumulative Fees ($)": ls_token.cumulative_fees,
+        "Active Cumulative Earnings ($)": active,
+    }
+
+
+@timed("monte carlo")
+def run_monte_carlo(params, user, market=MarketModel(), n_paths=1000, seed=0, workers=1, block_size=BLOCK_SIZE):
+    """Simulate ``n_paths`` market paths for the passive, lsToken and active strategies of ``user``.
+
+    ``workers > 1`` spreads blocks over a process pool; the output does not depend on it.
+    """
+    sizes = [min(block_size, n_paths - start) for start in range(0, n_paths, block_size)]
+    tasks = [(params, user, market, seed, block, size) for block, size in enumerate(sizes)]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            blocks = list(pool.map(_simulate_block, tasks))
+    else:
+        blocks = [_simulate_block(task) for task in tasks]
+
+    series = {name: np.concatenate([block[name] for block in blocks]) for name in MC_SERIES}
+    return MonteCarloResult(weeks=np.arange(params.weeks), series=series, seed=seed)
@@ -0,0 +1,144 @@
+"""Best split of an active wallet between voting, multiplier staking and hatching.
+
+Voting fees are linear in the voting stake and volume rewards saturate in the
+multiplier stake, so the objective (voting fees plus volume rewards valued at
+the token price, summed over the horizon) is smooth over the allocation
+simplex. A coarse grid over the whole simplex is evaluated in one batch, and
+the best grid point is refined by a bounded pattern search. Every evaluated
+split is kept, both to skip repeats during the search and to trace the
+Pareto frontier between the two reward streams.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .cache import memoize
+from .kernels import volume_rewards, voting_earnings
+from .params import UserParams
+from .profiling import timed
+from .views import emission_for, market_inputs, supply_for
+
+GRID_RESOLUTION = 40
+MAX_ITERATIONS = 60
+TOLERANCE = 1.0  # tokens
+
+# pattern-search moves in (voting, multiplier); hatching takes the remainder
+_MOVES = np.array([(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)], dtype=float)
+
+
+@dataclass(frozen=True)
+class AllocationResult:
+    my_tokens: float
+    voting_tokens: float
+    multiplier_tokens: float
+    voting_fees: float     # cumulative over the horizon ($)
+    volume_rewards: float  # cumulative over the horizon (tokens)
+    objective: float       # voting fees + volume rewards x price ($)
+    frontier: pd.DataFrame
+    evaluations: int
+
+    @property
+    def hatching_tokens(self):
+        return self.my_tokens - self.voting_tokens - self.multiplier_tokens
+
+
+class _Evaluator:
+    """Batched, memoized objective over ``(voting, multiplier)`` splits."""
+
+    def __init__(self, params, user, series=None):
+        weeks = params.weeks
+        self.supply = supply_for(params.emission, weeks, params.initial_xtokens, params.locked_tokens,
+                                 params.vesting).circulating
+        self.emissions = emission_for(params.emission, weeks).weekly
+        self.fees, self.price, self.entry_price = market_inputs(params, series)
+        self.total_volume, self.user_volume = user.total_volume, user.user_volume
+        if series is not None:
+            self.total_volume = series.get("total_volume", self.total_volume)
+            self.user_volume = series.get("user_volume", self.user_volume)
+        self.user = user
+        self.seen = {}
+
+    def __call__(self, splits):
+        """Objective for each row of ``splits``; only unseen splits are computed."""
+        keys = [tuple(row) for row in np.round(splits, 6)]
+        fresh = np.array([key for key in dict.fromkeys(keys) if key not in self.seen]).reshape(-1, 2)
+        if len(fresh):
+            u = self.user
+            voting = voting_earnings(fresh[:, :1], u.my_tokens, self.supply, self.fees, self.entry_price)
+            volume = volume_rewards(self.emissions, fresh[:, 1:], u.reference_stake,
+                                    u.asset_weight, self.total_volume, self.user_volume)
+            fees = voting.cumulative_fees[:, -1]
+            rewards = volume.cumulative_rewards[:, -1]
+            # rewards are paid in tokens; value each week's at that week's price
+            values = fees + (volume.weekly_rewards * self.price).sum(axis=-1)
+            for key, fee, reward, value in zip(map(tuple, fresh), fees, rewards, values):
+                self.seen[key] = (fee, reward, value)
+        return np.array([self.seen[key][2] for key in keys])
+
+    def frame(self):
+        splits = np.array(list(self.seen))
+        values = np.array(list(self.seen.values()))
+        return pd.DataFrame({
+            "Voting Tokens": splits[:, 0],
+            "Multiplier Tokens": splits[:, 1],
+            "Cumulative Voting Fees": values[:, 0],
+            "Cumulative Volume Rewards": values[:, 1],
+            "Total Value ($)": values[:, 2],
+        })
+
+
+def simplex_grid(total, resolution=GRID_RESOLUTION):
+    """Every ``(voting, multiplier)`` on a ``resolution`` grid with ``voting + multiplier <= total``."""
+    i, j = np.triu_indices(resolution + 1)
+    return np.column_stack([i, resolution - j]) * (total / resolution)
+
+
+def pareto_frontier(frame):
+    """Splits not beaten on both voting fees and volume rewards, sorted by voting fees."""
+    ordered = frame.sort_values(["Cumulative Voting Fees", "Cumulative Volume Rewards"], ascending=False)
+    best_rewards = ordered["Cumulative Volume Rewards"].cummax().shift(fill_value=-np.inf)
+    return ordered[ordered["Cumulative Volume Rewards"] > best_rewards].iloc[::-1].reset_index(drop=True)
+
+
+@timed("optimizer")
+def optimize_allocation(params, user, resolution=GRID_RESOLUTION, max_iterations=MAX_ITERATIONS, series=None):
+    """Split ``user.my_tokens`` to maximize voting fees plus volume rewards valued at the token price."""
+    total = user.my_tokens
+    evaluate = _Evaluator(params, user, series)
+
+    grid = simplex_grid(total, resolution)
+    scores = evaluate(grid)
+    best, best_score = grid[scores.argmax()], scores.max()
+
+    step = total / resolution
+    for _ in range(max_iterations):
+        if step < TOLERANCE:
+            break
+        candidates = best + _MOVES * step
+        candidates = candidates[(candidates >= 0).all(axis=1) & (candidates.sum(axis=1) <= total + 1e-9)]
+        scores = evaluate(candidates)
+        if len(scores) and scores.max() > best_score:
+            best, best_score = candidates[scores.argmax()], scores.max()
+        else:
+            step /= 2
+
+    fees, rewards, objective = evaluate.seen[tuple(np.round(best, 6))]
+    return AllocationResult(
+        my_tokens=total,
+        voting_tokens=float(best[0]),
+        multiplier_tokens=float(best[1]),
+        voting_fees=fees,
+        volume_rewards=rewards,
+        objective=objective,
+        frontier=pareto_frontier(evaluate.frame()),
+        evaluations=len(evaluate.seen),
+    )
+
+
+@memoize
+def optimal_allocation_for(params, my_tokens, reference_stake, asset_weight, total_volume, user_volume, series=None):
+    """Cached ``optimize_allocation``; the current split does not affect the optimum."""
+    user = UserParams(my_tokens=my_tokens, voting_tokens=0, multiplier_tokens=0, reference_stake=reference_stake,
+                      asset_weight=asset_weight, total_volume=total_volume, user_volume=user_volume)
+    return optimize_allocation(params, user, series=series)
@@ -0,0 +1,68 @@
+from dataclasses import asdict, dataclass, fields, replace
+
+from .emissions import curve_for
+
+
+@dataclass(frozen=True)
+class TokenomicsParams:
+    """Global tokenomics settings shared by every page (see the main page sidebar)."""
+
+    initial_xtokens: float = 16_000_000
+    locked_tokens: float = 84_000_000
+    initial_price: float = 0.45
+    weekly_fees: float = 20_000
+    base_emission: float = 500_000
+    decay_percent: float = 2.0
+    weeks: int = 104
+    vesting: object = None  # VestingSchedule releasing locked tokens, or None to keep them locked
+    emission_curve: object = None  # EmissionCurve replacing base_emission / decay_percent, or None
+
+    @property
+    def decay_rate(self):
+        return 1 - (self.decay_percent / 100)
+
+    @property
+    def emission(self):
+        """The emission curve every page runs on."""
+        return curve_for(self.base_emission, self.decay_percent, self.emission_curve)
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Build params from any mapping (e.g. ``st.session_state``), ignoring unknown keys."""
+        names = [f.name for f in fields(cls)]
+        return cls(**{name: mapping[name] for name in names if name in mapping})
+
+    def to_dict(self):
+        # shallow, so the vesting schedule stays an object rather than a dict
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+
+@dataclass(frozen=True)
+class UserParams:
+    """Per-wallet inputs from the Passive and Active User pages."""
+
+    my_tokens: float = 10_000
+    voting_tokens: float = 3000
+    multiplier_tokens: float = 3000
+    reference_stake: float = 5000
+    asset_weight: float = 0.10
+    total_volume: float = 100_000_000
+    user_volume: float = 2_000_000
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        names = [f.name for f in fields(cls)]
+        return cls(**{name: mapping[name] for name in names if name in mapping})
+
+    def to_dict(self):
+        return asdict(self)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+
+DEFAULT_PARAMS = TokenomicsParams()
+DEFAULT_USER = UserParams()
@@ -0,0 +1,236 @@
+"""Population mode: many wallets with their own strategies sharing one fee pool.
+
+The population is part of the circulating voting supply, and every week's
+fees are split pro rata over that supply. A population that votes with more
+tokens than circulate, at the start or once its lsToken wallets have
+compounded, is itself the whole voting supply, so in those weeks fees are
+split over the population's voting balance instead. That way the population
+never receives more than the protocol pays out; the result counts such weeks
+in ``capped_weeks``.
+
+Self-vote and lsToken payouts are linear in the starting balance. The weekly
+recurrence therefore runs once on per-token scalars, and wallet results are
+outer products with the balances. Only the active strategy's staking
+multiplier is nonlinear per wallet; it is evaluated as wallets x weeks blocks
+in bounded chunks.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .cache import memoize
+from .kernels import MAX_MULTIPLIER_BOOST, MULTIPLIER_GROWTH
+from .profiling import timed
+from .views import emission_for, supply_for
+
+STRATEGIES = ("self-vote", "lsToken", "active")
+DEFAULT_MIX = (0.5, 0.3, 0.2)
+PERCENTILES = (5, 50, 95)
+CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass(frozen=True)
+class Population:
+    balances: np.ndarray
+    strategies: np.ndarray  # index into STRATEGIES per wallet
+
+    def __len__(self):
+        return len(self.balances)
+
+    def counts(self):
+        return np.bincount(self.strategies, minlength=len(STRATEGIES))
+
+
+@dataclass(frozen=True)
+class ActiveStrategy:
+    """How active wallets split their balance; volume scales with balance (Active page defaults: 2M per 10k)."""
+
+    voting_fraction: float = 0.3
+    multiplier_fraction: float = 0.3
+    volume_per_token: float = 200.0
+    reference_stake: float = 5000
+    asset_weight: float = 0.10
+    total_volume: float = 100_000_000
+
+
+@dataclass(frozen=True)
+class PopulationResult:
+    weeks: np.ndarray
+    fee_share: np.ndarray        # % of weekly fees paid to the population (0 without fees)
+    capped_weeks: int            # weeks in which the population outvoted the circulating supply
+    strategy_fees: dict          # strategy -> weekly fees paid to it ($)
+    checkpoints: np.ndarray
+    roi: np.ndarray              # (wallets, checkpoints) cumulative ROI (%)
+    earnings: np.ndarray         # (wallets, checkpoints) cumulative earnings ($)
+    population: Population
+
+    def bands(self, strategy, values="roi", percentiles=PERCENTILES):
+        """Percentiles across wallets of one strategy at every checkpoint week."""
+        data = getattr(self, values)[self.population.strategies == STRATEGIES.index(strategy)]
+        index = pd.Index(self.checkpoints, name="Week")
+        if len(data) == 0:
+            return pd.DataFrame(index=index)
+        rows = np.percentile(data, percentiles, axis=0)
+        return pd.DataFrame({f"p{q:g}": row for q, row in zip(percentiles, rows)}, index=index)
+
+    def summary(self):
+        """One row per strategy with final-week percentile earnings and ROI."""
+        rows = []
+        for code, strategy in enumerate(STRATEGIES):
+            mask = self.population.strategies == code
+            if not mask.any():
+                continue
+            earnings = np.percentile(self.earnings[mask, -1], PERCENTILES)
+            roi = np.percentile(self.roi[mask, -1], PERCENTILES)
+            rows.append({
+                "Strategy": strategy,
+                "Wallets": int(mask.sum()),
+                "Tokens": self.population.balances[mask].sum(),
+                **{f"Earnings p{q} ($)": value for q, value in zip(PERCENTILES, earnings)},
+                **{f"ROI p{q} (%)": value for q, value in zip(PERCENTILES, roi)},
+            })
+        return pd.DataFrame(rows).set_index("Strategy")
+
+
+# --- Building populations ---
+def assign_strategies(n, mix=DEFAULT_MIX, seed=0):
+    mix = np.asarray(mix, dtype=float)
+    return np.random.default_rng(seed).choice(len(STRATEGIES), size=n, p=mix / mix.sum()).astype(np.int8)
+
+
+def sample_population(n, distribution="pareto", seed=0, mix=DEFAULT_MIX,
+                      min_balance=1_000, pareto_alpha=1.5, lognormal_mean=9.0, lognormal_sigma=1.5):
+    """``n`` wallets with Pareto (``min_balance``, ``pareto_alpha``) or lognormal balances."""
+    rng = np.random.default_rng(seed)
+    if distribution == "pareto":
+        balances = min_balance * (1 + rng.pareto(pareto_alpha, n))
+    elif distribution == "lognormal":
+        balances = rng.lognormal(lognormal_mean, lognormal_sigma, n)
+    else:
+        raise ValueError(f"Unknown distribution {distribution!r}; use 'pareto' or 'lognormal'")
+    return Population(balances, assign_strategies(n, mix, seed + 1))
+
+
+def read_population_csv(source, mix=DEFAULT_MIX, seed=0):
+    """Balances from a CSV with a ``balance`` column and an optional ``strategy`` column."""
+    frame = pd.read_csv(source)
+    if "balance" not in frame:
+        raise ValueError("Population CSV needs a 'balance' column")
+    balances = frame["balance"].to_numpy(dtype=float)
+    invalid = np.flatnonzero(~(balances > 0))  # NaN compares False too
+    if len(invalid):
+        lines = ", ".join(str(row + 2) for row in invalid[:5]) + (", …" if len(invalid) > 5 else "")
+        raise ValueError(f"Population CSV has {len(invalid):,} missing or non-positive balances (lines {lines}); "
+                         "every balance must be positive")
+    if "strategy" in frame:
+        unknown = set(frame["strategy"].unique()) - set(STRATEGIES)
+        if unknown:
+            raise ValueError(f"Unknown strategies {sorted(unknown)}; use {STRATEGIES}")
+        strategies = frame["strategy"].map(STRATEGIES.index).to_numpy(dtype=np.int8)
+    else:
+        strategies = assign_strategies(len(balances), mix, seed)
+    return Population(balances, strategies)
+
+
+# --- Simulation ---
+def _fee_rates(supply, weekly_fees, price, fixed_votes, ls_tokens):
+    """Per-token weekly fee rate, lsToken growth and the weeks in which the population outvotes the supply.
+
+    Fees are split over ``max(supply, population voting balance)``. While the
+    supply is larger, the growth is one cumulative product. From the first
+    week the population is larger, its own balance sets the rate, which feeds
+    back into the growth, so the remaining weeks are stepped one by one.
+    """
+    rate = weekly_fees / np.asarray(supply, dtype=float)
+    growth = np.concatenate([[1.0], np.cumprod(1 + rate / price)[:-1]])  # before week t's reinvestment
+    over = fixed_votes + ls_tokens * growth > supply
+    if over.any():
+        g = growth[np.argmax(over)]
+        for t in range(np.argmax(over), len(supply)):
+            growth[t] = g
+            rate[t] = weekly_fees / max(supply[t], fixed_votes + g * ls_tokens)
+            g *= 1 + rate[t] / price
+        over = fixed_votes + ls_tokens * growth > supply
+    return rate, growth, over
+
+
+def _active_rewards(balances, active, emissions, checkpoints):
+    """Cumulative volume rewards (tokens) of each active wallet at the checkpoint weeks."""
+    weeks = len(emissions)
+    stake_growth = MULTIPLIER_GROWTH ** np.arange(weeks)
+    volume = balances * active.volume_per_token
+    stake = balances * active.multiplier_fraction
+    rows = max(1, CHUNK_ELEMENTS // weeks)
+
+    def effective(chunk):
+        effective_stake = stake[chunk, None] * stake_growth
+        multiplier = 1 + effective_stake / (effective_stake + active.reference_stake) * MAX_MULTIPLIER_BOOST
+        return volume[chunk, None] * multiplier
+
+    # first pass: everyone's boosted volume competes in the same pool
+    boosted = np.zeros(weeks)
+    for start in range(0, len(balances), rows):
+        boosted += effective(slice(start, start + rows)).sum(axis=0)
+    pool = max(active.total_volume - volume.sum(), 0) + boosted
+
+    rewards = np.empty((len(balances), len(checkpoints)))
+    for start in range(0, len(balances), rows):
+        chunk = slice(start, start + rows)
+        weekly = effective(chunk) / pool * (emissions * active.asset_weight)
+        rewards[chunk] = np.cumsum(weekly, axis=1)[:, checkpoints]
+    return rewards
+
+
+@timed("user kernels")
+def simulate_population(params, population, active=ActiveStrategy(), checkpoints=26):
+    """Step the whole population over the horizon and collect per-wallet ROI at ``checkpoints`` weeks."""
+    weeks = params.weeks
+    supply = supply_for(params.emission, weeks, params.initial_xtokens, params.locked_tokens, params.vesting).circulating
+    emissions = emission_for(params.emission, weeks).weekly
+    price = params.initial_price
+
+    balances, codes = population.balances, population.strategies
+    by_strategy = np.bincount(codes, weights=balances, minlength=len(STRATEGIES))
+    self_vote, ls_tokens, active_tokens = by_strategy
+    fixed_votes = self_vote + active.voting_fraction * active_tokens
+
+    rate, growth, over = _fee_rates(supply, params.weekly_fees, price, fixed_votes, ls_tokens)
+
+    # per-token cumulative fees ($) of each strategy
+    per_token = np.stack([
+        np.cumsum(rate),
+        np.cumsum(growth * rate),
+        active.voting_fraction * np.cumsum(rate),
+    ])
+    checkpoint_weeks = np.unique(np.linspace(0, weeks - 1, min(checkpoints, weeks)).round().astype(int))
+
+    earnings = balances[:, None] * per_token[codes][:, checkpoint_weeks]
+    is_active = codes == STRATEGIES.index("active")
+    if is_active.any():
+        earnings[is_active] += price * _active_rewards(balances[is_active], active, emissions, checkpoint_weeks)
+    roi = earnings / (balances[:, None] * price) * 100
+
+    strategy_fees = {
+        "self-vote": self_vote * rate,
+        "lsToken": ls_tokens * growth * rate,
+        "active": active.voting_fraction * active_tokens * rate,
+    }
+    total = sum(strategy_fees.values())
+    fee_share = total / params.weekly_fees * 100 if params.weekly_fees else np.zeros(weeks)
+    return PopulationResult(
+        weeks=np.arange(weeks),
+        fee_share=fee_share,
+        capped_weeks=int(over.sum()),
+        strategy_fees=strategy_fees,
+        checkpoints=checkpoint_weeks,
+        roi=roi,
+        earnings=earnings,
+        population=population,
+    )
+
+
+@memoize
+def sampled_population_for(params, n, distribution, seed, mix, active, **shape):
+    """Cached ``simulate_population`` over a sampled population (uploads are simulated directly)."""
+    return simulate_population(params, sample_population(n, distribution, seed, mix, **shape), active)
@@ -0,0 +1,172 @@
+"""Opt-in, per-rerun stage timings.
+
+A page starts a ``RunProfile`` at the top of its script and finishes it at
+the end. In between, engine functions wrapped with ``timed`` and UI code
+inside ``stage`` blocks record how long they took. ``lap`` charges
+everything else since the previous lap (widgets, glue code) to a named
+stage. Stages may nest, and each records only its own time, not that of
+the stages inside it, so the stages add up to the rerun's total.
+
+Nothing is recorded while no profile is active, and then ``timed`` costs a
+single attribute lookup per call. The active profile is per thread, and
+Streamlit runs each session's script in its own thread. Cache hits and
+misses are read from the process-wide ``RESULT_CACHE``, so concurrent
+sessions count towards each other's numbers.
+
+Finished profiles can be appended to a JSONL log (one object per rerun),
+from which ``read_profile_log`` and ``latency_percentiles`` compute latency
+percentiles per stage.
+"""
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .cache import RESULT_CACHE
+
+LOG_WINDOW = 1000  # reruns read back from a log for percentiles
+LOG_PERCENTILES = (50, 90, 99)
+
+_local = threading.local()
+
+
+class RunProfile:
+    def __init__(self, page, cache=RESULT_CACHE):
+        self.page = page
+        self.cache = cache
+        self.seconds = {}
+        self.calls = {}
+        self._cache_before = cache.stats()
+        self._started = self._lap = time.perf_counter()
+        self._children = [0.0]  # time spent in nested stages, one entry per open stage
+        self._timed_at_lap = 0.0
+        self.record = None
+
+    def _add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._add(name, elapsed - self._children.pop())
+            self._children[-1] += elapsed
+
+    def lap(self, name):
+        """Charge the time since the previous lap, minus any stages inside it, to ``name``."""
+        now = time.perf_counter()
+        self._add(name, now - self._lap - (self._children[0] - self._timed_at_lap))
+        self._lap = now
+        self._timed_at_lap = self._children[0]
+
+    def finish(self, rest="other"):
+        """Close the profile (remaining time goes to ``rest``) and return its record."""
+        if self.record is None:
+            self.lap(rest)
+            cache = self.cache.stats()
+            self.record = {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "page": self.page,
+                "total_ms": (time.perf_counter() - self._started) * 1000,
+                "stages_ms": {name: seconds * 1000 for name, seconds in self.seconds.items()},
+                "calls": dict(self.calls),
+                "cache_hits": cache.hits - self._cache_before.hits,
+                "cache_misses": cache.misses - self._cache_before.misses,
+            }
+        return self.record
+
+    def to_frame(self):
+        """One row per stage: milliseconds, calls and share of the total."""
+        record = self.finish()
+        frame = pd.DataFrame({
+            "Stage": list(record["stages_ms"]),
+            "ms": list(record["stages_ms"].values()),
+            "Calls": [record["calls"][name] for name in record["stages_ms"]],
+        }).set_index("Stage")
+        frame["Share (%)"] = frame["ms"] / max(record["total_ms"], 1e-9) * 100
+        return frame
+
+
+def start_profile(page):
+    _local.profile = RunProfile(page)
+    return _local.profile
+
+
+def current_profile():
+    return getattr(_local, "profile", None)
+
+
+def stop_profile():
+    """Finish and detach the active profile, returning its record (``None`` if there was none)."""
+    profile = current_profile()
+    _local.profile = None
+    return None if profile is None else profile.finish()
+
+
+@contextmanager
+def stage(name):
+    """Time the block as ``name`` if a profile is active."""
+    profile = current_profile()
+    if profile is None:
+        yield
+    else:
+        with profile.stage(name):
+            yield
+
+
+def lap(name):
+    profile = current_profile()
+    if profile is not None:
+        profile.lap(name)
+
+
+def timed(name):
+    """Decorator recording every call of the function as stage ``name`` while a profile is active."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = getattr(_local, "profile", None)
+            if profile is None:
+                return func(*args, **kwargs)
+            with profile.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- JSONL log ---
+def append_profile_log(path, record):
+    with open(path, "a") as handle:
+        handle.write(json.dumps(record) + "\n")
+
+
+def read_profile_log(path, window=LOG_WINDOW):
+    """The last ``window`` reruns in ``path``: one row each, with the total and one ``ms`` column per stage."""
+    with open(path) as handle:
+        lines = deque(handle, maxlen=window)
+    rows = []
+    for line in lines:
+        record = json.loads(line)
+        rows.append({"page": record["page"], "total": record["total_ms"], **record["stages_ms"],
+                     "cache_hits": record["cache_hits"], "cache_misses": record["cache_misses"]})
+    return pd.DataFrame(rows)
+
+
+def latency_percentiles(log, percentiles=LOG_PERCENTILES, page=None):
+    """Millisecond percentiles of the total and every stage, one row per stage, from ``read_profile_log``."""
+    if page is not None and len(log):
+        log = log[log["page"] == page]
+    stages = log.drop(columns=["page", "cache_hits", "cache_misses"], errors="ignore").dropna(axis=1, how="all")
+    values = {name: np.nanpercentile(stages[name].to_numpy(dtype=float), percentiles) for name in stages}
+    return pd.DataFrame(values, index=[f"p{q:g}" for q in percentiles]).T.rename_axis("Stage")
@@ -0,0 +1,280 @@
+"""Sub-weekly time steps, aggregated back to weekly or monthly periods.
+
+A ``Resolution`` splits every week into ``steps_per_week`` equal steps. Fees,
+emissions and vesting unlocks are divided across the steps, geometric decay
+and multiplier growth compound per step, and APRs annualize over the steps
+in a year, so a week of daily steps adds up to the same weekly totals as the
+weekly model. Compounding (lsTokens) and the voting share follow the supply
+step by step, which is where finer steps actually change the results.
+
+A ten-year horizon at hourly steps is close to 90,000 steps per scenario,
+and finer steps reach millions. Steps are therefore simulated in chunks of
+``CHUNK_STEPS``, carrying the running totals from one chunk to the next.
+Each chunk is folded into per-period sums and closing values straight away,
+so peak memory depends on the chunk size and the number of periods, not on
+the number of steps. Columns keep the names of the weekly frames: flows
+(``... Weekly ...``) are the average per week within the period, stocks and
+cumulative values are taken at the end of the period, and rates (APR,
+multiplier) are averaged.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .cache import memoize
+from .columnar import ColumnarResult
+from .kernels import WEEKS_PER_YEAR, lstoken_growth, staking_multiplier, volume_rewards, voting_earnings
+from .profiling import timed
+from .views import market_inputs
+
+RESOLUTIONS = {"Weekly": 1, "Daily": 7, "Hourly": 168}
+PERIODS = ("week", "month")
+DTYPES = ("float64", "float32")
+CHUNK_STEPS = 2**16
+DAYS_PER_WEEK = 7
+DAYS_PER_MONTH = 365.25 / 12
+
+# session-state keys the pages share
+TIME_STEP_KEY = "time_step"
+PERIOD_KEY = "aggregation_period"
+COMPACT_KEY = "compact_results"
+
+
+@dataclass(frozen=True)
+class Resolution:
+    steps_per_week: int = 1
+    period: str = "week"
+    dtype: str = "float64"
+
+    def __post_init__(self):
+        if self.steps_per_week < 1:
+            raise ValueError("A week needs at least one step")
+        if self.period not in PERIODS:
+            raise ValueError(f"Unknown period {self.period!r}; use one of {PERIODS}")
+        if self.dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype {self.dtype!r}; use one of {DTYPES}")
+
+    @property
+    def native(self):
+        """True for the plain weekly model, which the weekly views already cover."""
+        return self == Resolution()
+
+    @property
+    def steps_per_year(self):
+        return WEEKS_PER_YEAR * self.steps_per_week
+
+    def steps(self, weeks):
+        return weeks * self.steps_per_week
+
+    def period_of(self, steps):
+        """Period index (week or month) of each step index."""
+        if self.period == "week":
+            return steps // self.steps_per_week
+        days = steps * (DAYS_PER_WEEK / self.steps_per_week)
+        return (days // DAYS_PER_MONTH).astype(np.int64)
+
+    def periods(self, weeks):
+        return int(self.period_of(np.array([self.steps(weeks) - 1]))[0]) + 1
+
+
+def resolution_from_mapping(mapping):
+    """The resolution selected on the main page (kept in ``mapping``)."""
+    return Resolution(
+        steps_per_week=RESOLUTIONS[mapping.get(TIME_STEP_KEY, "Weekly")],
+        period=mapping.get(PERIOD_KEY, PERIODS[0]),
+        dtype=DTYPES[1] if mapping.get(COMPACT_KEY, False) else DTYPES[0],
+    )
+
+
+class _Periods:
+    """Folds chunks of per-step columns into per-period columns.
+
+    ``how`` is ``"flow"`` (average per week), ``"mean"`` or ``"last"``.
+    """
+
+    def __init__(self, resolution, weeks):
+        self.resolution = resolution
+        self.count = resolution.periods(weeks)
+        self.steps = np.zeros(self.count)
+        self.columns = {}
+
+    def add(self, steps, **columns):
+        ids = self.resolution.period_of(steps)
+        self.steps += np.bincount(ids, minlength=self.count)
+        closing = np.append(np.flatnonzero(np.diff(ids)), len(ids) - 1)
+        for name, (how, values) in columns.items():
+            values = np.broadcast_to(values, ids.shape)
+            _, out = self.columns.setdefault(name, (how, np.zeros(self.count)))
+            if how == "last":
+                out[ids[closing]] = values[closing]
+            else:
+                out += np.bincount(ids, weights=values, minlength=self.count)
+
+    def result(self):
+        columns = {}
+        for name, (how, values) in self.columns.items():
+            if how == "flow":
+                values = values / self.steps * self.resolution.steps_per_week
+            elif how == "mean":
+                values = values / self.steps
+            columns[name] = values
+        return ColumnarResult.from_arrays(np.arange(self.count), columns, self.resolution.period.title(),
+                                          self.resolution.dtype)
+
+
+@dataclass(frozen=True)
+class _Chunk:
+    steps: np.ndarray
+    weeks: np.ndarray
+    emission: np.ndarray
+    cumulative_emission: np.ndarray
+    circulating: np.ndarray
+    unlocked_voting: np.ndarray
+    unlocked_non_voting: np.ndarray
+    fees: np.ndarray
+    price: np.ndarray
+
+
+def _per_week(values, weeks):
+    """A scalar input as is, or a weekly series looked up for each step's week."""
+    values = np.asarray(values, dtype=float)
+    return values[weeks] if values.ndim else values
+
+
+def _chunks(params, resolution, series):
+    """The main-page model one chunk of steps at a time."""
+    k = resolution.steps_per_week
+    total = resolution.steps(params.weeks)
+    fees, price, _ = market_inputs(params, series)
+    unlocks = None if params.vesting is None else params.vesting.unlocks(params.weeks)[0]
+    non_voting = None
+    if params.vesting is not None and not params.vesting.tranches["voting"].all():
+        non_voting = params.vesting.unlocks(params.weeks)[1]
+    emitted = unlocked = unlocked_other = 0.0
+    for start in range(0, total, CHUNK_STEPS):
+        steps = np.arange(start, min(start + CHUNK_STEPS, total))
+        weeks = steps // k
+        emission = params.emission.per_step(steps, k)
+        cumulative = emitted + np.cumsum(emission)
+        emitted = cumulative[-1]
+        circulating = params.initial_xtokens + cumulative
+        unlocked_voting = None
+        if unlocks is not None:
+            unlocked_voting = unlocked + np.cumsum(unlocks[weeks] / k)
+            unlocked = unlocked_voting[-1]
+            circulating = circulating + unlocked_voting
+        unlocked_non_voting = None
+        if non_voting is not None:
+            unlocked_non_voting = unlocked_other + np.cumsum(non_voting[weeks] / k)
+            unlocked_other = unlocked_non_voting[-1]
+        yield _Chunk(steps, weeks, emission, cumulative, circulating, unlocked_voting, unlocked_non_voting,
+                     _per_week(fees, weeks) / k, _per_week(price, weeks))
+
+
+@timed("simulation")
+@memoize
+def main_frame_at(params, resolution, series=None):
+    """The main-page frame simulated at ``resolution``."""
+    periods = _Periods(resolution, params.weeks)
+    fees_total = 0.0
+    for chunk in _chunks(params, resolution, series):
+        fdv_tokens = params.locked_tokens + params.initial_xtokens + chunk.cumulative_emission
+        cumulative_fees = fees_total + np.cumsum(np.broadcast_to(chunk.fees, chunk.steps.shape))
+        fees_total = cumulative_fees[-1]
+        circulating_total = chunk.circulating
+        if chunk.unlocked_non_voting is not None:
+            circulating_total = chunk.circulating + chunk.unlocked_non_voting
+        columns = {
+            "Weekly Emission": ("flow", chunk.emission),
+            "Circulating Voting Supply": ("last", chunk.circulating),
+            "Total Supply (FDV)": ("last", fdv_tokens),
+            "Valuation ($)": ("last", circulating_total * chunk.price),
+            "FDV ($)": ("last", fdv_tokens * chunk.price),
+            "Cumulative Fees ($)": ("last", cumulative_fees),
+        }
+        if chunk.unlocked_voting is not None:
+            columns["Unlocked Voting Tokens"] = ("last", chunk.unlocked_voting)
+        if chunk.unlocked_non_voting is not None:
+            columns["Unlocked Non-Voting Tokens"] = ("last", chunk.unlocked_non_voting)
+            columns["Circulating Supply (incl. Non-Voting)"] = ("last", circulating_total)
+        periods.add(chunk.steps, **columns)
+    return periods.result()
+
+
+@timed("user kernels")
+@memoize
+def passive_frame_at(params, my_tokens, resolution, series=None):
+    """The Passive User frame at ``resolution``; lsToken balances compound every step."""
+    _, _, entry_price = market_inputs(params, series)
+    periods = _Periods(resolution, params.weeks)
+    passive_total = ls_total = 0.0
+    growth_before = 1.0
+    for chunk in _chunks(params, resolution, series):
+        weekly = my_tokens / chunk.circulating * chunk.fees
+        cumulative = passive_total + np.cumsum(weekly)
+        passive_total = cumulative[-1]
+
+        growth = growth_before * lstoken_growth(chunk.circulating, chunk.fees, chunk.price)
+        balance_before = np.concatenate([[growth_before], growth[:-1]])
+        growth_before = growth[-1]
+        ls_weekly = my_tokens * balance_before * chunk.fees / chunk.circulating
+        ls_cumulative = ls_total + np.cumsum(ls_weekly)
+        ls_total = ls_cumulative[-1]
+
+        periods.add(
+            chunk.steps,
+            **{
+                "Your Weekly Fees": ("flow", weekly),
+                "Cumulative Fees": ("last", cumulative),
+                "Relative Earnings (%)": ("last", cumulative / (my_tokens * entry_price) * 100),
+                "lsToken Weekly Fees": ("flow", ls_weekly),
+                "lsToken Cumulative Fees": ("last", ls_cumulative),
+                "lsToken Relative Earnings (%)": ("last", ls_cumulative / (my_tokens * entry_price) * 100),
+                "lsToken Holdings": ("last", my_tokens * growth),
+            },
+        )
+    return periods.result()
+
+
+@timed("user kernels")
+@memoize
+def active_frame_at(params, user, resolution, series=None):
+    """The Active User frame at ``resolution``; the multiplier stake grows every step."""
+    _, _, entry_price = market_inputs(params, series)
+    total_volume, user_volume = user.total_volume, user.user_volume
+    if series is not None:
+        total_volume = series.get("total_volume", total_volume)
+        user_volume = series.get("user_volume", user_volume)
+
+    periods = _Periods(resolution, params.weeks)
+    voting_total = volume_total = baseline_total = 0.0
+    for chunk in _chunks(params, resolution, series):
+        voting = voting_earnings(user.voting_tokens, user.my_tokens, chunk.circulating, chunk.fees, entry_price,
+                                 periods_per_year=resolution.steps_per_year)
+        multiplier = staking_multiplier(user.multiplier_tokens, user.reference_stake, len(chunk.steps),
+                                        resolution.steps_per_week, start=chunk.steps[0])
+        volume = volume_rewards(chunk.emission, user.multiplier_tokens, user.reference_stake, user.asset_weight,
+                                _per_week(total_volume, chunk.weeks), _per_week(user_volume, chunk.weeks),
+                                multiplier=multiplier, periods_per_year=resolution.steps_per_year)
+        voting_cumulative = voting_total + voting.cumulative_fees
+        volume_cumulative = volume_total + volume.cumulative_rewards
+        baseline_cumulative = baseline_total + volume.baseline_cumulative_rewards
+        voting_total, volume_total, baseline_total = (
+            voting_cumulative[-1], volume_cumulative[-1], baseline_cumulative[-1])
+
+        periods.add(
+            chunk.steps,
+            **{
+                "Voting Weekly Fees": ("flow", voting.weekly_fees),
+                "Cumulative Voting Fees": ("last", voting_cumulative),
+                "Relative Voting Earnings (%)": ("last", voting_cumulative / (user.my_tokens * entry_price) * 100),
+                "Volume Weekly Rewards": ("flow", volume.weekly_rewards),
+                "Cumulative Volume Rewards": ("last", volume_cumulative),
+                "Baseline Volume Rewards (No Multiplier)": ("last", baseline_cumulative),
+                "Baseline Weekly Rewards (No Multiplier)": ("flow", volume.baseline_weekly_rewards),
+                "Multiplier": ("mean", multiplier),
+                "Voting APR (%)": ("mean", voting.apr),
+                "Volume APR (%)": ("mean", volume.apr),
+            },
+        )
+    return periods.result()
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .columnar import ColumnarResult
+from .profiling import timed
+
+
+@timed("dataframe")
+def _columns(weeks, columns):
+    return ColumnarResult.from_arrays(weeks, columns)
+
+
+@dataclass(frozen=True)
+class EmissionResult:
+    weeks: np.ndarray
+    weekly: np.ndarray
+    cumulative: np.ndarray
+
+
+@dataclass(frozen=True)
+class SupplyResult:
+    circulating: np.ndarray
+    total_fdv: np.ndarray
+    unlocked_voting: np.ndarray = None  # cumulative vested voting tokens, when a schedule is set
+    unlocked_non_voting: np.ndarray = None  # cumulative vested non-voting tokens, when a tranche has them
+
+    @property
+    def circulating_total(self):
+        """The voting supply plus unlocked non-voting tokens, which circulate without voting."""
+        if self.unlocked_non_voting is None:
+            return self.circulating
+        return self.circulating + self.unlocked_non_voting
+
+
+@dataclass(frozen=True)
+class ValuationResult:
+    valuation: np.ndarray
+    fdv: np.ndarray
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Everything the main page plots, computed from one set of global parameters."""
+
+    emission: EmissionResult
+    supply: SupplyResult
+    valuation: ValuationResult
+    cumulative_fees: np.ndarray
+
+    @property
+    def weeks(self):
+        return self.emission.weeks
+
+    def to_columns(self):
+        columns = {
+            "Weekly Emission": self.emission.weekly,
+            "Circulating Voting Supply": self.supply.circulating,
+            "Total Supply (FDV)": self.supply.total_fdv,
+            "Valuation ($)": self.valuation.valuation,
+            "FDV ($)": self.valuation.fdv,
+            "Cumulative Fees ($)": self.cumulative_fees,
+        }
+        if self.supply.unlocked_voting is not None:
+            columns["Unlocked Voting Tokens"] = self.supply.unlocked_voting
+        if self.supply.unlocked_non_voting is not None:
+            columns["Unlocked Non-Voting Tokens"] = self.supply.unlocked_non_voting
+            columns["Circulating Supply (incl. Non-Voting)"] = self.supply.circulating_total
+        return _columns(self.weeks, columns)
+
+    def to_frame(self):
+        return self.to_columns().to_pandas()
+
+
+@dataclass(frozen=True)
+class PassiveResult:
+    weekly_fees: np.ndarray
+    cumulative_fees: np.ndarray
+    relative_pct: np.ndarray
+
+
+@dataclass(frozen=True)
+class LsTokenResult:
+    weekly_fees: np.ndarray
+    cumulative_fees: np.ndarray
+    relative_pct: np.ndarray
+    holdings: np.ndarray
+
+
+@dataclass(frozen=True)
+class VotingResult:
+    weekly_fees: np.ndarray
+    cumulative_fees: np.ndarray
+    relative_pct: np.ndarray
+    apr: np.ndarray
+
+
+@dataclass(frozen=True)
+class VolumeResult:
+    multiplier: np.ndarray
+    weekly_rewards: np.ndarray
+    cumulative_rewards: np.ndarray
+    baseline_weekly_rewards: np.ndarray
+    baseline_cumulative_rewards: np.ndarray
+    apr: np.ndarray
+
+
+@dataclass(frozen=True)
+class MultiAssetResult:
+    names: tuple
+    assets: VolumeResult  # (assets, weeks) arrays; the multiplier is shared
+    weekly_rewards: np.ndarray
+    cumulative_rewards: np.ndarray
+    apr: np.ndarray
+
+    def to_columns(self, weeks):
+        """Per-asset weekly and cumulative rewards and APR, plus the totals over all assets."""
+        columns = {}
+        for index, name in enumerate(self.names):
+            columns[f"{name} Weekly Rewards"] = self.assets.weekly_rewards[index]
+            columns[f"{name} Cumulative Rewards"] = self.assets.cumulative_rewards[index]
+            columns[f"{name} APR (%)"] = self.assets.apr[index]
+        columns["Total Weekly Rewards"] = self.weekly_rewards
+        columns["Total Cumulative Rewards"] = self.cumulative_rewards
+        columns["Total Volume APR (%)"] = self.apr
+        return _columns(weeks, columns)
+
+    def to_frame(self, weeks):
+        return self.to_columns(weeks).to_pandas()
+
+
+@dataclass(frozen=True)
+class ActiveResult:
+    voting: VotingResult
+    volume: VolumeResult
+
+    def to_columns(self, weeks):
+        return _columns(weeks, {
+            "Voting Weekly Fees": self.voting.weekly_fees,
+            "Cumulative Voting Fees": self.voting.cumulative_fees,
+            "Relative Voting Earnings (%)": self.voting.relative_pct,
+            "Volume Weekly Rewards": self.volume.weekly_rewards,
+            "Cumulative Volume Rewards": self.volume.cumulative_rewards,
+            "Baseline Volume Rewards (No Multiplier)": self.volume.baseline_cumulative_rewards,
+            "Baseline Weekly Rewards (No Multiplier)": self.volume.baseline_weekly_rewards,
+            "Multiplier": self.volume.multiplier,
+            "Voting APR (%)": self.voting.apr,
+            "Volume APR (%)": self.volume.apr,
+        })
+
+    def to_frame(self, weeks):
+        return self.to_columns(weeks).to_pandas()
+
+
+def passive_columns(weeks, passive, ls_token):
+    """Data behind the Passive User page."""
+    return _columns(weeks, {
+        "Your Weekly Fees": passive.weekly_fees,
+        "Cumulative Fees": passive.cumulative_fees,
+        "Relative Earnings (%)": passive.relative_pct,
+        "lsToken Weekly Fees": ls_token.weekly_fees,
+        "lsToken Cumulative Fees": ls_token.cumulative_fees,
+        "lsToken Relative Earnings (%)": ls_token.relative_pct,
+        "lsToken Holdings": ls_token.holdings,
+    })
+
+
+def passive_frame(weeks, passive, ls_token):
+    return passive_columns(weeks, passive, ls_token).to_pandas()
@@ -0,0 +1,136 @@
+"""Sensitivity of the ROI and APR series to every tokenomics and user input.
+
+All perturbations are rows of one ``(rows, 1)`` batch that goes through the
+kernels once, with week as the last axis as everywhere else. For each of
+the P parameters there are four rows: ±``step`` for a central-difference
+derivative, and ±``swing`` for the tornado chart's low and high values.
+The batch has 4P + 1 rows, and one vectorized evaluation replaces 2P page
+reruns.
+
+Where a metric is a pure power of a parameter, its elasticity is known
+exactly and replaces the finite difference. Examples: the passive ROI is
+``cumsum(fees / supply) / price``, and the volume APR is linear in the
+asset weight. Elasticities are ``d metric / d parameter * parameter /
+metric``, so a value of 0.5 means a 1% change in the input moves the metric
+by 0.5%. Weeks where the metric is zero get an elasticity of 0.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .cache import memoize
+from .columnar import ColumnarResult
+from .profiling import timed
+from .sweep import evaluate_batch
+
+GLOBAL_PARAMETERS = ("base_emission", "decay_percent", "weekly_fees", "initial_price", "initial_xtokens")
+USER_PARAMETERS = ("my_tokens", "voting_tokens", "multiplier_tokens", "reference_stake",
+                   "asset_weight", "total_volume", "user_volume")
+SENSITIVITY_PARAMETERS = GLOBAL_PARAMETERS + USER_PARAMETERS
+PASSIVE_METRICS = ("Relative Earnings (%)", "lsToken Relative Earnings (%)")
+ACTIVE_METRICS = ("Relative Voting Earnings (%)", "Voting APR (%)", "Volume APR (%)")
+SENSITIVITY_METRICS = PASSIVE_METRICS + ACTIVE_METRICS
+DEFAULT_STEP = 1e-4
+DEFAULT_SWING = 0.10
+
+# exact elasticities of metrics that are a pure power of a parameter
+ANALYTIC_ELASTICITIES = {
+    "Relative Earnings (%)": {"weekly_fees": 1, "initial_price": -1, "my_tokens": 0},
+    "lsToken Relative Earnings (%)": {"my_tokens": 0},
+    "Relative Voting Earnings (%)": {"weekly_fees": 1, "initial_price": -1, "voting_tokens": 1, "my_tokens": -1},
+    "Voting APR (%)": {"weekly_fees": 1, "initial_price": -1, "voting_tokens": 0, "my_tokens": 0},
+    "Volume APR (%)": {"asset_weight": 1},
+}
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    """Per-week metric, derivative and elasticity arrays; the latter two are ``(parameters, weeks)``."""
+
+    weeks: np.ndarray
+    parameters: tuple
+    values: dict
+    derivatives: dict
+    elasticities: dict
+    low: dict  # final-week metric with each parameter at (1 - swing) times its value
+    high: dict
+    swing: float
+
+    def elasticity_series(self, metric, parameters=None):
+        """Per-week elasticities of ``metric``, one column per parameter."""
+        parameters = self.parameters if parameters is None else parameters
+        rows = self.elasticities[metric]
+        return ColumnarResult.from_arrays(
+            self.weeks, {name: rows[self.parameters.index(name)] for name in parameters})
+
+    def tornado(self, metric):
+        """Final-week elasticity and the metric at ±swing, ranked by the larger swing."""
+        base = self.values[metric][-1]
+        frame = pd.DataFrame({
+            "Parameter": self.parameters,
+            "Elasticity": self.elasticities[metric][:, -1],
+            "Low": self.low[metric],
+            "High": self.high[metric],
+        })
+        frame["Base"] = base
+        frame["Impact"] = np.maximum(np.abs(frame["Low"] - base), np.abs(frame["High"] - base))
+        return frame.sort_values("Impact", ascending=False).set_index("Parameter")
+
+
+@timed("sensitivity")
+def sensitivity_analysis(params, user, step=DEFAULT_STEP, swing=DEFAULT_SWING):
+    """Derivatives and elasticities of every metric in ``SENSITIVITY_METRICS`` for ``params`` and ``user``.
+
+    With an emission curve set, ``base_emission`` and ``decay_percent`` have
+    no effect and are left out.
+    """
+    parameters = SENSITIVITY_PARAMETERS
+    if params.emission_curve is not None:
+        parameters = tuple(name for name in parameters if name not in ("base_emission", "decay_percent"))
+    inputs = {**params.to_dict(), **user.to_dict()}
+    base = np.array([float(inputs[name]) for name in parameters])
+    # relative steps, with an absolute fallback for parameters that are zero
+    h = step * np.where(base != 0, np.abs(base), 1.0)
+
+    count = len(parameters)
+    offsets = np.zeros((4 * count + 1, count))
+    diagonal = np.arange(count)
+    offsets[1 + diagonal, diagonal] = h
+    offsets[1 + count + diagonal, diagonal] = -h
+    offsets[1 + 2 * count + diagonal, diagonal] = -swing * base
+    offsets[1 + 3 * count + diagonal, diagonal] = swing * base
+
+    columns = {name: float(inputs[name]) for name in (*SENSITIVITY_PARAMETERS, "locked_tokens")}
+    for index, name in enumerate(parameters):
+        columns[name] = (columns[name] + offsets[:, index])[:, None]
+    curve, vesting = params.emission_curve, params.vesting
+    block = evaluate_batch(columns, params.weeks, SENSITIVITY_METRICS,
+                           None if curve is None else curve.weekly(params.weeks),
+                           None if vesting is None else vesting.cumulative_voting(params.weeks),
+                           None if vesting is None else vesting.cumulative_non_voting(params.weeks))
+
+    values, derivatives, elasticities, low, high = {}, {}, {}, {}, {}
+    for metric, rows in block.items():
+        value = rows[0]
+        derivative = (rows[1:1 + count] - rows[1 + count:1 + 2 * count]) / (2 * h[:, None])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            elasticity = np.where(value != 0, derivative * base[:, None] / value, 0.0)
+        for name, exact in ANALYTIC_ELASTICITIES.get(metric, {}).items():
+            if name in parameters:
+                index = parameters.index(name)
+                elasticity[index] = np.where(value != 0, exact, 0.0)
+                if base[index] != 0:
+                    derivative[index] = elasticity[index] * value / base[index]
+        values[metric] = value
+        derivatives[metric] = derivative
+        elasticities[metric] = np.nan_to_num(elasticity)
+        low[metric] = rows[1 + 2 * count:1 + 3 * count, -1]
+        high[metric] = rows[1 + 3 * count:, -1]
+
+    return SensitivityResult(np.arange(params.weeks), parameters, values, derivatives, elasticities, low, high, swing)
+
+
+@memoize
+def sensitivity_for(params, user, step=DEFAULT_STEP, swing=DEFAULT_SWING):
+    return sensitivity_analysis(params, user, step, swing)
@@ -0,0 +1,131 @@
+"""Per-week input series (fees, price, volumes) read from uploaded files.
+
+A file may hold any of ``SERIES_FIELDS`` as columns, plus an optional
+``week`` column (rows are weeks 0, 1, 2, ... otherwise). Files are read in
+chunks and only the recognised columns are kept, so a wide or long export
+does not have to fit in memory as a whole frame. The parsed points are
+cached by the SHA-256 of the file's bytes, so a rerun with the same upload
+skips parsing, and aligning to a new horizon or fill method reuses them.
+
+Aligned series compare and hash by (digest, weeks, fill), so they can be
+passed to the memoized views like any other parameter.
+"""
+import hashlib
+import io
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .cache import RESULT_CACHE, memoize
+
+SERIES_FIELDS = ("weekly_fees", "initial_price", "user_volume", "total_volume")
+WEEK_FIELD = "week"
+FILL_METHODS = ("ffill", "interpolate")
+CHUNK_ROWS = 100_000
+
+# session-state keys the pages share
+SERIES_FILE_KEY = "series_file"
+SERIES_FILL_KEY = "series_fill"
+
+
+@dataclass(frozen=True)
+class SeriesFile:
+    digest: str
+    name: str = field(compare=False)
+    rows: int = field(compare=False)
+    points: dict = field(compare=False, repr=False)  # field -> (weeks, values)
+
+    @property
+    def fields(self):
+        return tuple(self.points)
+
+
+@dataclass(frozen=True)
+class InputSeries:
+    digest: str
+    weeks: int
+    fill: str
+    values: dict = field(compare=False, repr=False)  # field -> (weeks,) array
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def get(self, name, default):
+        """The weekly series for ``name``, or ``default`` (a scalar) if the file does not have it."""
+        return self.values.get(name, default)
+
+
+# --- Parsing ---
+def _csv_chunks(data):
+    yield from pd.read_csv(io.BytesIO(data), chunksize=CHUNK_ROWS,
+                           usecols=lambda column: column in SERIES_FIELDS or column == WEEK_FIELD)
+
+
+def _parquet_chunks(data):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Reading Parquet series requires pyarrow (pip install pyarrow).") from exc
+    handle = pq.ParquetFile(io.BytesIO(data))
+    columns = [name for name in handle.schema_arrow.names if name in SERIES_FIELDS or name == WEEK_FIELD]
+    for batch in handle.iter_batches(batch_size=CHUNK_ROWS, columns=columns):
+        yield batch.to_pandas()
+
+
+def _parse(data, name):
+    chunks = _parquet_chunks(data) if name.endswith(".parquet") else _csv_chunks(data)
+    collected = {column: ([], []) for column in SERIES_FIELDS}
+    rows = 0
+    for chunk in chunks:
+        weeks = (chunk[WEEK_FIELD].to_numpy(dtype=float) if WEEK_FIELD in chunk
+                 else np.arange(rows, rows + len(chunk), dtype=float))
+        rows += len(chunk)
+        for column in SERIES_FIELDS:
+            if column in chunk:
+                values = pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=float)
+                keep = ~np.isnan(values) & ~np.isnan(weeks)
+                collected[column][0].append(weeks[keep])
+                collected[column][1].append(values[keep])
+
+    points = {column: (np.concatenate(weeks), np.concatenate(values))
+              for column, (weeks, values) in collected.items() if weeks and sum(map(len, weeks))}
+    if not points:
+        raise ValueError(f"{name} has none of the columns {', '.join(SERIES_FIELDS)}")
+    return SeriesFile(hashlib.sha256(data).hexdigest(), name, rows, points)
+
+
+def load_series_file(data, name):
+    """Parse an uploaded CSV or Parquet file, reusing the cached result for identical bytes."""
+    digest = hashlib.sha256(data).hexdigest()
+    return RESULT_CACHE.get_or_compute(("series_file", digest, name.endswith(".parquet")),
+                                       lambda: _parse(data, name))
+
+
+# --- Alignment ---
+@memoize
+def align_series(series_file, weeks, fill="ffill"):
+    """Every series in ``series_file`` on weeks ``0 .. weeks - 1``.
+
+    Gaps are forward-filled or linearly interpolated between known weeks;
+    weeks before the first point take the first value and weeks after the
+    last point keep the last value.
+    """
+    if fill not in FILL_METHODS:
+        raise ValueError(f"Unknown fill method {fill!r}; use one of {FILL_METHODS}")
+    horizon = pd.RangeIndex(weeks)
+    values = {}
+    for column, (week_index, points) in series_file.points.items():
+        known = pd.Series(points, index=week_index).groupby(level=0).last()
+        combined = known.reindex(known.index.union(horizon))
+        combined = combined.interpolate(method="index") if fill == "interpolate" else combined.ffill()
+        values[column] = combined.bfill().reindex(horizon).to_numpy()
+    return InputSeries(series_file.digest, weeks, fill, values)
+
+
+def series_from_mapping(mapping, weeks):
+    """The aligned series selected on the main page (kept in ``mapping``), or ``None``."""
+    series_file = mapping.get(SERIES_FILE_KEY)
+    if series_file is None:
+        return None
+    return align_series(series_file, weeks, mapping.get(SERIES_FILL_KEY, FILL_METHODS[0]))
@@ -0,0 +1,343 @@
+"""On-disk scenario store: results that outlive sessions, restarts and processes.
+
+A scenario is keyed by a canonical hash of everything its result depends
+on, so every session and process that asks for the same sweep or Monte
+Carlo run gets the stored result instead of recomputing it. Each array of
+a result is one ``.npy`` file in the scenario's directory. Arrays are loaded
+memory-mapped and read-only, so a load costs no copies and concurrent
+readers share the OS page cache. An SQLite index next to the directories
+records each scenario's kind, label, inputs, size and last use, and is safe
+to share between processes. Once the store grows past ``max_bytes``, the
+least recently used scenarios are evicted.
+
+Results are written to a temporary directory and renamed into place, so a
+reader never sees a half-written scenario. If two processes compute the
+same scenario, the first rename wins.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .columnar import ColumnarResult
+from .montecarlo import MonteCarloResult
+from .profiling import timed
+from .sweep import SweepResult
+
+STORE_ENV = "EMSETUP_STORE"
+STORE_MB_ENV = "EMSETUP_STORE_MB"
+DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "emsetup", "scenarios")
+DEFAULT_MAX_BYTES = 2**30
+FORMAT_VERSION = 1
+INLINE_ARRAY_SIZE = 64  # larger input arrays are keyed by a hash of their bytes
+
+_RESULT_TYPES = {cls.__name__: cls for cls in (SweepResult, MonteCarloResult)}
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    layout TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+# --- Keys ---
+def canonical(value):
+    """A JSON-serializable form of ``value`` that equal inputs share.
+
+    Dataclasses contribute the fields they compare on, so uploaded tranches
+    and custom emissions enter through their digest. Numbers are
+    normalized, so ``20000`` and ``20000.0`` share a key. Small arrays are
+    kept as values (which keeps them readable in a diff); larger ones
+    enter by a hash of their bytes.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float, np.number)):
+        value = float(value)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, np.ndarray):
+        if value.size <= INLINE_ARRAY_SIZE:
+            return [canonical(item) for item in value.ravel().tolist()]
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"sha256": digest, "dtype": str(value.dtype), "shape": list(value.shape)}
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return {"sha256": hashlib.sha256(pd.util.hash_pandas_object(value).to_numpy().tobytes()).hexdigest()}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__type__": type(value).__name__, **{
+            f.name: canonical(getattr(value, f.name)) for f in dataclasses.fields(value) if f.compare}}
+    if isinstance(value, dict):
+        return {str(key): canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    raise TypeError(f"Cannot key a scenario on a {type(value).__name__}")
+
+
+def _dumps(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def scenario_key(kind, inputs):
+    """Hex digest identifying the result of ``kind`` for ``inputs`` (any mapping of canonicalizable values)."""
+    return hashlib.sha256(_dumps([FORMAT_VERSION, kind, canonical(inputs)]).encode()).hexdigest()
+
+
+# --- Results <-> arrays ---
+def _encode(result):
+    """Named arrays of ``result`` and the JSON layout that rebuilds it from them."""
+    if isinstance(result, ColumnarResult):
+        layout = {"type": "ColumnarResult", "names": list(result.names), "index_name": result.index_name}
+        return {"index": result.index, "block": result.block}, layout
+    if type(result).__name__ not in _RESULT_TYPES:
+        raise TypeError(f"Cannot store a {type(result).__name__}")
+    arrays, fields = {}, {}
+    for f in dataclasses.fields(result):
+        value = getattr(result, f.name)
+        if isinstance(value, np.ndarray):
+            arrays[f.name] = value
+            fields[f.name] = {"array": f.name}
+        elif isinstance(value, dict):
+            arrays.update({f"{f.name}.{position}": np.asarray(item) for position, item in enumerate(value.values())})
+            fields[f.name] = {"arrays": [str(name) for name in value]}
+        else:
+            fields[f.name] = {"value": canonical(value)}
+    return arrays, {"type": type(result).__name__, "fields": fields}
+
+
+def _decode(layout, arrays):
+    if layout["type"] == "ColumnarResult":
+        return ColumnarResult(arrays["index"], layout["names"], arrays["block"], layout["index_name"])
+    values = {}
+    for name, spec in layout["fields"].items():
+        if "array" in spec:
+            values[name] = arrays[spec["array"]]
+        elif "arrays" in spec:
+            values[name] = {item: arrays[f"{name}.{position}"] for position, item in enumerate(spec["arrays"])}
+        else:
+            values[name] = spec["value"]
+    return _RESULT_TYPES[layout["type"]](**values)
+
+
+def named_arrays(result):
+    """Every array of a stored result under a readable name, e.g. ``metrics: FDV ($)``."""
+    if isinstance(result, ColumnarResult):
+        return {name: result[name] for name in result.names}
+    arrays = {}
+    for f in dataclasses.fields(result):
+        value = getattr(result, f.name)
+        if isinstance(value, np.ndarray):
+            arrays[f.name] = value
+        elif isinstance(value, dict):
+            arrays.update({f"{f.name}: {name}": np.asarray(item) for name, item in value.items()})
+    return arrays
+
+
+# --- Store ---
+@dataclass(frozen=True)
+class Scenario:
+    """One row of the store's index."""
+
+    key: str
+    kind: str
+    label: str
+    inputs: dict  # canonical form of the inputs the key was computed from
+    bytes: int
+    created: float
+    accessed: float
+
+
+class ScenarioStore:
+    """Results on disk under ``root``, keyed by ``scenario_key`` and bounded by ``max_bytes``."""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.sqlite")
+
+    def _connect(self):
+        os.makedirs(self.root, exist_ok=True)
+        db = sqlite3.connect(self.index_path, timeout=30)
+        db.execute(_SCHEMA)
+        return db
+
+    def _path(self, key):
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key):
+        try:
+            with closing(self._connect()) as db:
+                return db.execute("SELECT 1 FROM scenarios WHERE key = ?", (key,)).fetchone() is not None
+        except (OSError, sqlite3.Error):  # an unusable store holds nothing
+            return False
+
+    def __len__(self):
+        with closing(self._connect()) as db:
+            return db.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    @property
+    def nbytes(self):
+        with closing(self._connect()) as db:
+            return db.execute("SELECT COALESCE(SUM(bytes), 0) FROM scenarios").fetchone()[0]
+
+    def scenarios(self):
+        """Every stored scenario, most recently used first."""
+        with closing(self._connect()) as db:
+            rows = db.execute("SELECT key, kind, label, inputs, bytes, created, accessed FROM scenarios "
+                              "ORDER BY accessed DESC").fetchall()
+        return [Scenario(key, kind, label, json.loads(inputs), size, created, accessed)
+                for key, kind, label, inputs, size, created, accessed in rows]
+
+    @timed("store")
+    def load(self, key):
+        """The stored result for ``key`` with memory-mapped, read-only arrays, or ``None``."""
+        with closing(self._connect()) as db, db:
+            row = db.execute("SELECT layout FROM scenarios WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE scenarios SET accessed = ? WHERE key = ?", (time.time(), key))
+        layout = json.loads(row[0])
+        try:
+            arrays = {name: np.load(os.path.join(self._path(key), f"{name}.npy"), mmap_mode="r")
+                      for name in layout["arrays"]}
+        except FileNotFoundError:  # evicted by another process in the meantime
+            self.delete(key)
+            return None
+        return _decode(layout["result"], arrays)
+
+    @timed("store")
+    def save(self, key, kind, inputs, result, label=None):
+        """Write ``result`` under ``key``, then evict the least recently used scenarios beyond ``max_bytes``.
+
+        A result larger than ``max_bytes`` on its own is not stored.
+        """
+        arrays, layout = _encode(result)
+        staging = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            for name, values in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+            size = sum(entry.stat().st_size for entry in os.scandir(staging))
+            if size > self.max_bytes:  # would evict everything else, so it is not kept
+                shutil.rmtree(staging)
+                return
+            os.rename(staging, self._path(key))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(self._path(key)):
+                raise
+            # another process stored the same arrays first; (re)index them
+            size = sum(entry.stat().st_size for entry in os.scandir(self._path(key)))
+
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            db.execute("INSERT OR REPLACE INTO scenarios VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+                key, kind, label or kind, _dumps(canonical(inputs)),
+                _dumps({"arrays": list(arrays), "result": layout}), size, now, now,
+            ))
+        self.evict(keep=key)
+
+    def get_or_compute(self, kind, inputs, compute, label=None):
+        """The stored result of ``kind`` for ``inputs``, or ``compute()`` stored for next time.
+
+        If the store cannot be read or written (a read-only disk, say), the result is computed and not kept.
+        """
+        key = scenario_key(kind, inputs)
+        try:
+            result = self.load(key)
+        except (OSError, sqlite3.Error):
+            return compute()
+        if result is None:
+            result = compute()
+            try:
+                self.save(key, kind, inputs, result, label)
+            except (OSError, sqlite3.Error):
+                pass
+        return result
+
+    def delete(self, key):
+        with closing(self._connect()) as db, db:
+            db.execute("DELETE FROM scenarios WHERE key = ?", (key,))
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def evict(self, keep=None):
+        """Delete the least recently used scenarios (never ``keep``) until the store fits ``max_bytes``."""
+        with closing(self._connect()) as db:
+            rows = db.execute("SELECT key, bytes FROM scenarios ORDER BY accessed").fetchall()
+        total = sum(size for _, size in rows)
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                self.delete(key)
+                total -= size
+
+    def clear(self):
+        for scenario in self.scenarios():
+            self.delete(scenario.key)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """The store the pages share: ``$EMSETUP_STORE`` (default ``~/.cache/emsetup/scenarios``),
+    capped at ``$EMSETUP_STORE_MB`` megabytes (default 1024)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            megabytes = os.environ.get(STORE_MB_ENV)
+            _default = ScenarioStore(os.environ.get(STORE_ENV) or DEFAULT_ROOT,
+                                     DEFAULT_MAX_BYTES if megabytes is None else int(float(megabytes) * 2**20))
+        return _default
+
+
+# --- Diffs ---
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        items = {}
+        for key, item in value.items():
+            if key != "__type__":
+                items.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+        return items
+    return {prefix: value}
+
+
+def diff_inputs(a, b):
+    """Inputs that differ between scenarios ``a`` and ``b``, one row per dotted input name."""
+    left, right = _flatten(a.inputs), _flatten(b.inputs)
+    names = [name for name in {**left, **right} if left.get(name) != right.get(name)]
+    return pd.DataFrame({
+        "A": [_dumps(left[name]) if name in left else "–" for name in names],
+        "B": [_dumps(right[name]) if name in right else "–" for name in names],
+    }, index=pd.Index(names, name="Input"))
+
+
+def diff_results(a, b):
+    """Mean of every array in two results and, where their shapes match, the largest absolute difference."""
+    left, right = named_arrays(a), named_arrays(b)
+    rows = {}
+    for name in {**left, **right}:
+        x, y = left.get(name), right.get(name)
+        rows[name] = {
+            "Mean A": np.nan if x is None else float(np.mean(x)),
+            "Mean B": np.nan if y is None else float(np.mean(y)),
+            "Max |A − B|": float(np.max(np.abs(x - y), initial=0.0))
+            if x is not None and y is not None and x.shape == y.shape else np.nan,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("Array")
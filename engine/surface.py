@@ -0,0 +1,80 @@
+"""Passive User results for any holding, scaled from one per-token run.
+
+For fixed global parameters, every column of the Passive page is either a
+ROI, which does not depend on the holding, or a per-token amount times the
+holding. The holdings × week surface is therefore rank one. It is stored as
+a single row per column, computed once through the kernels for one token,
+and a lookup multiplies the per-token rows by the holding. That is exact up
+to floating-point rounding, with no grid and no interpolation. A new
+holding costs one multiply over the horizon instead of a kernel run and a
+cache miss in ``passive_view``.
+
+Rows are computed for the horizon rounded up to whole years, and shorter
+horizons read a prefix of them. Every emission curve and vesting schedule
+gives the same first weeks whatever the horizon. Uploaded series,
+sub-weekly resolutions and non-positive holdings need the exact path.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .cache import memoize
+from .columnar import ColumnarResult
+from .kernels import lstoken_earnings, passive_earnings
+from .profiling import timed
+from .views import simulation_for
+
+SURFACE_COLUMNS = ("Your Weekly Fees", "Cumulative Fees", "Relative Earnings (%)", "lsToken Weekly Fees",
+                   "lsToken Cumulative Fees", "lsToken Relative Earnings (%)", "lsToken Holdings")
+PER_TOKEN = ("Your Weekly Fees", "Cumulative Fees", "lsToken Weekly Fees", "lsToken Cumulative Fees",
+             "lsToken Holdings")
+HORIZON_STEP = 52
+
+_PER_TOKEN_ROWS = np.array([name in PER_TOKEN for name in SURFACE_COLUMNS])
+
+
+@dataclass(frozen=True)
+class RoiSurface:
+    """Passive page columns for one token; ``block`` is ``(columns, weeks)``."""
+
+    block: np.ndarray  # per-token amounts for the PER_TOKEN columns, ROIs as they are
+
+    @property
+    def weeks(self):
+        return self.block.shape[-1]
+
+    def covers(self, my_tokens, weeks):
+        return my_tokens > 0 and weeks <= self.weeks
+
+    @timed("user kernels")
+    def lookup(self, my_tokens, weeks):
+        """The Passive page columns for ``my_tokens`` over ``weeks`` weeks."""
+        if not self.covers(my_tokens, weeks):
+            raise ValueError(f"{my_tokens:,} tokens over {weeks} weeks is outside the surface "
+                             f"(positive holdings, {self.weeks} weeks)")
+        rows = self.block[:, :weeks].copy()
+        rows[_PER_TOKEN_ROWS] *= my_tokens
+        return ColumnarResult(np.arange(weeks), SURFACE_COLUMNS, rows)
+
+
+@timed("surface")
+def roi_surface(params):
+    """Per-token Passive page rows for ``params`` (constant fees and price)."""
+    supply = simulation_for(params).supply.circulating
+    fees, price = params.weekly_fees, params.initial_price
+    passive = passive_earnings(1.0, supply, fees, price)
+    ls_token = lstoken_earnings(1.0, supply, fees, price)
+    columns = (passive.weekly_fees, passive.cumulative_fees, passive.relative_pct, ls_token.weekly_fees,
+               ls_token.cumulative_fees, ls_token.relative_pct, ls_token.holdings)
+    return RoiSurface(np.stack([np.broadcast_to(values, (params.weeks,)) for values in columns]))
+
+
+@memoize
+def _surface_for(params):
+    return roi_surface(params)
+
+
+def roi_surface_for(params):
+    """The cached rows covering ``params.weeks``, shared by every horizon in the same year."""
+    horizon = -(-params.weeks // HORIZON_STEP) * HORIZON_STEP
+    return _surface_for(params.replace(weeks=horizon))
@@ -0,0 +1,193 @@
+"""Cartesian parameter sweeps over the global tokenomics settings.
+
+Every configuration is one row of a parameters x weeks block. The grid is
+flattened and evaluated in row chunks sized to stay under ``max_bytes``, and
+only the final-week metrics are kept, so memory is bounded by the chunk, not
+the grid.
+
+``evaluate_batch`` is the stacked evaluation itself: named input columns in,
+one ``(rows, weeks)`` array per metric out. Sensitivity analysis and
+scenario comparison run their batches through it too.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .kernels import (
+    emission_schedule,
+    lstoken_earnings,
+    passive_earnings,
+    supply_curve,
+    valuation_curve,
+    volume_rewards,
+    voting_earnings,
+)
+from .profiling import timed
+
+SWEEP_PARAMETERS = ("base_emission", "decay_percent", "weekly_fees", "initial_price")
+EMISSION_PARAMETERS = ("base_emission", "decay_percent")  # replaced by a fixed emission curve
+SWEEP_METRICS = (
+    "Circulating Voting Supply",
+    "Valuation ($)",
+    "FDV ($)",
+    "Relative Earnings (%)",
+    "lsToken Relative Earnings (%)",
+)
+BATCH_METRICS = (
+    "Weekly Emission",
+    "Circulating Voting Supply",
+    "Total Supply (FDV)",
+    "Valuation ($)",
+    "FDV ($)",
+    "Cumulative Fees",
+    "Relative Earnings (%)",
+    "lsToken Cumulative Fees",
+    "lsToken Relative Earnings (%)",
+    "Relative Voting Earnings (%)",
+    "Voting APR (%)",
+    "Volume APR (%)",
+)
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+# parameters x weeks float64 blocks alive at once while evaluating one chunk
+_LIVE_BLOCKS = 8
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Final-week metrics on the full grid, one array of shape ``grid_shape`` per metric."""
+
+    axes: dict
+    metrics: dict
+    weeks: int
+    chunks: int
+
+    @property
+    def grid_shape(self):
+        return tuple(len(values) for values in self.axes.values())
+
+    @property
+    def size(self):
+        return int(np.prod(self.grid_shape))
+
+    def surface(self, metric, x, y, at=None):
+        """2-D slice of ``metric`` over axes ``x`` and ``y`` with the other axes fixed.
+
+        ``at`` maps each remaining axis name to an index into its values (default 0).
+        """
+        at = at or {}
+        names = list(self.axes)
+        index = tuple(slice(None) if name in (x, y) else at.get(name, 0) for name in names)
+        block = self.metrics[metric][index]
+        if names.index(x) < names.index(y):
+            block = block.T
+        return pd.DataFrame(block, index=pd.Index(self.axes[y], name=y),
+                            columns=pd.Index(self.axes[x], name=x))
+
+    def to_frame(self):
+        """One row per configuration (long format), for export."""
+        grids = np.meshgrid(*self.axes.values(), indexing="ij")
+        columns = {name: grid.ravel() for name, grid in zip(self.axes, grids)}
+        columns.update({name: values.ravel() for name, values in self.metrics.items()})
+        return pd.DataFrame(columns)
+
+
+def swept_parameters(params):
+    """The entries of ``SWEEP_PARAMETERS`` that change the results under ``params``."""
+    if params.emission_curve is None:
+        return SWEEP_PARAMETERS
+    return tuple(name for name in SWEEP_PARAMETERS if name not in EMISSION_PARAMETERS)
+
+
+def chunk_rows(weeks, max_bytes=DEFAULT_MAX_BYTES):
+    """Number of configurations evaluated together so a chunk stays under ``max_bytes``."""
+    return max(1, int(max_bytes // (weeks * 8 * _LIVE_BLOCKS)))
+
+
+def evaluate_batch(columns, weeks, metrics=BATCH_METRICS, weekly_emissions=None, unlocked=None,
+                   unlocked_non_voting=None):
+    """Each of ``metrics`` for a batch of inputs, as ``(rows, weeks)`` arrays.
+
+    ``columns`` maps ``TokenomicsParams`` and ``UserParams`` field names to
+    scalars or ``(rows, 1)`` columns; ``my_tokens`` defaults to one token, and
+    user fields are needed only for the voting and volume metrics.
+    ``weekly_emissions`` replaces the geometric emissions of ``base_emission``
+    and ``decay_percent``, e.g. with a fixed curve or one row per curve.
+    Only the kernels behind ``metrics`` run.
+    """
+    c = columns
+    if weekly_emissions is None:
+        weekly_emissions = emission_schedule(c["base_emission"], c["decay_percent"], weeks).weekly
+    supply = supply_curve(np.cumsum(weekly_emissions, axis=-1), c["initial_xtokens"], c["locked_tokens"], unlocked,
+                          unlocked_non_voting)
+    fees, price, my_tokens = c["weekly_fees"], c["initial_price"], c.get("my_tokens", 1.0)
+    wanted = set(metrics)
+    values = {
+        "Weekly Emission": weekly_emissions,
+        "Circulating Voting Supply": supply.circulating,
+        "Total Supply (FDV)": supply.total_fdv,
+    }
+    if wanted & {"Valuation ($)", "FDV ($)"}:
+        valuation = valuation_curve(supply, price)
+        values.update({"Valuation ($)": valuation.valuation, "FDV ($)": valuation.fdv})
+    if wanted & {"Cumulative Fees", "Relative Earnings (%)"}:
+        passive = passive_earnings(my_tokens, supply.circulating, fees, price)
+        values.update({"Cumulative Fees": passive.cumulative_fees, "Relative Earnings (%)": passive.relative_pct})
+    if wanted & {"lsToken Cumulative Fees", "lsToken Relative Earnings (%)"}:
+        ls_token = lstoken_earnings(my_tokens, supply.circulating, fees, price)
+        values.update({"lsToken Cumulative Fees": ls_token.cumulative_fees,
+                       "lsToken Relative Earnings (%)": ls_token.relative_pct})
+    if wanted & {"Relative Voting Earnings (%)", "Voting APR (%)"}:
+        voting = voting_earnings(c["voting_tokens"], my_tokens, supply.circulating, fees, price)
+        values.update({"Relative Voting Earnings (%)": voting.relative_pct, "Voting APR (%)": voting.apr})
+    if "Volume APR (%)" in wanted:
+        volume = volume_rewards(weekly_emissions, c["multiplier_tokens"], c["reference_stake"], c["asset_weight"],
+                                c["total_volume"], c["user_volume"])
+        values["Volume APR (%)"] = volume.apr
+    shape = np.broadcast_shapes(*(np.shape(values[name]) for name in metrics))
+    return {name: np.broadcast_to(values[name], shape) for name in metrics}
+
+
+@timed("sweep")
+def run_sweep(params, ranges, max_bytes=DEFAULT_MAX_BYTES):
+    """Evaluate every combination of ``ranges`` on top of ``params``.
+
+    ``ranges`` maps names from ``SWEEP_PARAMETERS`` to 1-D value arrays; any
+    parameter left out is held at its value in ``params``. With a fixed
+    emission curve, ``EMISSION_PARAMETERS`` have no effect and cannot be swept.
+    """
+    unknown = set(ranges) - set(swept_parameters(params))
+    if unknown:
+        raise ValueError(f"Cannot sweep over {sorted(unknown)}; choose from {swept_parameters(params)}")
+
+    axes = {
+        name: np.atleast_1d(np.asarray(ranges.get(name, getattr(params, name)), dtype=float))
+        for name in SWEEP_PARAMETERS
+    }
+    shape = tuple(len(values) for values in axes.values())
+    size = int(np.prod(shape))
+    metrics = {name: np.empty(size) for name in SWEEP_METRICS}
+
+    rows = chunk_rows(params.weeks, max_bytes)
+    unlocked = None if params.vesting is None else params.vesting.cumulative_voting(params.weeks)
+    unlocked_non_voting = None if params.vesting is None else params.vesting.cumulative_non_voting(params.weeks)
+    # a fixed emission curve replaces the base emission and decay axes
+    weekly = None if params.emission_curve is None else params.emission_curve.weekly(params.weeks)
+    chunks = 0
+    for start in range(0, size, rows):
+        flat = np.arange(start, min(start + rows, size))
+        columns = {name: values[index][:, None]
+                   for (name, values), index in zip(axes.items(), np.unravel_index(flat, shape))}
+        columns.update(initial_xtokens=params.initial_xtokens, locked_tokens=params.locked_tokens)
+        block = evaluate_batch(columns, params.weeks, SWEEP_METRICS, weekly, unlocked, unlocked_non_voting)
+        for name, values in block.items():
+            metrics[name][flat] = values[:, -1]
+        chunks += 1
+
+    return SweepResult(
+        axes=axes,
+        metrics={name: values.reshape(shape) for name, values in metrics.items()},
+        weeks=params.weeks,
+        chunks=chunks,
+    )
@@ -0,0 +1,104 @@
+"""Unlock schedules for locked tokens.
+
+Each tranche vests linearly over ``duration`` weeks from ``start``, and
+nothing is released before ``cliff`` weeks have passed. At the cliff the
+amount vested so far unlocks at once, then one week's share unlocks every
+week until ``start + duration``. Tranches marked ``voting`` join the
+circulating voting supply once unlocked; the others circulate but do not
+vote.
+
+Every tranche adds a handful of entries to a lump array and a rate
+difference array, and one prefix sum turns the rates into weekly unlocks.
+Compiling a schedule is therefore O(tranches + weeks) however many tranches
+overlap.
+"""
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .cache import memoize
+
+TRANCHE_FIELDS = ("amount", "start", "cliff", "duration", "voting")
+
+
+@dataclass(frozen=True)
+class VestingSchedule:
+    digest: str
+    tranches: pd.DataFrame = field(compare=False, repr=False)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Validate a frame with ``TRANCHE_FIELDS`` columns (``voting`` defaults to true)."""
+        frame = frame.copy()
+        if "voting" not in frame:
+            frame["voting"] = True
+        missing = set(TRANCHE_FIELDS) - set(frame)
+        if missing:
+            raise ValueError(f"Vesting tranches need columns {sorted(missing)}")
+        frame = frame[list(TRANCHE_FIELDS)].astype(
+            {"amount": float, "start": int, "cliff": int, "duration": int, "voting": bool})
+        if (frame[["amount", "start", "cliff", "duration"]] < 0).any(axis=None):
+            raise ValueError("Tranche amounts, starts, cliffs and durations must not be negative")
+        digest = hashlib.sha256(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()).hexdigest()
+        return cls(digest, frame.reset_index(drop=True))
+
+    @classmethod
+    def from_tranches(cls, amount, start=0, cliff=0, duration=0, voting=True):
+        """Schedule from per-tranche sequences (or scalars, for a single tranche)."""
+        columns = dict(amount=amount, start=start, cliff=cliff, duration=duration, voting=voting)
+        return cls.from_frame(pd.DataFrame({name: np.atleast_1d(value) for name, value in columns.items()}))
+
+    @classmethod
+    def read_csv(cls, source):
+        return cls.from_frame(pd.read_csv(source))
+
+    def __len__(self):
+        return len(self.tranches)
+
+    @property
+    def total(self):
+        return float(self.tranches["amount"].sum())
+
+    def unlocks(self, weeks):
+        """``(voting, non_voting)`` tokens unlocking in each week."""
+        return vesting_unlocks(self, weeks)
+
+    def cumulative_voting(self, weeks):
+        """Unlocked voting tokens by the end of each week."""
+        return np.cumsum(self.unlocks(weeks)[0])
+
+    def cumulative_non_voting(self, weeks):
+        """Unlocked non-voting tokens by the end of each week, or ``None`` without non-voting tranches."""
+        if self.tranches["voting"].all():
+            return None
+        return np.cumsum(self.unlocks(weeks)[1])
+
+
+def unlock_schedule(amounts, starts, cliffs, durations, weeks):
+    """Tokens unlocking in each of ``weeks`` weeks, summed over all tranches."""
+    amounts = np.asarray(amounts, dtype=float)
+    starts, cliffs, durations = (np.asarray(values, dtype=np.int64) for values in (starts, cliffs, durations))
+    rate = np.divide(amounts, durations, out=np.zeros_like(amounts), where=durations > 0)
+    # lump at the cliff: everything vested so far, or the whole tranche once the cliff passes the end
+    lump = np.where(cliffs < durations, rate * cliffs, amounts)
+    linear = cliffs < durations
+
+    # out-of-horizon entries land in a discard bin at index ``weeks``
+    def bins(index, weights):
+        return np.bincount(np.minimum(index, weeks), weights=weights, minlength=weeks + 1)[:weeks]
+
+    rate_diff = bins(starts[linear] + cliffs[linear] + 1, rate[linear]) - bins(starts[linear] + durations[linear] + 1,
+                                                                                rate[linear])
+    return bins(starts + cliffs, lump) + np.cumsum(rate_diff)
+
+
+@memoize
+def vesting_unlocks(schedule, weeks):
+    tranches = schedule.tranches
+    result = []
+    for mask in (tranches["voting"].to_numpy(), ~tranches["voting"].to_numpy()):
+        part = tranches[mask]
+        result.append(unlock_schedule(part["amount"], part["start"], part["cliff"], part["duration"], weeks))
+    return tuple(result)
@@ -0,0 +1,108 @@
+"""Memoized builders for what each page displays.
+
+Each function is keyed only on the inputs it actually depends on, so e.g.
+the supply curve is shared by every page and every price or fee setting.
+Page data comes back as a ``ColumnarResult``; pandas frames are built only
+for what is actually drawn or shown.
+"""
+import numpy as np
+
+from .cache import memoize
+from .kernels import (
+    cumulative_fee_curve,
+    lstoken_earnings,
+    passive_earnings,
+    supply_curve,
+    valuation_curve,
+    volume_rewards,
+    voting_earnings,
+)
+from .profiling import timed
+from .results import ActiveResult, SimulationResult, passive_columns
+
+
+@timed("emission")
+@memoize
+def emission_for(curve, weeks):
+    return curve.schedule(weeks)
+
+
+@timed("supply")
+@memoize
+def supply_for(curve, weeks, initial_xtokens, locked_tokens, vesting=None):
+    emission = emission_for(curve, weeks)
+    if vesting is None:
+        return supply_curve(emission.cumulative, initial_xtokens, locked_tokens)
+    return supply_curve(emission.cumulative, initial_xtokens, locked_tokens, vesting.cumulative_voting(weeks),
+                        vesting.cumulative_non_voting(weeks))
+
+
+def market_inputs(params, series=None):
+    """Weekly fees and token price: uploaded series where present, else the scalar parameters.
+
+    The third value is the ROI basis, the price in week 0.
+    """
+    fees, price = params.weekly_fees, params.initial_price
+    if series is not None:
+        fees = series.get("weekly_fees", fees)
+        price = series.get("initial_price", price)
+    return fees, price, price[0] if np.ndim(price) else price
+
+
+@timed("simulation")
+@memoize
+def simulation_for(params, series=None):
+    """Cached equivalent of ``simulate(params)``, with fee and price series if given."""
+    fees, price, _ = market_inputs(params, series)
+    emission = emission_for(params.emission, params.weeks)
+    supply = supply_for(params.emission, params.weeks, params.initial_xtokens, params.locked_tokens, params.vesting)
+    return SimulationResult(
+        emission=emission,
+        supply=supply,
+        valuation=valuation_curve(supply, price),
+        cumulative_fees=cumulative_fee_curve(fees, params.weeks),
+    )
+
+
+@memoize
+def main_frame(params, series=None):
+    return simulation_for(params, series).to_columns()
+
+
+@timed("user kernels")
+@memoize
+def passive_view(params, my_tokens, series=None):
+    fees, price, entry_price = market_inputs(params, series)
+    simulation = simulation_for(params)
+    supply = simulation.supply.circulating
+    passive = passive_earnings(my_tokens, supply, fees, entry_price)
+    ls_token = lstoken_earnings(my_tokens, supply, fees, price, entry_price=entry_price)
+    return passive_columns(simulation.weeks, passive, ls_token)
+
+
+@timed("user kernels")
+@memoize
+def voting_for(params, my_tokens, voting_tokens, series=None):
+    fees, _, entry_price = market_inputs(params, series)
+    supply = simulation_for(params).supply.circulating
+    return voting_earnings(voting_tokens, my_tokens, supply, fees, entry_price)
+
+
+@timed("user kernels")
+@memoize
+def volume_for(params, multiplier_tokens, reference_stake, asset_weight, total_volume, user_volume, series=None):
+    if series is not None:
+        total_volume = series.get("total_volume", total_volume)
+        user_volume = series.get("user_volume", user_volume)
+    weekly_emissions = emission_for(params.emission, params.weeks).weekly
+    return volume_rewards(weekly_emissions, multiplier_tokens, reference_stake,
+                          asset_weight, total_volume, user_volume)
+
+
+@timed("user kernels")
+@memoize
+def active_view(params, user, series=None):
+    voting = voting_for(params, user.my_tokens, user.voting_tokens, series)
+    volume = volume_for(params, user.multiplier_tokens, user.reference_stake,
+                        user.asset_weight, user.total_volume, user.user_volume, series)
+    return ActiveResult(voting, volume).to_columns(simulation_for(params).weeks)
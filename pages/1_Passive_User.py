@@ -1,8 +1,21 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from engine import (
+    PASSIVE_METRICS,
+    TokenomicsParams,
+    UserParams,
+    lap,
+    passive_frame_at,
+    passive_view,
+    resolution_from_mapping,
+    roi_surface_for,
+    sensitivity_for,
+    series_from_mapping,
+)
+from ui import Panel, begin_profile, render_panels, render_profile, render_sensitivity, render_table
 
 st.set_page_config(page_title="Passive User", layout="wide")
+begin_profile("Passive User")
 st.title("🧍 Passive User Fee Earnings")
 
 # --- Pull simulation settings from main page ---
@@ -18,73 +31,58 @@ except AttributeError:
     st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
     st.stop()
 
-decay_rate = 1 - (decay_percent / 100)
+params = TokenomicsParams.from_mapping(st.session_state)
+series = series_from_mapping(st.session_state, weeks)
+resolution = resolution_from_mapping(st.session_state)
+if series is not None and {"weekly_fees", "initial_price"} & set(series.values):
+    st.info(f"📈 Using uploaded weekly series for {', '.join(sorted({'weekly_fees', 'initial_price'} & set(series.values)))}.")
 
 # --- Sidebar inputs ---
 with st.sidebar:
     st.header("Passive User Settings")
     my_tokens = st.number_input("Your Token Holdings (Voting)", value=10_000, format="%d")
     st.markdown(f"**Current Value:** ${my_tokens * initial_price:,.2f}")
+    exact = st.toggle("Exact Computation", key="passive_exact",
+                      help="Rerun the simulation for these holdings instead of scaling the precomputed per-token results.")
 
-# --- Emission & Supply Simulation ---
-weeks_array = np.arange(weeks)
-weekly_emissions = base_emission * (decay_rate ** weeks_array)
-cumulative_emissions = np.cumsum(weekly_emissions)
-circulating_supply = initial_xtokens + cumulative_emissions
-
-# --- Passive user (fixed holding) ---
-user_share = my_tokens / circulating_supply
-user_weekly_fees = user_share * weekly_fees
-user_cumulative_fees = np.cumsum(user_weekly_fees)
-relative_pct = (user_cumulative_fees / (my_tokens * initial_price)) * 100
-
-# --- Self-compounding user (lsToken) ---
-my_ls_tokens = my_tokens
-ls_token_holdings = []
-ls_fees = []
-
-for i in range(weeks):
-    supply = circulating_supply[i]
-    share = my_ls_tokens / supply
-    weekly_fee = share * weekly_fees
-    my_ls_tokens += weekly_fee / initial_price  # reinvest all fees
-    ls_token_holdings.append(my_ls_tokens)
-    ls_fees.append(weekly_fee)
-
-cumulative_ls_fees = np.cumsum(ls_fees)
-relative_ls_pct = (cumulative_ls_fees / (my_tokens * initial_price)) * 100
-
-# --- DataFrame ---
-df = pd.DataFrame({
-    "Week": weeks_array,
-    "Your Weekly Fees": user_weekly_fees,
-    "Cumulative Fees": user_cumulative_fees,
-    "Relative Earnings (%)": relative_pct,
-    "lsToken Weekly Fees": ls_fees,
-    "lsToken Cumulative Fees": cumulative_ls_fees,
-    "lsToken Relative Earnings (%)": relative_ls_pct,
-    "lsToken Holdings": ls_token_holdings,
-}).set_index("Week")
-
-# --- Plots ---
-st.subheader("💸 Relative Cumulative Earnings (%) – Self voting")
-st.line_chart(df["Relative Earnings (%)"])
-
-st.subheader("📊 Fee Earnings Over Time – Self voting - weekly fees")
-st.line_chart(df["Your Weekly Fees"])
-st.subheader("📊 Fee Earnings Over Time – Self voting - cumulative fees")
-st.line_chart(df["Cumulative Fees"])
+lap("inputs")
 
-st.subheader("🔁 Self-Compounding Earnings for passive participant with lsTokens - weekly fees")
-st.line_chart(df["lsToken Weekly Fees"])
-st.subheader("🔁 Self-Compounding Earnings for passive participant with lsTokens - cumulative fees")
-st.line_chart(df["lsToken Cumulative Fees"])
+# --- Simulation (cached on its inputs, supply curve shared with the other pages) ---
+# constant inputs at weekly steps: every column is linear in the holding, so scale the per-token rows
+surface = roi_surface_for(params) if resolution.native and series is None and not exact else None
+if surface is not None and surface.covers(my_tokens, weeks):
+    df = surface.lookup(my_tokens, weeks)
+    st.sidebar.caption("Scaled from the precomputed per-token results, which is exact for any holding.")
+elif resolution.native:
+    df = passive_view(params, my_tokens, series)
+else:
+    df = passive_frame_at(params, my_tokens, resolution, series)
 
-st.subheader("📈 Relative Earnings (%) – Self voting vs lsToken")
-st.line_chart(df[["Relative Earnings (%)", "lsToken Relative Earnings (%)"]])
+lap("simulation")
 
-st.subheader("📥 lsToken Holdings Over Time")
-st.line_chart(df["lsToken Holdings"])
+# --- Plots ---
+render_panels(df, [
+    Panel("💸 Relative Cumulative Earnings (%) – Self voting", ("Relative Earnings (%)",)),
+    Panel("📊 Fee Earnings Over Time – Self voting - weekly fees", ("Your Weekly Fees",)),
+    Panel("📊 Fee Earnings Over Time – Self voting - cumulative fees", ("Cumulative Fees",)),
+    Panel("🔁 Self-Compounding Earnings for passive participant with lsTokens - weekly fees", ("lsToken Weekly Fees",)),
+    Panel("🔁 Self-Compounding Earnings for passive participant with lsTokens - cumulative fees", ("lsToken Cumulative Fees",)),
+    Panel("📈 Relative Earnings (%) – Self voting vs lsToken", ("Relative Earnings (%)", "lsToken Relative Earnings (%)")),
+    Panel("📥 lsToken Holdings Over Time", ("lsToken Holdings",)),
+])
+
+# --- Sensitivity (a fragment, so its own widgets do not rerun the page) ---
+@st.fragment
+def sensitivity_section(params, my_tokens, uploaded):
+    if not st.toggle("🎯 Sensitivity Analysis", key="passive_sensitivity"):
+        return
+    st.subheader("🎯 What Drives Your ROI")
+    if uploaded:
+        st.caption("Sensitivities use the constant fee and price inputs, not the uploaded series.")
+    render_sensitivity(sensitivity_for(params, UserParams(my_tokens=my_tokens)), PASSIVE_METRICS, "passive_sensitivity")
+
+
+sensitivity_section(params, my_tokens, series is not None)
 
 # --- Explanation ---
 with st.expander("📘 Explanation of Calculation Logic"):
@@ -111,15 +109,15 @@ with st.expander("📘 Explanation of Calculation Logic"):
     This helps visualize how active fee compounding can outperform passive holding.
     """)
 
-# --- Data Table ---
-with st.expander("📋 Show Data Table"):
-    st.dataframe(df.style.format({
-        "Your Weekly Fees": "%.2f",
-        "Cumulative Fees": "%.2f",
-        "Relative Earnings (%)": "%.2f",
-        "lsToken Weekly Fees": "%.2f",
-        "lsToken Cumulative Fees": "%.2f",
-        "lsToken Relative Earnings (%)": "%.2f",
-        "lsToken Holdings": "%.2f"
-    }))
-
+# --- Data Table (paging reruns only the table) ---
+st.fragment(render_table)(df, {
+    "Your Weekly Fees": "%.2f",
+    "Cumulative Fees": "%.2f",
+    "Relative Earnings (%)": "%.2f",
+    "lsToken Weekly Fees": "%.2f",
+    "lsToken Cumulative Fees": "%.2f",
+    "lsToken Relative Earnings (%)": "%.2f",
+    "lsToken Holdings": "%.2f"
+}, key="passive_table")
+
+render_profile()
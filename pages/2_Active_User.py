@@ -1,9 +1,29 @@
-import streamlit as st
+import altair as alt
 import pandas as pd
-import numpy as np
+import streamlit as st
+
+from engine import (
+    ACTIVE_METRICS,
+    TokenomicsParams,
+    UserParams,
+    active_frame_at,
+    active_user_graph,
+    emission_for,
+    lap,
+    market_inputs,
+    multi_asset_rewards,
+    optimal_allocation_for,
+    resolution_from_mapping,
+    sensitivity_for,
+    series_from_mapping,
+    volume_for,
+    voting_for,
+)
+from ui import Panel, begin_profile, render_panels, render_profile, render_sensitivity, render_table
 
 # Page config
 st.set_page_config(page_title="Active User Fee Earnings", layout="wide")
+begin_profile("Active User")
 st.title("🚀 Active User Fee Earnings")
 
 # --- Pull simulation settings from main page ---
@@ -19,15 +39,44 @@ except AttributeError:
     st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
     st.stop()
 
+params = TokenomicsParams.from_mapping(st.session_state)
+series = series_from_mapping(st.session_state, weeks)
+resolution = resolution_from_mapping(st.session_state)
+
+# --- Inputs are keyed so fragments can read them and the optimizer can apply its split ---
+for name, default in {"active_my_tokens": 10_000, "active_voting_tokens": 3000, "active_multiplier_tokens": 3000,
+                      "active_reference_stake": 5000, "active_asset_weight": 10.0,
+                      "active_total_volume": 100_000_000, "active_user_volume": 2_000_000}.items():
+    st.session_state.setdefault(name, default)
+
+# Each section below is a fragment. Holdings and allocation changes rerun the whole page, but the volume inputs
+# and the reference stake only rerun the sections that use them; the voting section keeps its charts.
+VOLUME_SECTIONS = ["volume_section", "apr_section", "optimizer_section", "multi_asset_section",
+                   "sensitivity_section", "table_section"]
+# with background computation on, the optimizer and sensitivity sections run in a worker thread
+background = st.session_state.get("active_background", False)
+
+
+def apply_split(voting, multiplier):
+    st.session_state.active_voting_tokens = voting
+    st.session_state.active_multiplier_tokens = multiplier
+    st.rerun()
+
+
+def rerun_volume_sections():
+    st.rerun(VOLUME_SECTIONS)
+
+
 # --- Sidebar inputs ---
 with st.sidebar:
     st.header("Active User Settings")
 
-    my_tokens = st.number_input("Your Token Holdings", value=10_000, format="%d")
+    my_tokens = st.number_input("Your Token Holdings", step=1, format="%d", key="active_my_tokens")
 
-    voting_tokens = st.number_input("Tokens for Voting on Fees", value=3000, step=100)
-    multiplier_tokens = st.number_input("Tokens for Multiplier Staking", value=3000, step=100)
-    reference_stake = st.number_input("Reference Stake for Multiplier Comparison", value=5000, step=500)
+    voting_tokens = st.number_input("Tokens for Voting on Fees", step=100, key="active_voting_tokens")
+    multiplier_tokens = st.number_input("Tokens for Multiplier Staking", step=100, key="active_multiplier_tokens")
+    st.number_input("Reference Stake for Multiplier Comparison", step=500, key="active_reference_stake",
+                    on_change=rerun_volume_sections)
 
     # Remaining tokens used for hatching
     volume_tokens = my_tokens - voting_tokens - multiplier_tokens
@@ -39,103 +88,195 @@ with st.sidebar:
     st.markdown(f"**Tokens for Hatching (Unused)**: {volume_tokens} tokens")
     st.markdown(f"**Total Value:** ${my_tokens * initial_price:,.2f}")
 
-# --- Simulation setup ---
-weeks_array = np.arange(weeks)
-decay_rate = 1 - (decay_percent / 100)
-weekly_emissions = base_emission * (decay_rate ** weeks_array)
-cumulative_emissions = np.cumsum(weekly_emissions)
-circulating_supply = initial_xtokens + cumulative_emissions
-
-# --- Multiplier Growth ---
-multiplier_growth = 1.05 ** weeks_array
-
-# --- Voting Fee Calculation ---
-voting_share = voting_tokens / circulating_supply
-voting_weekly_fees = voting_share * weekly_fees
-user_cumulative_fees = np.cumsum(voting_weekly_fees)
-relative_pct = (user_cumulative_fees / (my_tokens * initial_price)) * 100
-
-# --- APR with safeguard ---
-voting_apr = np.where(
-    voting_tokens > 0,
-    (voting_weekly_fees * 52) / (voting_tokens * initial_price) * 100,
-    0
-)
-voting_apr = np.nan_to_num(voting_apr, nan=0.0)
+    st.toggle("🎯 Optimize Allocation", key="active_optimize")
+    st.toggle("⚡ Background Computation", key="active_background",
+              help="Run the optimizer and sensitivity analysis in a worker thread, so the charts do not wait for them.")
 
 # --- Volume Emissions Inputs ---
 st.subheader("📦 Emissions from Trading Volume (Multiplier Asset)")
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    asset_weight = st.number_input("Asset Weight (% of Total Emissions)", value=10.0, step=0.5) / 100
+    st.number_input("Asset Weight (% of Total Emissions)", step=0.5, key="active_asset_weight",
+                    on_change=rerun_volume_sections)
 with col2:
-    total_volume = st.number_input("Total Volume on Asset ($)", value=100_000_000, step=1_000_000)
+    st.number_input("Total Volume on Asset ($)", step=1_000_000, key="active_total_volume",
+                    on_change=rerun_volume_sections)
 with col3:
-    user_volume = st.number_input("Your Weekly Volume ($)", value=2_000_000, step=100_000)
-
-# --- Volume Emissions Logic ---
-asset_weekly_emissions = weekly_emissions * asset_weight
-user_stake = multiplier_tokens
-effective_stake = user_stake * multiplier_growth
-stake_ratio = effective_stake / (effective_stake + reference_stake)
-effective_multiplier = 1 + stake_ratio * 10
-effective_volume = user_volume * effective_multiplier
-adjusted_total_volume = total_volume - user_volume + effective_volume
-user_share_of_volume = effective_volume / adjusted_total_volume
-user_weekly_rewards = user_share_of_volume * asset_weekly_emissions
-user_cumulative_rewards = np.cumsum(user_weekly_rewards)
-
-# --- APR for volume-based rewards with safeguard ---
-volume_apr = np.where(
-    multiplier_tokens > 0,
-    (user_weekly_rewards * 52) / (multiplier_tokens) * 100,
-    0
-)
-volume_apr = np.nan_to_num(volume_apr, nan=0.0)
-
-# --- No-multiplier baseline (for comparison) ---
-baseline_effective_volume = np.full(weeks, user_volume)
-baseline_total_volume = total_volume
-baseline_share = baseline_effective_volume / baseline_total_volume
-baseline_rewards = baseline_share * asset_weekly_emissions
-
-# --- Data Aggregation ---
-df = pd.DataFrame({
-    "Week": weeks_array,
-    "Voting Weekly Fees": voting_weekly_fees,
-    "Cumulative Voting Fees": user_cumulative_fees,
-    "Relative Voting Earnings (%)": relative_pct,
-    "Volume Weekly Rewards": user_weekly_rewards,
-    "Cumulative Volume Rewards": user_cumulative_rewards,
-    "Baseline Volume Rewards (No Multiplier)": np.cumsum(baseline_rewards),
-    "Baseline Weekly Rewards (No Multiplier)": baseline_rewards,
-    "Multiplier": effective_multiplier,
-    "Voting APR (%)": voting_apr,
-    "Volume APR (%)": volume_apr
-}).set_index("Week")
-
-# --- Plots ---
-st.subheader("📈 Weekly Volume-Based Rewards")
-st.line_chart(df[["Volume Weekly Rewards", "Baseline Weekly Rewards (No Multiplier)"]])
+    st.number_input("Your Weekly Volume ($)", step=100_000, key="active_user_volume",
+                    on_change=rerun_volume_sections)
+
+if series is not None:
+    st.info(f"📈 Using uploaded weekly series for {', '.join(sorted(series.values))}.")
+
+lap("inputs")
+
+
+def active_user():
+    """The current inputs, read from session state so a fragment rerun sees them too."""
+    state = st.session_state
+    return UserParams(
+        my_tokens=state.active_my_tokens,
+        voting_tokens=state.active_voting_tokens,
+        multiplier_tokens=state.active_multiplier_tokens,
+        reference_stake=state.active_reference_stake,
+        asset_weight=state.active_asset_weight / 100,
+        total_volume=state.active_total_volume,
+        user_volume=state.active_user_volume,
+    )
+
+
+def active_frame(user):
+    """The frame at the chosen resolution; weekly frames come from the graph, recomputing only changed nodes."""
+    if not resolution.native:
+        return active_frame_at(params, user, resolution, series)
+
+    inputs = {**params.to_dict(), **user.to_dict()}
+    fees, _, inputs["initial_price"] = market_inputs(params, series)
+    inputs["weekly_fees"] = fees
+    if series is not None:
+        inputs["total_volume"] = series.get("total_volume", user.total_volume)
+        inputs["user_volume"] = series.get("user_volume", user.user_volume)
+
+    if "active_graph" not in st.session_state:
+        st.session_state.active_graph = active_user_graph()
+    return st.session_state.active_graph.evaluate(**inputs)["frame"]
+
+
+# --- Optimizer ---
+@st.fragment(key="optimizer_section", parallel=background)
+def optimizer_section():
+    if not st.session_state.active_optimize:
+        return
+    user = active_user()
+    best = optimal_allocation_for(params, user.my_tokens, user.reference_stake, user.asset_weight,
+                                  user.total_volume, user.user_volume, series)
+    # the optimizer's objective for the current split, from the cached weekly views (safe off the main thread)
+    _, price, _ = market_inputs(params, series)
+    voting = voting_for(params, user.my_tokens, user.voting_tokens, series)
+    volume = volume_for(params, user.multiplier_tokens, user.reference_stake, user.asset_weight,
+                        user.total_volume, user.user_volume, series)
+    current = voting.cumulative_fees[-1] + (volume.weekly_rewards * price).sum()
+
+    st.subheader("🎯 Optimal Token Allocation")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Voting", f"{best.voting_tokens:,.0f}")
+    col2.metric("Multiplier Staking", f"{best.multiplier_tokens:,.0f}")
+    col3.metric("Hatching", f"{best.hatching_tokens:,.0f}")
+    col4.metric("Total Value ($)", f"{best.objective:,.0f}", f"{best.objective - current:+,.0f} vs current split")
+    rounded = (round(best.voting_tokens), round(best.multiplier_tokens))
+    st.button("Apply Optimal Split", on_click=apply_split, args=rounded)
+
+    frontier = best.frontier
+    chart = alt.Chart(frontier).mark_line(point=True).encode(
+        x=alt.X("Cumulative Voting Fees:Q", title="Cumulative Voting Fees ($)"),
+        y=alt.Y("Cumulative Volume Rewards:Q", title="Cumulative Volume Rewards (tokens)"),
+        tooltip=[alt.Tooltip(f"{column}:Q", format=",.0f") for column in frontier.columns],
+    )
+    optimum = alt.Chart(frontier.nlargest(1, "Total Value ($)")).mark_point(size=200, color="red", filled=True).encode(
+        x="Cumulative Voting Fees:Q", y="Cumulative Volume Rewards:Q",
+    )
+    st.altair_chart(chart + optimum)
+    st.caption(f"Pareto frontier between voting fees and volume rewards; the red point maximizes voting fees plus "
+               f"volume rewards valued at the token price. {best.evaluations:,} splits evaluated.")
 
-st.subheader("📈 Cumulative Volume-Based Rewards")
-st.line_chart(df[["Cumulative Volume Rewards", "Baseline Volume Rewards (No Multiplier)"]])
 
-st.subheader("💸 Relative ROI from Voting Over Time (%)")
-st.line_chart(df["Relative Voting Earnings (%)"])
+# --- Plots ---
+@st.fragment(key="volume_section")
+def volume_section():
+    render_panels(active_frame(active_user()), [
+        Panel("📈 Weekly Volume-Based Rewards", ("Volume Weekly Rewards", "Baseline Weekly Rewards (No Multiplier)")),
+        Panel("📈 Cumulative Volume-Based Rewards",
+              ("Cumulative Volume Rewards", "Baseline Volume Rewards (No Multiplier)")),
+    ])
+
+
+@st.fragment(key="voting_section")
+def voting_section():
+    render_panels(active_frame(active_user()), [
+        Panel("💸 Relative ROI from Voting Over Time (%)", ("Relative Voting Earnings (%)",)),
+        Panel("📈 Voting Weekly Rewards", ("Voting Weekly Fees",)),
+        Panel("📈 Cumulative Voting Rewards", ("Cumulative Voting Fees",)),
+    ])
+
+
+@st.fragment(key="apr_section")
+def apr_section():
+    render_panels(active_frame(active_user()), [
+        Panel("📈 Voting APR Over Time", ("Voting APR (%)",)),
+        Panel("📈 Volume APR Over Time", ("Volume APR (%)",)),
+    ])
+
+
+# --- Multiple multiplier assets ---
+@st.fragment(key="multi_asset_section")
+def multi_asset_section():
+    if not st.toggle("🧺 Multiple Multiplier Assets", key="active_multi_asset"):
+        return
+    user = active_user()
+    st.subheader("🧺 Volume Emissions Across Several Assets")
+    st.caption("Your multiplier stake boosts your volume on every asset. Asset weights may add up to at most 100%.")
+    assets = st.data_editor(pd.DataFrame({
+        "Asset": ["Asset 1", "Asset 2", "Asset 3"],
+        "Weight (%)": [user.asset_weight * 100, 5.0, 2.5],
+        "Total Volume ($)": [float(user.total_volume), 50_000_000.0, 20_000_000.0],
+        "Your Volume ($)": [float(user.user_volume), 1_000_000.0, 500_000.0],
+    }), num_rows="dynamic", key="active_assets").dropna()
+
+    emission = emission_for(params.emission, weeks)
+    try:
+        multi = multi_asset_rewards(
+            emission.weekly, user.multiplier_tokens, user.reference_stake,
+            assets["Weight (%)"].to_numpy() / 100, assets["Total Volume ($)"], assets["Your Volume ($)"],
+            names=assets["Asset"].astype(str),
+        )
+    except ValueError as exc:
+        st.error(f"⚠️ {exc}")
+    else:
+        multi_df = multi.to_columns(emission.weeks)
+        render_panels(multi_df, [
+            Panel("📈 Cumulative Volume Rewards per Asset",
+                  (*(f"{name} Cumulative Rewards" for name in multi.names), "Total Cumulative Rewards")),
+            Panel("📈 Volume APR per Asset (%)", (*(f"{name} APR (%)" for name in multi.names), "Total Volume APR (%)")),
+        ])
+        render_table(multi_df, {column: "%.2f" for column in multi_df.columns},
+                     label="📋 Show Multi-Asset Data", key="active_multi_asset_table")
+
+
+# --- Sensitivity ---
+@st.fragment(key="sensitivity_section", parallel=background)
+def sensitivity_section():
+    if not st.toggle("🎯 Sensitivity Analysis", key="active_sensitivity"):
+        return
+    st.subheader("🎯 What Drives Your ROI and APR")
+    if series is not None:
+        st.caption("Sensitivities use the constant fee, price and volume inputs, not the uploaded series.")
+    render_sensitivity(sensitivity_for(params, active_user()), ACTIVE_METRICS, "active_sensitivity")
 
-st.subheader("📈 Voting Weekly Rewards")
-st.line_chart(df["Voting Weekly Fees"])
 
-st.subheader("📈 Cumulative Voting Rewards")
-st.line_chart(df["Cumulative Voting Fees"])
+# --- Data Table ---
+@st.fragment(key="table_section")
+def table_section():
+    render_table(active_frame(active_user()), {
+        "Voting Weekly Fees": "%.2f",
+        "Cumulative Voting Fees": "%.2f",
+        "Relative Voting Earnings (%)": "%.2f",
+        "Volume Weekly Rewards": "%.2f",
+        "Cumulative Volume Rewards": "%.2f",
+        "Baseline Volume Rewards (No Multiplier)": "%.2f",
+        "Baseline Weekly Rewards (No Multiplier)": "%.2f",
+        "Multiplier": "%.2f",
+        "Voting APR (%)": "%.2f",
+        "Volume APR (%)": "%.2f"
+    }, label="📋 Show Simulation Data", key="active_table")
 
-st.subheader("📈 Voting APR Over Time")
-st.line_chart(df["Voting APR (%)"])
 
-st.subheader("📈 Volume APR Over Time")
-st.line_chart(df["Volume APR (%)"])
+optimizer_section()
+volume_section()
+voting_section()
+apr_section()
+multi_asset_section()
+sensitivity_section()
 
 # --- Explanation ---
 with st.expander("📘 Explanation of Calculation Logic"):
@@ -168,20 +309,18 @@ with st.expander("📘 Explanation of Calculation Logic"):
         - Voting Tokens: Used to claim fee share.
         - Multiplier Tokens: Used to boost volume rewards.
         - Hatching Tokens: Leftover tokens with no active use here.
+
+    #### Multiple Multiplier Assets
+    - Each asset gets its own share of emissions (its weight); weights together may not exceed 100%.
+    - On every asset your volume is boosted by the same multiplier and compared against that asset's total volume.
+    - The total APR is the sum of the per-asset APRs on your multiplier stake.
+
+    #### Optimizer
+    - Searches every split of your holdings (voting / multiplier / hatching) for the one with the highest
+      cumulative voting fees plus volume rewards valued at the token price.
+    - A coarse grid covers all splits at once, then a local search refines the best one to within a token.
     """)
 
-# --- Data Table ---
-with st.expander("📋 Show Simulation Data"):
-    st.dataframe(df.style.format({
-        "Voting Weekly Fees": "%.2f",
-        "Cumulative Voting Fees": "%.2f",
-        "Relative Voting Earnings (%)": "%.2f",
-        "Volume Weekly Rewards": "%.2f",
-        "Cumulative Volume Rewards": "%.2f",
-        "Baseline Volume Rewards (No Multiplier)": "%.2f",
-        "Baseline Weekly Rewards (No Multiplier)": "%.2f",
-        "Multiplier": "%.2f",
-        "Voting APR (%)": "%.2f",
-        "Volume APR (%)": "%.2f"
-    }))
+table_section()
 
+render_profile()
@@ -0,0 +1,143 @@
+import time
+
+import altair as alt
+import numpy as np
+import streamlit as st
+
+from engine import (
+    SWEEP_METRICS,
+    SWEEP_PARAMETERS,
+    TokenomicsParams,
+    default_store,
+    lap,
+    run_sweep,
+    scenario_key,
+    swept_parameters,
+)
+from ui import begin_profile, render_profile
+
+st.set_page_config(page_title="Parameter Sweep", layout="wide")
+begin_profile("Parameter Sweep")
+st.title("🧮 Parameter Sweep")
+
+st.markdown("""
+Evaluate every combination of emission, decay, fee and price settings in one run and compare
+the final-week valuation and ROI as heatmaps. Supply, locked tokens and the horizon come from the main page.
+""")
+
+# --- Pull simulation settings from main page ---
+try:
+    weeks = st.session_state.weeks
+except AttributeError:
+    st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
+    st.stop()
+
+params = TokenomicsParams.from_mapping(st.session_state)
+parameters = swept_parameters(params)
+
+labels = {
+    "base_emission": "Initial Weekly Emission",
+    "decay_percent": "Emission Decay per Week (%)",
+    "weekly_fees": "Weekly Fee Revenue ($)",
+    "initial_price": "Initial Token Price ($)",
+}
+
+# --- Sidebar inputs ---
+with st.sidebar:
+    st.header("Sweep Ranges")
+    with st.form("sweep_ranges"):
+        ranges = {}
+        if len(parameters) < len(SWEEP_PARAMETERS):
+            st.caption(f"The main page's {st.session_state.get('emission_mode', 'fixed')} emission schedule replaces "
+                       "the initial emission and decay axes.")
+        for name in parameters:
+            current = float(getattr(params, name))
+            st.markdown(f"**{labels[name]}**")
+            col1, col2, col3 = st.columns(3)
+            low = col1.number_input("Min", value=current * 0.5, key=f"sweep_{name}_min")
+            high = col2.number_input("Max", value=current * 1.5, key=f"sweep_{name}_max")
+            steps = col3.number_input("Steps", value=10, min_value=1, step=1, key=f"sweep_{name}_steps")
+            ranges[name] = np.linspace(low, high, int(steps))
+        max_mb = st.number_input("Memory Cap per Chunk (MB)", value=64, min_value=1, step=16)
+        submitted = st.form_submit_button("Run Sweep")
+
+    configurations = int(np.prod([len(values) for values in ranges.values()]))
+    st.markdown(f"**Configurations:** {configurations:,}")
+
+# --- Sweep (kept in the scenario store, so the same sweep is never run twice) ---
+# rerun when the main-page settings change under a finished sweep; reloaded sweeps (no settings) are kept
+swept = st.session_state.get("sweep_params")
+if submitted or "sweep_result" not in st.session_state or (swept is not None and swept != params):
+    store = default_store()
+    inputs = {"params": params, "ranges": ranges}
+    started = time.perf_counter()
+    st.session_state.sweep_stored = scenario_key("sweep", inputs) in store
+    st.session_state.sweep_result = store.get_or_compute(
+        "sweep", inputs, lambda: run_sweep(params, ranges, max_bytes=max_mb * 2**20),
+        label=f"Sweep · {configurations:,} configurations · {params.weeks} weeks",
+    )
+    st.session_state.sweep_seconds = time.perf_counter() - started
+    st.session_state.sweep_params = params
+
+result = st.session_state.sweep_result
+if st.session_state.get("sweep_stored"):
+    st.caption(f"{result.size:,} configurations × {result.weeks} weeks loaded from the scenario store in "
+               f"{st.session_state.sweep_seconds:.2f}s.")
+else:
+    st.caption(
+        f"{result.size:,} configurations × {result.weeks} weeks evaluated in "
+        f"{st.session_state.sweep_seconds:.2f}s ({result.chunks} chunks)."
+    )
+if st.session_state.get("sweep_params") is None:
+    st.warning("⚠️ This sweep was reloaded from the scenario store and may use other settings than the main page. "
+               "Run the sweep again to use the current settings.")
+
+lap("inputs")
+
+# --- Heatmap ---
+st.subheader("🗺️ Final-Week Surface")
+col1, col2, col3 = st.columns(3)
+with col1:
+    metric = st.selectbox("Metric", SWEEP_METRICS, index=SWEEP_METRICS.index("lsToken Relative Earnings (%)"))
+with col2:
+    x_axis = st.selectbox("X Axis", parameters, index=1, format_func=labels.get)
+with col3:
+    y_axis = st.selectbox("Y Axis", [name for name in parameters if name != x_axis], format_func=labels.get)
+
+at = {}
+for name in SWEEP_PARAMETERS:
+    if name not in (x_axis, y_axis) and len(result.axes[name]) > 1:
+        values = list(result.axes[name])
+        chosen = st.select_slider(f"Fix {labels[name]}", options=values, format_func=lambda v: f"{v:,.4g}")
+        at[name] = values.index(chosen)
+
+surface = result.surface(metric, x_axis, y_axis, at=at)
+long = surface.stack().rename(metric).reset_index()
+heatmap = alt.Chart(long).mark_rect().encode(
+    x=alt.X(f"{x_axis}:O", title=labels[x_axis], axis=alt.Axis(format=",.4~g")),
+    y=alt.Y(f"{y_axis}:O", title=labels[y_axis], axis=alt.Axis(format=",.4~g")),
+    color=alt.Color(f"{metric}:Q", title=metric),
+    tooltip=[x_axis, y_axis, metric],
+)
+st.altair_chart(heatmap)
+
+# --- Explanation ---
+with st.expander("📘 Explanation of Calculation Logic"):
+    st.markdown("""
+    - Every combination of the ranges is one configuration; all other settings come from the main page. A Halving,
+      Linear Taper, Piecewise or uploaded emission schedule fixes the emissions, so only fees and price are swept.
+    - Configurations are evaluated together as a configurations × weeks array, split into chunks that fit the memory cap.
+    - Relative earnings are the final-week ROI (%) of a self-voting and an lsToken holder. They do not depend on the size of the holding.
+    - Valuation and FDV use the final-week circulating and total supply at the swept token price.
+    """)
+
+# --- Export (built only when the button is clicked) ---
+with st.expander("📋 Export Sweep Results"):
+    st.download_button(
+        "Download CSV",
+        lambda: result.to_frame().to_csv(index=False),
+        file_name="parameter_sweep.csv",
+        mime="text/csv",
+    )
+
+render_profile()
@@ -78,7 +78,7 @@ The main page provides several charts to visualize the tokenomic model:
 ### Tips for Main Page
 - Start with realistic parameters based on comparable projects
 - Experiment with different decay rates to find optimal emission schedules
-- Use the expanded data table to examine specific weeks in detail
+- Switch on the data table to page through specific weeks in detail
 """)
 
 # Passive User Page
@@ -217,7 +217,7 @@ with st.expander("How does the multiplier work in the Active User page?"):
 
 with st.expander("Can I export the simulation data?"):
     st.markdown("""
-    Yes, you can view the full data table by expanding the "Show Data Table" section at the bottom of each page. 
+    Yes, you can view the full data table by switching on the "Show Data Table" toggle at the bottom of each page and paging through the rows. 
     From there, you can copy the data to paste into a spreadsheet application like Excel or Google Sheets for further analysis.
     
     Future versions may include direct CSV export functionality.
@@ -0,0 +1,116 @@
+import os
+import time
+
+import pandas as pd
+import streamlit as st
+
+from engine import (
+    DEFAULT_USER,
+    MC_SERIES,
+    MarketModel,
+    TokenomicsParams,
+    UserParams,
+    default_store,
+    lap,
+    run_monte_carlo,
+    scenario_key,
+)
+from ui import Panel, begin_profile, render_panels, render_profile
+
+st.set_page_config(page_title="Monte Carlo", layout="wide")
+begin_profile("Monte Carlo")
+st.title("🎲 Monte Carlo: Stochastic Price & Fees")
+
+st.markdown("""
+Instead of a constant token price and weekly fee revenue, this page draws many random market paths and shows
+the range of outcomes for passive, lsToken and active holders as percentile bands (p5 / p50 / p95).
+""")
+
+# --- Pull simulation settings from main page ---
+try:
+    initial_price = st.session_state.initial_price
+    weekly_fees = st.session_state.weekly_fees
+    weeks = st.session_state.weeks
+except AttributeError:
+    st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
+    st.stop()
+
+params = TokenomicsParams.from_mapping(st.session_state)
+
+# --- Sidebar inputs ---
+with st.sidebar:
+    st.header("Market Model")
+    n_paths = st.number_input("Number of Paths", value=1000, min_value=10, step=500)
+    seed = st.number_input("Random Seed", value=42, min_value=0, step=1)
+    price_drift = st.number_input("Price Drift (% per year)", value=0.0, step=5.0) / 100
+    price_volatility = st.number_input("Price Volatility (% per year)", value=60.0, min_value=0.0, step=5.0) / 100
+    fee_volatility = st.number_input("Weekly Fee Volatility (%)", value=30.0, min_value=0.0, step=5.0) / 100
+    workers = st.number_input("Worker Processes", value=1, min_value=1, max_value=os.cpu_count() or 1, step=1)
+
+    st.header("Holder Settings")
+    my_tokens = st.number_input("Your Token Holdings", value=int(DEFAULT_USER.my_tokens), format="%d")
+    voting_tokens = st.number_input("Tokens for Voting on Fees", value=int(DEFAULT_USER.voting_tokens), step=100)
+    multiplier_tokens = st.number_input("Tokens for Multiplier Staking", value=int(DEFAULT_USER.multiplier_tokens), step=100)
+
+    if voting_tokens + multiplier_tokens > my_tokens:
+        st.error("⚠️ The total allocation exceeds your token holdings. Please adjust.")
+        st.stop()
+
+user = UserParams(my_tokens=my_tokens, voting_tokens=voting_tokens, multiplier_tokens=multiplier_tokens)
+market = MarketModel(price_drift=price_drift, price_volatility=price_volatility, fee_volatility=fee_volatility)
+
+lap("inputs")
+
+# --- Simulation (kept in the scenario store; the worker count does not change the result) ---
+store = default_store()
+started = time.perf_counter()
+inputs = {"params": params, "user": user, "market": market, "n_paths": int(n_paths), "seed": int(seed)}
+key = scenario_key("monte carlo", inputs)
+# a scenario reloaded on the Scenario Store page stays until an input differs from those it was reloaded under
+reloaded = st.session_state.get("monte_carlo_reloaded")
+if reloaded is not None and st.session_state.setdefault("monte_carlo_reloaded_under", key) != key:
+    del st.session_state.monte_carlo_reloaded, st.session_state.monte_carlo_reloaded_under
+    reloaded = None
+result = store.load(reloaded.key) if reloaded is not None else None
+if result is not None:
+    st.info(f"📂 Showing the saved scenario “{reloaded.label}”. Change any input to simulate again.")
+    action = "loaded from the scenario store"
+else:
+    action = "loaded from the scenario store" if key in store else "simulated"
+    result = store.get_or_compute(
+        "monte carlo", inputs,
+        lambda: run_monte_carlo(params, user, market, n_paths=int(n_paths), seed=int(seed), workers=int(workers)),
+        label=f"Monte Carlo · {int(n_paths):,} paths · seed {int(seed)} · {weeks} weeks",
+    )
+st.caption(f"{result.paths:,} paths × {result.weeks.size} weeks {action} in {time.perf_counter() - started:.2f}s "
+           f"(seed {result.seed}).")
+
+lap("simulation")
+
+# --- Plots ---
+bands = pd.concat({name: result.bands(name) for name in MC_SERIES}, axis=1)
+bands.columns = [f"{name} {band}" for name, band in bands.columns]
+titles = {
+    "Token Price ($)": "💲 Token Price Paths",
+    "Weekly Fees ($)": "🧾 Weekly Fee Revenue",
+    "Passive Cumulative Fees ($)": "📊 Cumulative Fees – Self voting",
+    "lsToken Cumulative Fees ($)": "🔁 Cumulative Fees – lsToken (reinvested at market price)",
+    "Active Cumulative Earnings ($)": "🚀 Cumulative Earnings – Active User (voting fees + volume rewards in $)",
+}
+render_panels(bands, [
+    Panel(titles[name], tuple(column for column in bands.columns if column.startswith(f"{name} ")))
+    for name in MC_SERIES
+])
+
+# --- Explanation ---
+with st.expander("📘 Explanation of Calculation Logic"):
+    st.markdown(f"""
+    - **Token price** follows a geometric Brownian motion starting at ${initial_price:,.2f}, with the drift and volatility above.
+    - **Weekly fees** are lognormal around ${weekly_fees:,.0f} with the chosen volatility, so the average fee revenue is unchanged.
+    - Emissions and circulating supply are the same on every path; only price and fees are random.
+    - The lsToken holder reinvests each week's fees at that week's price.
+    - The active user's volume rewards are paid in tokens and valued at each week's price. Volume inputs use the Active page defaults.
+    - The same seed always gives the same paths, regardless of the number of worker processes.
+    """)
+
+render_profile()
@@ -0,0 +1,169 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from engine import (
+    ActiveStrategy,
+    DEFAULT_USER,
+    STRATEGIES,
+    TokenomicsParams,
+    lap,
+    read_population_csv,
+    sampled_population_for,
+    simulate_population,
+)
+from ui import Panel, begin_profile, render_panels, render_profile, render_table
+
+st.set_page_config(page_title="Population", layout="wide")
+begin_profile("Population")
+st.title("👥 Holder Population")
+
+st.markdown("""
+Simulates many holders at once. Each wallet follows one strategy (self-vote, lsToken or active), and all of them
+share the same weekly fee pool. The population is part of the circulating voting supply, so it can never collect
+more than 100% of the fees, even with millions of wallets.
+""")
+
+# --- Pull simulation settings from main page ---
+try:
+    initial_price = st.session_state.initial_price
+    weekly_fees = st.session_state.weekly_fees
+    weeks = st.session_state.weeks
+except AttributeError:
+    st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
+    st.stop()
+
+params = TokenomicsParams.from_mapping(st.session_state)
+
+# --- Sidebar inputs ---
+with st.sidebar:
+    st.header("Holder Distribution")
+    source = st.radio("Balances", ("Pareto", "Lognormal", "Upload CSV"), horizontal=True)
+    upload = None
+    shape = {}
+    if source == "Upload CSV":
+        upload = st.file_uploader("CSV with a `balance` column (optional `strategy` column)", type="csv")
+    else:
+        n_wallets = st.number_input("Number of Wallets", value=100_000, min_value=1, step=100_000)
+        if source == "Pareto":
+            shape["min_balance"] = st.number_input("Minimum Balance", value=1_000.0, min_value=1.0, step=500.0)
+            shape["pareto_alpha"] = st.number_input("Pareto Alpha", value=1.5, min_value=0.1, step=0.1)
+        else:
+            shape["lognormal_mean"] = st.number_input("Mean of log(Balance)", value=9.0, step=0.5)
+            shape["lognormal_sigma"] = st.number_input("Sigma of log(Balance)", value=1.5, min_value=0.0, step=0.1)
+    seed = st.number_input("Random Seed", value=42, min_value=0, step=1)
+
+    st.header("Strategy Mix (%)")
+    mix = (
+        st.number_input("Self-vote", value=50.0, min_value=0.0, step=5.0),
+        st.number_input("lsToken", value=30.0, min_value=0.0, step=5.0),
+        st.number_input("Active", value=20.0, min_value=0.0, step=5.0),
+    )
+    if sum(mix) <= 0:
+        st.error("⚠️ At least one strategy needs a positive share.")
+        st.stop()
+
+    st.header("Active Wallets")
+    voting_fraction = st.number_input("Share Voting on Fees (%)", value=30.0, min_value=0.0, max_value=100.0, step=5.0)
+    multiplier_fraction = st.number_input("Share Staked for Multiplier (%)", value=30.0, min_value=0.0,
+                                          max_value=100.0, step=5.0)
+    if voting_fraction + multiplier_fraction > 100:
+        st.error("⚠️ Voting and multiplier shares exceed 100% of each wallet. Please adjust.")
+        st.stop()
+    volume_per_token = st.number_input("Trading Volume per Token Held ($)", value=200.0, min_value=0.0, step=50.0)
+    asset_weight = st.number_input("Asset Weight in Emissions (%)", value=DEFAULT_USER.asset_weight * 100,
+                                   min_value=0.0, max_value=100.0, step=1.0)
+    total_volume = st.number_input("Total Asset Volume ($)", value=int(DEFAULT_USER.total_volume), step=1_000_000)
+
+active = ActiveStrategy(
+    voting_fraction=voting_fraction / 100,
+    multiplier_fraction=multiplier_fraction / 100,
+    volume_per_token=volume_per_token,
+    reference_stake=DEFAULT_USER.reference_stake,
+    asset_weight=asset_weight / 100,
+    total_volume=total_volume,
+)
+
+lap("inputs")
+
+# --- Simulation ---
+started = time.perf_counter()
+if source == "Upload CSV":
+    if upload is None:
+        st.info("Upload a CSV of wallet balances to start.")
+        st.stop()
+    try:
+        population = read_population_csv(upload, mix, int(seed))
+        result = simulate_population(params, population, active)
+    except ValueError as exc:
+        st.error(f"⚠️ {exc}")
+        st.stop()
+else:
+    try:
+        result = sampled_population_for(params, int(n_wallets), source.lower(), int(seed), mix, active, **shape)
+    except ValueError as exc:
+        st.error(f"⚠️ {exc}")
+        st.stop()
+population = result.population
+st.caption(f"{len(population):,} wallets × {weeks} weeks simulated in {time.perf_counter() - started:.2f}s.")
+if result.capped_weeks:
+    st.warning(f"⚠️ In {result.capped_weeks:,} of {weeks} weeks the population votes with more tokens than the "
+               "circulating voting supply. In those weeks it is taken to be the whole voting supply and collects "
+               "all of the fees.")
+
+lap("simulation")
+
+# --- Plots ---
+shares = pd.DataFrame({
+    "Population Fee Share (%)": result.fee_share,
+    **{f"{strategy} Weekly Fees ($)": fees for strategy, fees in result.strategy_fees.items()},
+}, index=pd.Index(result.weeks, name="Week"))
+present = [strategy for strategy, count in zip(STRATEGIES, population.counts()) if count]
+bands = pd.concat({strategy: result.bands(strategy) for strategy in present}, axis=1)
+bands.columns = [f"{strategy} ROI {band} (%)" for strategy, band in bands.columns]
+
+render_panels(shares, [
+    Panel("🧮 Share of Weekly Fees Paid to the Population (%)", ("Population Fee Share (%)",),
+          "The population's voting balance as a share of the circulating voting supply."),
+    Panel("📊 Weekly Fees by Strategy ($)", tuple(f"{strategy} Weekly Fees ($)" for strategy in STRATEGIES)),
+])
+render_panels(bands, [
+    Panel(f"📈 Cumulative ROI (%) – {strategy} wallets (p5 / p50 / p95)",
+          tuple(column for column in bands.columns if column.startswith(f"{strategy} ")))
+    for strategy in present
+])
+
+# --- Percentile summary ---
+summary = result.summary()
+st.subheader("🏁 Final-Week Earnings by Strategy")
+st.dataframe(summary, column_config={
+    column: st.column_config.NumberColumn(column, format="%.2f" if "ROI" in column else "%,.0f")
+    for column in summary.columns if column != "Wallets"
+})
+
+wallets = pd.DataFrame({
+    "Strategy": pd.Categorical.from_codes(population.strategies, STRATEGIES),
+    "Balance": population.balances,
+    "Cumulative Earnings ($)": result.earnings[:, -1],
+    "ROI (%)": result.roi[:, -1],
+}).rename_axis("Wallet")
+render_table(wallets, {"Balance": "%,.0f", "Cumulative Earnings ($)": "%,.2f", "ROI (%)": "%.2f"},
+             label="📋 Show Wallets", key="population_table")
+
+# --- Explanation ---
+with st.expander("📘 Explanation of Calculation Logic"):
+    st.markdown(f"""
+    - **Self-vote** wallets vote with their whole balance; **lsToken** wallets reinvest each week's fees at
+      ${initial_price:,.2f}; **active** wallets vote with part of their balance, stake part for the volume
+      multiplier and trade volume in proportion to their balance.
+    - Each week's ${weekly_fees:,.0f} in fees is split pro rata over the circulating voting supply, which includes
+      the population. In weeks where the population votes with more tokens than circulate, including reinvested
+      lsToken balances, fees are split over the population's own voting balance instead, so its share never
+      exceeds 100%.
+    - Active wallets compete for the same asset emissions: their boosted volumes and the rest of the market's
+      volume (total volume minus theirs) form one pool.
+    - Percentiles are taken across wallets of the same strategy at {len(result.checkpoints)} evenly spaced weeks.
+    """)
+
+render_profile()
@@ -0,0 +1,152 @@
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from engine import (
+    DEFAULT_USER,
+    TokenomicsParams,
+    emission_for,
+    lap,
+    read_traders,
+    sample_traders,
+    solve_competition,
+    volume_rewards,
+)
+from ui import Panel, begin_profile, render_panels, render_profile, render_table
+
+TOP_TRADERS = 10
+
+st.set_page_config(page_title="Volume Competition", layout="wide")
+begin_profile("Volume Competition")
+st.title("🏁 Volume Competition: Many Traders Staking for the Multiplier")
+
+st.markdown("""
+On the Active page only your volume is boosted and everyone else trades a fixed volume. Here every trader stakes for
+the multiplier, so each boost dilutes everybody else's share of the asset's emissions.
+""")
+
+# --- Pull simulation settings from main page ---
+try:
+    base_emission = st.session_state.base_emission
+    decay_percent = st.session_state.decay_percent
+    weeks = st.session_state.weeks
+except AttributeError:
+    st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
+    st.stop()
+
+params = TokenomicsParams.from_mapping(st.session_state)
+
+# --- Sidebar inputs ---
+with st.sidebar:
+    st.header("Your Trading")
+    user_volume = st.number_input("Your Weekly Volume ($)", value=int(DEFAULT_USER.user_volume), step=100_000)
+    user_stake = st.number_input("Your Multiplier Stake", value=int(DEFAULT_USER.multiplier_tokens), step=100)
+
+    st.header("Asset")
+    asset_weight = st.number_input("Asset Weight (% of Total Emissions)", value=DEFAULT_USER.asset_weight * 100,
+                                   step=0.5) / 100
+    total_volume = st.number_input("Total Volume on Asset ($)", value=int(DEFAULT_USER.total_volume),
+                                   step=1_000_000, help="Volume not covered by the traders below trades unboosted.")
+
+    st.header("Competing Traders")
+    source = st.radio("Traders", ("Edit Table", "Random", "Upload CSV"), horizontal=True)
+    if source == "Random":
+        n_traders = st.number_input("Number of Traders", value=1_000, min_value=1, step=500)
+        median_volume = st.number_input("Median Weekly Volume ($)", value=500_000, step=100_000)
+        median_stake = st.number_input("Median Stake", value=3_000, step=500)
+        seed = st.number_input("Random Seed", value=42, min_value=0, step=1)
+    elif source == "Upload CSV":
+        upload = st.file_uploader("CSV with `volume` and `stake` (optional `name`, `reference_stake`)", type="csv")
+
+if source == "Edit Table":
+    st.subheader("✏️ Competing Traders")
+    st.caption("Leave the reference stake empty to compare against the average stake of everyone else.")
+    competitors = st.data_editor(pd.DataFrame({
+        "name": ["Market maker", "Fund", "Whale", "Retail"],
+        "volume": [20_000_000.0, 10_000_000.0, 5_000_000.0, 500_000.0],
+        "stake": [50_000.0, 20_000.0, 10_000.0, 500.0],
+        "reference_stake": [np.nan] * 4,
+    }), num_rows="dynamic", key="competition_traders")
+elif source == "Random":
+    competitors = sample_traders(int(n_traders), median_volume, median_stake=median_stake, seed=int(seed))
+else:
+    if upload is None:
+        st.info("Upload a CSV of traders to start.")
+        st.stop()
+    try:
+        competitors = read_traders(upload)
+    except ValueError as exc:
+        st.error(f"⚠️ {exc}")
+        st.stop()
+
+you = pd.DataFrame({"name": ["You"], "volume": [user_volume], "stake": [user_stake], "reference_stake": [np.nan]})
+traders = pd.concat([you, competitors.dropna(subset=["volume", "stake"])], ignore_index=True)
+traders["name"] = traders["name"].fillna("").astype(str)
+traders.loc[traders["name"] == "", "name"] = [f"Trader {i}" for i in traders.index[traders["name"] == ""]]
+
+lap("inputs")
+
+# --- Simulation ---
+started = time.perf_counter()
+emissions = emission_for(params.emission, weeks).weekly
+result = solve_competition(emissions, traders["volume"], traders["stake"], traders["reference_stake"],
+                           asset_weight, total_volume, traders["name"])
+fixed_market = volume_rewards(emissions, user_stake, DEFAULT_USER.reference_stake,
+                              asset_weight, total_volume, user_volume)
+st.caption(f"{len(traders):,} traders × {weeks} weeks solved in {time.perf_counter() - started:.3f}s.")
+
+if traders["volume"].sum() > total_volume:
+    st.warning("⚠️ The traders' combined volume exceeds the total asset volume; no unboosted volume is left.")
+
+lap("simulation")
+
+# --- Plots ---
+top = np.argsort(result.cumulative_rewards[:, -1])[::-1]
+shown = [0, *[row for row in top if row != 0][:TOP_TRADERS - 1]]
+labels = result.names[shown]
+shares = result.to_frame("share", shown) * 100
+shares.columns = [f"{name} Share (%)" for name in labels]
+shares["Rest of Market Share (%)"] = result.market_share * 100
+multipliers = result.to_frame("multiplier", shown).add_suffix(" Multiplier")
+
+df = pd.concat([shares, multipliers], axis=1)
+df["Your Cumulative Rewards (Competitive)"] = result.cumulative_rewards[0]
+df["Your Cumulative Rewards (Fixed Market)"] = fixed_market.cumulative_rewards
+
+render_panels(df, [
+    Panel("📊 Emission Share (%) – you and the top traders", (*shares.columns,)),
+    Panel("🚀 Staking Multiplier", (*multipliers.columns,)),
+    Panel("📈 Your Cumulative Volume Rewards – competitive vs fixed market",
+          ("Your Cumulative Rewards (Competitive)", "Your Cumulative Rewards (Fixed Market)"),
+          "Fixed market: the Active page's assumption that nobody else is boosted, "
+          f"with its default reference stake of {DEFAULT_USER.reference_stake:,}."),
+])
+
+# --- Per-trader summary ---
+summary = result.summary()
+summary.insert(0, "Volume ($)", traders["volume"].to_numpy())
+summary.insert(1, "Stake", traders["stake"].to_numpy())
+render_table(summary.reset_index(), {
+    "Volume ($)": "%,.0f",
+    "Stake": "%,.0f",
+    "Multiplier": "%.2f",
+    "Emission Share (%)": "%.4f",
+    "Cumulative Rewards": "%,.2f",
+    "APR (%)": "%.2f",
+}, label="📋 Show Traders (final week)", key="competition_table")
+
+# --- Explanation ---
+with st.expander("📘 Explanation of Calculation Logic"):
+    st.markdown("""
+    - Every trader's multiplier uses the Active page formula: `1 + 10 * effective stake / (effective stake + reference stake)`,
+      with the effective stake growing 5% per week.
+    - An empty reference stake means the average stake of all other traders, so when everyone stakes more the
+      reference rises and multipliers are diluted.
+    - Each trader's emission share = `boosted volume / (all boosted volumes + unboosted rest of the market)`, where the
+      rest of the market is the total volume minus the traders' own volumes.
+    - All traders and weeks are solved together as one array; shares always add up to 100%.
+    """)
+
+render_profile()
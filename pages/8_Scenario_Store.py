@@ -0,0 +1,106 @@
+import sqlite3
+import time
+
+import pandas as pd
+import streamlit as st
+
+from engine import default_store, diff_inputs, diff_results
+from ui import begin_profile, render_profile
+
+st.set_page_config(page_title="Scenario Store", layout="wide")
+begin_profile("Scenario Store")
+st.title("🗄️ Scenario Store")
+
+st.markdown("""
+Parameter sweeps and Monte Carlo runs are saved to disk, keyed by their inputs, and shared by every session,
+process and restart: running the same scenario again loads it instead of recomputing it. Reload a saved scenario
+on its page or compare two of them here, without recomputing either.
+""")
+
+PAGES = {"sweep": "pages/3_Parameter_Sweep.py", "monte carlo": "pages/5_Monte_Carlo.py"}
+
+store = default_store()
+try:
+    scenarios = store.scenarios()
+except (OSError, sqlite3.Error) as exc:
+    st.error(f"⚠️ Could not open the scenario store at `{store.root}`: {exc}")
+    st.stop()
+
+if not scenarios:
+    st.info("No saved scenarios yet. Run a parameter sweep or a Monte Carlo simulation to add one.")
+    render_profile()
+    st.stop()
+
+by_key = {scenario.key: scenario for scenario in scenarios}
+keys = list(by_key)
+
+
+def describe(key):
+    return f"{by_key[key].label} · {key[:8]}"
+
+
+# --- Saved scenarios ---
+st.dataframe(pd.DataFrame({
+    "Scenario": [scenario.label for scenario in scenarios],
+    "Kind": [scenario.kind for scenario in scenarios],
+    "Key": [scenario.key[:12] for scenario in scenarios],
+    "Size (MB)": [scenario.bytes / 2**20 for scenario in scenarios],
+    "Created": pd.to_datetime([scenario.created for scenario in scenarios], unit="s"),
+    "Last Used": pd.to_datetime([scenario.accessed for scenario in scenarios], unit="s"),
+}), hide_index=True, column_config={
+    "Size (MB)": st.column_config.NumberColumn("Size (MB)", format="%.2f"),
+    "Created": st.column_config.DatetimeColumn("Created", format="YYYY-MM-DD HH:mm"),
+    "Last Used": st.column_config.DatetimeColumn("Last Used", format="YYYY-MM-DD HH:mm"),
+})
+used = sum(scenario.bytes for scenario in scenarios)
+st.caption(f"{len(scenarios):,} scenarios · {used / 2**20:,.1f} of {store.max_bytes / 2**20:,.0f} MB in "
+           f"`{store.root}`. The least recently used scenarios are evicted first.")
+
+# --- Reload ---
+st.subheader("📂 Reload a Scenario")
+col1, col2, col3 = st.columns([4, 1, 1], vertical_alignment="bottom")
+chosen = col1.selectbox("Scenario", keys, format_func=describe, key="store_scenario")
+if col2.button("Reload", width="stretch"):
+    scenario = by_key[chosen]
+    if scenario.kind == "sweep":
+        started = time.perf_counter()
+        result = store.load(chosen)
+        if result is not None:
+            st.session_state.sweep_result = result
+            st.session_state.sweep_stored = True
+            st.session_state.sweep_params = None  # not tied to the current main-page settings
+            st.session_state.sweep_seconds = time.perf_counter() - started
+    else:
+        st.session_state.monte_carlo_reloaded = scenario
+        st.session_state.pop("monte_carlo_reloaded_under", None)  # set by the Monte Carlo page on arrival
+    st.switch_page(PAGES[scenario.kind])
+if col3.button("Delete", width="stretch"):
+    store.delete(chosen)
+    st.rerun()
+
+# --- Compare ---
+st.subheader("🔍 Compare Two Scenarios")
+col1, col2 = st.columns(2)
+a = col1.selectbox("Scenario A", keys, format_func=describe, key="store_a")
+b = col2.selectbox("Scenario B", keys, index=min(1, len(keys) - 1), format_func=describe, key="store_b")
+
+inputs = diff_inputs(by_key[a], by_key[b])
+if inputs.empty:
+    st.success("Both scenarios have the same inputs.")
+else:
+    st.markdown("**Inputs that differ**")
+    st.dataframe(inputs)
+
+result_a, result_b = store.load(a), store.load(b)
+if result_a is None or result_b is None:
+    st.warning("⚠️ One of the scenarios has just been evicted from the store.")
+else:
+    st.markdown("**Results**")
+    results = diff_results(result_a, result_b)
+    st.dataframe(results, column_config={
+        name: st.column_config.NumberColumn(name, format="%.6g") for name in results.columns
+    })
+    st.caption("Mean of every stored array and, where both scenarios have the same shape (grid, paths and horizon), "
+               "the largest absolute difference. Read straight from the memory-mapped files.")
+
+render_profile()
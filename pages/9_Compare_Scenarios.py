@@ -0,0 +1,112 @@
+import pandas as pd
+import streamlit as st
+
+from engine import COMPARE_METRICS, MAX_SCENARIOS, TokenomicsParams, compare_scenarios, lap
+from ui import Panel, begin_profile, pin_scenario, pinned_scenarios, render_panels, render_profile
+
+st.set_page_config(page_title="Compare Scenarios", layout="wide")
+begin_profile("Compare Scenarios")
+st.title("⚖️ Compare Scenarios")
+
+st.markdown(f"""
+Pin up to {MAX_SCENARIOS} sets of main-page settings and compare them side by side. All pinned scenarios are
+computed together as one batch, and each is cached on its own settings, so pinning one more only computes that one.
+""")
+
+# --- Pull simulation settings from main page ---
+try:
+    weeks = st.session_state.weeks
+except AttributeError:
+    st.error("⚠️ Please visit the main page first to set the tokenomics parameters.")
+    st.stop()
+
+params = TokenomicsParams.from_mapping(st.session_state)
+pins = pinned_scenarios()
+
+# --- Sidebar inputs ---
+with st.sidebar:
+    st.header("Pinned Scenarios")
+    with st.form("pin_scenario", clear_on_submit=True):
+        name = st.text_input("Scenario Name", placeholder="e.g. Faster decay")
+        if st.form_submit_button("📌 Pin Current Settings"):
+            problem = pin_scenario(params, name)
+            if problem:
+                st.warning(problem)
+    st.caption(f"{len(pins)} of {MAX_SCENARIOS} pinned. Change the settings on the main page, then pin them here.")
+    if pins:
+        unpin = st.multiselect("Unpin", list(pins))
+        col1, col2 = st.columns(2)
+        if col1.button("Unpin", disabled=not unpin, width="stretch"):
+            for name in unpin:
+                del pins[name]
+            st.rerun()
+        if col2.button("Clear All", width="stretch"):
+            pins.clear()
+            st.rerun()
+
+    st.header("Comparison Settings")
+    my_tokens = st.number_input("Your Token Holdings (Voting)", value=10_000, format="%d", key="compare_my_tokens")
+    baseline = st.selectbox("Baseline", list(pins), key="compare_baseline") if pins else None
+
+lap("inputs")
+
+if not pins:
+    st.info("No scenarios pinned yet. Pin the current main-page settings from the sidebar, change them, and pin again.")
+    render_profile()
+    st.stop()
+
+
+def describe(params):
+    curve = params.emission_curve
+    return {
+        "Initial xTokens": params.initial_xtokens,
+        "Locked Tokens": params.locked_tokens,
+        "Price ($)": params.initial_price,
+        "Weekly Fees ($)": params.weekly_fees,
+        "Emission Schedule": "Geometric Decay" if curve is None else type(curve).__name__,
+        "Initial Emission": params.base_emission,
+        "Decay (%)": params.decay_percent,
+        "Vesting": "Keep Locked" if params.vesting is None else f"{len(params.vesting):,} tranches",
+        "Weeks": params.weeks,
+    }
+
+
+st.subheader("📌 Pinned Scenarios")
+st.dataframe(pd.DataFrame([describe(pinned) for pinned in pins.values()], index=pd.Index(list(pins), name="Scenario")))
+st.caption("Uploaded time series and the time resolution are not part of a pinned scenario: every scenario is "
+           "compared at weekly steps with constant fees and price.")
+
+# --- Comparison (one batch for the scenarios not cached yet) ---
+result = compare_scenarios(pins, my_tokens)
+lap("simulation")
+st.caption(f"{len(result.names)} scenarios × {result.weeks.size:,} weeks · {result.evaluated} computed in one batch, "
+           f"{len(result.names) - result.evaluated} from the cache.")
+
+# --- Charts ---
+descriptions = {
+    "Weekly Emission": "Tokens emitted each week.",
+    "Circulating Voting Supply": "Voting supply including emissions and vested voting tokens.",
+    "Total Supply (FDV)": "Total supply including locked tokens.",
+    "Valuation ($)": "Circulating market cap at the scenario's token price.",
+    "FDV ($)": "Fully diluted valuation at the scenario's token price.",
+    "Cumulative Fees": "Your total fee earnings as a passive holder.",
+    "Relative Earnings (%)": "Your passive fee earnings relative to the value of your holdings.",
+    "lsToken Cumulative Fees": "Your total fee earnings when holding the lsToken instead.",
+    "lsToken Relative Earnings (%)": "Your lsToken fee earnings relative to the value of your holdings.",
+}
+render_panels(result.to_columns(), [
+    Panel(metric, tuple(result.column(metric, name) for name in result.names), descriptions[metric], result.names)
+    for metric in COMPARE_METRICS
+])
+
+# --- Delta table ---
+st.subheader(f"🔍 Final Week Against {baseline}")
+deltas = result.deltas(baseline)
+st.dataframe(deltas, column_config={
+    column: st.column_config.NumberColumn(column, format="%.2f%%" if column.endswith("Δ%") else "%.2f")
+    for column in deltas.columns
+})
+st.caption("Each scenario's value in its own final week, with its difference from the baseline in absolute terms "
+           "(Δ) and in percent (Δ%).")
+
+render_profile()
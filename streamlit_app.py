@@ -1,9 +1,45 @@
-import streamlit as st
 import pandas as pd
-import numpy as np
+import streamlit as st
+
+from engine import (
+    DEFAULT_PARAMS,
+    FILL_METHODS,
+    MAX_SCENARIOS,
+    PERIODS,
+    RESOLUTIONS,
+    RESULT_CACHE,
+    SERIES_FIELDS,
+    Geometric,
+    Halving,
+    LinearTaper,
+    Piecewise,
+    TokenomicsParams,
+    VestingSchedule,
+    curve_for,
+    lap,
+    load_custom_emission,
+    load_series_file,
+    main_frame,
+    main_frame_at,
+    resolution_from_mapping,
+    series_from_mapping,
+)
+from ui import (
+    DEFAULT_POINT_BUDGET,
+    Panel,
+    begin_profile,
+    pin_scenario,
+    pinned_scenarios,
+    profile_log_path,
+    profiling_defaults,
+    render_panels,
+    render_profile,
+    render_table,
+)
 
 # Page setup
 st.set_page_config(page_title="Emission Simulator", layout="wide")
+begin_profile("Main")
 st.title("📊 Emission & Tokenomics Simulator")
 
 st.markdown("""
@@ -18,14 +54,30 @@ This simulation distinguishes between:
 
 # --- Initialize session state if not already ---
 defaults = {
-    "initial_xtokens": 16_000_000,
-    "locked_tokens": 84_000_000,
-    "initial_price": 0.45,
-    "weekly_fees": 20_000,
-    "base_emission": 500_000,
-    "decay_percent": 2.0,
-    "weeks": 104
+    **DEFAULT_PARAMS.to_dict(),
+    "chart_point_budget": DEFAULT_POINT_BUDGET,
+    "series_file": None,
+    "series_fill": FILL_METHODS[0],
+    "series_upload_key": 0,
+    "vesting_mode": "Keep Locked",
+    "vesting_cliff": 26,
+    "vesting_duration": 104,
+    "vesting_voting": True,
+    "vesting_file": None,
+    "emission_mode": "Geometric Decay",
+    "halving_period": 52,
+    "taper_final": 100_000,
+    "taper_weeks": 104,
+    "emission_segments": pd.DataFrame({"start_week": [0, 52], "base_emission": [500_000.0, 250_000.0],
+                                       "decay_percent": [2.0, 1.0]}),
+    "custom_emission": None,
+    "time_step": "Weekly",
+    "aggregation_period": PERIODS[0],
+    "compact_results": False,
+    **profiling_defaults(),
 }
+VESTING_MODES = ("Keep Locked", "Linear Unlock", "Upload Tranches")
+EMISSION_MODES = ("Geometric Decay", "Halving", "Linear Taper", "Piecewise", "Custom Upload")
 
 for key, value in defaults.items():
     if key not in st.session_state:
@@ -42,56 +94,193 @@ with st.sidebar:
     st.session_state.base_emission = st.number_input("Initial Weekly Emission", value=st.session_state.base_emission, step=10_000, format="%d")
     st.session_state.decay_percent = st.number_input("Emission Decay per Week (%)", value=st.session_state.decay_percent, step=0.1, format="%.1f")
     st.session_state.weeks = st.slider("Number of Weeks", min_value=10, max_value=520, value=st.session_state.weeks)
+    st.session_state.chart_point_budget = st.number_input("Chart Point Budget (per series)", value=st.session_state.chart_point_budget, min_value=10, step=100)
 
-# --- Simulation Logic ---
-decay_rate = 1 - (st.session_state.decay_percent / 100)
-weeks_array = np.arange(st.session_state.weeks)
-weekly_emissions = st.session_state.base_emission * (decay_rate ** weeks_array)
-cumulative_emissions = np.cumsum(weekly_emissions)
 
-circulating_supply = st.session_state.initial_xtokens + cumulative_emissions
-total_supply_fdv = st.session_state.locked_tokens + st.session_state.initial_xtokens + cumulative_emissions
+def remember(name):
+    st.session_state[name] = st.session_state[f"_{name}"]
 
-valuation = circulating_supply * st.session_state.initial_price
-fdv = total_supply_fdv * st.session_state.initial_price
 
-cumulative_fees = np.cumsum(np.full(st.session_state.weeks, st.session_state.weekly_fees))
+def persisted(widget, label, name, **kwargs):
+    """``widget`` whose value lives in ``st.session_state[name]``, so it survives page switches."""
+    key = f"_{name}"
+    if key not in st.session_state:
+        st.session_state[key] = st.session_state[name]
+    widget(label, key=key, on_change=remember, args=(name,), **kwargs)
+    return st.session_state[name]
 
-df = pd.DataFrame({
-    "Week": weeks_array,
-    "Weekly Emission": weekly_emissions,
-    "Circulating Voting Supply": circulating_supply,
-    "Total Supply (FDV)": total_supply_fdv,
-    "Valuation ($)": valuation,
-    "FDV ($)": fdv,
-    "Cumulative Fees ($)": cumulative_fees
-}).set_index("Week")
 
-# --- Charts ---
-st.subheader("📤 Weekly Token Emissions")
-st.markdown("This plot shows how many tokens are emitted each week, declining based on the decay rate.")
-st.line_chart(df["Weekly Emission"])
+def clear_series():
+    st.session_state.series_file = None
+    st.session_state.series_upload_key += 1  # a fresh key empties the uploader
+
+
+with st.sidebar:
+    with st.expander("📈 Time-Series Inputs", expanded=st.session_state.series_file is not None):
+        st.markdown(f"Upload weekly values for any of `{'`, `'.join(SERIES_FIELDS)}` "
+                    "(optionally with a `week` column) to replace the constant inputs on every page.")
+        upload = st.file_uploader("CSV or Parquet", type=["csv", "parquet"],
+                                  key=f"series_upload_{st.session_state.series_upload_key}")
+        if upload is not None:
+            try:
+                st.session_state.series_file = load_series_file(upload.getvalue(), upload.name)
+            except (ValueError, ImportError) as exc:
+                st.error(f"⚠️ {exc}")
+        persisted(st.radio, "Fill Gaps By", "series_fill", options=FILL_METHODS, horizontal=True)
+        if st.session_state.series_file is not None:
+            series_file = st.session_state.series_file
+            st.caption(f"Using **{series_file.name}** ({series_file.rows:,} rows): {', '.join(series_file.fields)}")
+            st.button("Clear Time Series", on_click=clear_series)
+
+with st.sidebar:
+    with st.expander("🔓 Locked Token Vesting", expanded=st.session_state.vesting_mode != VESTING_MODES[0]):
+        mode = persisted(st.radio, "Locked Tokens", "vesting_mode", options=VESTING_MODES)
+        vesting = None
+        if mode == "Linear Unlock":
+            cliff = persisted(st.number_input, "Cliff (weeks)", "vesting_cliff", min_value=0, step=4)
+            duration = persisted(st.number_input, "Vesting Duration (weeks)", "vesting_duration", min_value=0, step=4)
+            voting = persisted(st.checkbox, "Unlocked tokens vote", "vesting_voting")
+            vesting = VestingSchedule.from_tranches(st.session_state.locked_tokens, 0, cliff, duration, voting)
+        elif mode == "Upload Tranches":
+            upload = st.file_uploader("CSV with amount, start, cliff, duration (weeks) and optional voting", type="csv")
+            if upload is not None:
+                try:
+                    st.session_state.vesting_file = VestingSchedule.read_csv(upload)
+                except ValueError as exc:
+                    st.error(f"⚠️ {exc}")
+            vesting = st.session_state.vesting_file
+            if vesting is not None:
+                st.caption(f"{len(vesting):,} tranches, {vesting.total:,.0f} tokens in total.")
+                if vesting.total > st.session_state.locked_tokens:
+                    st.warning("⚠️ The tranches unlock more than the locked token supply.")
+        st.session_state.vesting = vesting
+
+with st.sidebar:
+    with st.expander("📤 Emission Schedule", expanded=st.session_state.emission_mode != EMISSION_MODES[0]):
+        mode = persisted(st.selectbox, "Schedule", "emission_mode", options=EMISSION_MODES)
+        base = st.session_state.base_emission
+        curve = None
+        try:
+            if mode == "Halving":
+                st.caption("Starts at the initial weekly emission and halves every period.")
+                curve = Halving(base, persisted(st.number_input, "Halving Period (weeks)", "halving_period",
+                                                min_value=1, step=4))
+            elif mode == "Linear Taper":
+                st.caption("Falls in a straight line from the initial weekly emission, then stays flat.")
+                final = persisted(st.number_input, "Final Weekly Emission", "taper_final", min_value=0, step=10_000)
+                taper_weeks = persisted(st.number_input, "Taper Length (weeks)", "taper_weeks", min_value=1, step=4)
+                curve = LinearTaper(base, final, taper_weeks)
+            elif mode == "Piecewise":
+                st.caption("Geometric segments, each starting at its own week.")
+                # the editor keeps its edits in widget state against a fixed seed; re-seed it with the last
+                # edits only when it is first drawn (after a page switch or a change of schedule)
+                if "emission_segments_editor" not in st.session_state:
+                    st.session_state.emission_segments_seed = st.session_state.emission_segments
+                edited = st.data_editor(st.session_state.emission_segments_seed, num_rows="dynamic",
+                                        key="emission_segments_editor")
+                st.session_state.emission_segments = edited
+                segments = edited.dropna()
+                curve = Piecewise(tuple(
+                    (int(row.start_week), Geometric(float(row.base_emission), float(row.decay_percent)))
+                    for row in segments.sort_values("start_week").itertuples()
+                ))
+            elif mode == "Custom Upload":
+                upload = st.file_uploader("CSV with an `emission` column (one row per week)", type="csv")
+                if upload is not None:
+                    st.session_state.custom_emission = load_custom_emission(upload.getvalue())
+                curve = st.session_state.custom_emission
+                if curve is None:
+                    st.info("No file yet; using geometric decay.")
+        except ValueError as exc:
+            st.error(f"⚠️ {exc}")
+            curve = None
+        st.session_state.emission_curve = curve
+
+        # answered from the curve's closed form, without building the weekly array
+        schedule = curve_for(base, st.session_state.decay_percent, curve)
+        week = st.number_input("Total Emitted by Week", min_value=0, value=st.session_state.weeks - 1, step=52)
+        st.markdown(f"**{schedule.cumulative_at(week):,.0f}** tokens emitted by the end of week {week:,}.")
+        target = st.number_input("Weeks Until Emitted", min_value=0.0, value=50_000_000.0, step=5_000_000.0,
+                                 format="%.0f")
+        reached = schedule.weeks_until(target)
+        st.markdown(f"{target:,.0f} tokens are emitted by **week {reached:,}**." if reached is not None
+                    else f"{target:,.0f} tokens are never emitted under this schedule.")
+
+with st.sidebar:
+    with st.expander("⏱️ Time Resolution", expanded=st.session_state.time_step != "Weekly"):
+        st.caption("Finer steps split each week's fees and emissions and compound per step; "
+                   "charts and tables are aggregated back to weeks or months.")
+        persisted(st.selectbox, "Time Step", "time_step", options=list(RESOLUTIONS))
+        persisted(st.radio, "Aggregate By", "aggregation_period", options=PERIODS, format_func=str.title,
+                  horizontal=True)
+        persisted(st.checkbox, "Store results as float32", "compact_results")
+        resolution = resolution_from_mapping(st.session_state)
+        st.markdown(f"**{resolution.steps(st.session_state.weeks):,}** steps per scenario.")
+
+with st.sidebar:
+    with st.expander("⏱️ Profiling", expanded=st.session_state.profiling):
+        st.caption("Times every stage of each rerun, on every page, and shows the result at the bottom of the sidebar.")
+        persisted(st.toggle, "Profile reruns", "profiling")
+        if profile_log_path():
+            st.caption("Each rerun is appended to the server's profile log (`EMSETUP_PROFILE_LOG`).")
+lap("inputs")
 
-st.subheader("📈 Emissions & Supply Over Time")
-st.markdown("Here you can see the growth of circulating (voting) supply and total supply including locked tokens.")
-st.line_chart(df[["Circulating Voting Supply", "Total Supply (FDV)"]])
+# --- Simulation Logic ---
+params = TokenomicsParams.from_mapping(st.session_state)
+series = series_from_mapping(st.session_state, params.weeks)
+df = main_frame(params, series) if resolution.native else main_frame_at(params, resolution, series)
+lap("simulation")
+
+with st.sidebar:
+    with st.expander("Cache Statistics"):
+        stats = RESULT_CACHE.stats()
+        st.markdown(f"""
+        - **Hits / Misses:** {stats.hits:,} / {stats.misses:,} ({stats.hit_rate:.0%} hit rate)
+        - **Entries:** {stats.entries:,} of {RESULT_CACHE.max_entries:,}
+        - **Memory:** {stats.bytes / 2**20:,.1f} MB of {RESULT_CACHE.max_bytes / 2**20:,.0f} MB
+        - **Evictions:** {stats.evictions:,}
+        """)
 
-st.subheader("💰 Valuation Over Time")
-st.markdown("Circulating market cap and FDV are estimated using the current token price.")
-st.line_chart(df[["Valuation ($)", "FDV ($)"]])
+with st.sidebar:
+    with st.expander("📌 Pin for Comparison"):
+        with st.form("pin_scenario", clear_on_submit=True, border=False):
+            pin_name = st.text_input("Scenario Name", placeholder="e.g. Faster decay")
+            if st.form_submit_button("Pin Current Settings"):
+                problem = pin_scenario(params, pin_name)
+                if problem:
+                    st.warning(problem)
+        st.caption(f"{len(pinned_scenarios())} of {MAX_SCENARIOS} scenarios pinned. Uploaded time series are not "
+                   "part of a pinned scenario.")
+        st.page_link("pages/9_Compare_Scenarios.py", label="Compare pinned scenarios", icon="⚖️")
 
-st.subheader("🧾 Cumulative Protocol Fees")
-st.markdown("This shows the total protocol revenue (fees) accumulated over the simulation period.")
-st.line_chart(df["Cumulative Fees ($)"])
+# --- Charts ---
+supply_columns = ("Circulating Voting Supply", "Total Supply (FDV)")
+if "Circulating Supply (incl. Non-Voting)" in df.columns:
+    supply_columns += ("Circulating Supply (incl. Non-Voting)",)
+render_panels(df, [
+    Panel("📤 Weekly Token Emissions", ("Weekly Emission",),
+          "How many tokens are emitted each week, declining based on the decay rate."),
+    Panel("📈 Emissions & Supply Over Time", supply_columns,
+          "Growth of circulating (voting) supply and total supply including locked tokens. "
+          "Vested locked tokens that vote are part of the circulating supply; vested tokens that do not vote "
+          "circulate without voting."),
+    Panel("💰 Valuation Over Time", ("Valuation ($)", "FDV ($)"),
+          "Circulating market cap and FDV estimated using the current token price."),
+    Panel("🧾 Cumulative Protocol Fees", ("Cumulative Fees ($)",),
+          "Total protocol revenue (fees) accumulated over the simulation period."),
+])
 
 # --- Table ---
-with st.expander("📋 Show Data Table"):
-    st.markdown("Explore the raw data behind the simulation.")
-    st.dataframe(df.style.format({
-        "Weekly Emission": "%.0f",
-        "Circulating Voting Supply": "%.0f",
-        "Total Supply (FDV)": "%.0f",
-        "Valuation ($)": "%.2f",
-        "FDV ($)": "%.2f",
-        "Cumulative Fees ($)": "%.2f"
-    }))
+render_table(df, {
+    "Weekly Emission": "%.0f",
+    "Circulating Voting Supply": "%.0f",
+    "Total Supply (FDV)": "%.0f",
+    "Valuation ($)": "%.2f",
+    "FDV ($)": "%.2f",
+    "Cumulative Fees ($)": "%.2f",
+    "Unlocked Voting Tokens": "%.0f",
+    "Unlocked Non-Voting Tokens": "%.0f",
+    "Circulating Supply (incl. Non-Voting)": "%.0f",
+}, key="main_table", description="Explore the raw data behind the simulation.")
+
+render_profile()
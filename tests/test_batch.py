@@ -0,0 +1,29 @@
+import pytest
+
+from engine.batch import evaluate_scenario, read_scenarios
+
+
+def write(tmp_path, text):
+    path = tmp_path / "scenarios.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_reads_params_and_user_fields(tmp_path):
+    path = write(tmp_path, "scenario,weekly_fees,weeks,my_tokens\nlow,10000,52,5000\n,,,\n")
+    (name, params, user), (second, defaults, _) = read_scenarios(path)
+    assert (name, params.weekly_fees, params.weeks, user.my_tokens) == ("low", 10_000, 52, 5_000)
+    assert second == "1" and defaults.weeks == 104
+    assert evaluate_scenario(name, params, user)["scenario"] == "low"
+
+
+def test_extra_fields_are_a_validation_error(tmp_path):
+    path = write(tmp_path, "scenario,weekly_fees\nlow,10000,oops\n")
+    with pytest.raises(ValueError, match="Scenario 0: row has 1 more fields than the header"):
+        list(read_scenarios(path))
+
+
+def test_unknown_fields_are_named(tmp_path):
+    path = write(tmp_path, "scenario,weekly_fee\nlow,10000\n")
+    with pytest.raises(ValueError, match=r"unknown fields \['weekly_fee'\]"):
+        list(read_scenarios(path))
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import ResultCache, TokenomicsParams, memoize, optimal_allocation_for
+
+
+def test_entry_bound_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    for key in "abc":
+        cache.get_or_compute(key, lambda: np.zeros(4))
+    assert "a" not in cache and "b" in cache and "c" in cache
+    assert cache.stats().evictions == 1
+
+
+def test_byte_bound_holds_and_oversized_values_are_not_kept():
+    cache = ResultCache(max_bytes=3 * 800)
+    for key in range(5):
+        cache.get_or_compute(key, lambda: np.zeros(100))
+    assert cache.stats().bytes <= cache.max_bytes and len(cache) == 3
+    cache.get_or_compute("big", lambda: np.zeros(1000))
+    assert "big" not in cache and len(cache) == 3
+
+
+def test_hits_share_read_only_arrays():
+    cache = ResultCache()
+    first = cache.get_or_compute("k", lambda: np.arange(3.0))
+    assert cache.get_or_compute("k", lambda: pytest.fail("recomputed")) is first
+    with pytest.raises(ValueError):
+        first[0] = 1.0
+    assert cache.stats().hits == 1 and cache.stats().misses == 1
+
+
+def test_frames_are_private_to_each_caller():
+    cache = ResultCache()
+
+    @memoize(cache=cache)
+    def frame(n):
+        return {"table": pd.DataFrame({"a": np.arange(n, dtype=float)})}
+
+    mine = frame(3)["table"]
+    mine.loc[0, "a"] = 99.0
+    mine["b"] = 1.0
+    assert list(frame(3)["table"].columns) == ["a"] and frame(3)["table"].loc[0, "a"] == 0.0
+
+
+def test_cached_optimizer_frontier_cannot_be_changed_for_other_callers():
+    args = (TokenomicsParams(), 10_000, 5_000, 0.1, 1e8, 2e6)
+    frontier = optimal_allocation_for(*args).frontier
+    frontier.iloc[:, 0] = -1.0
+    assert (optimal_allocation_for(*args).frontier.iloc[:, 0] != -1.0).any()
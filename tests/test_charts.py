@@ -0,0 +1,36 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from engine import ColumnarResult
+from ui.charts import Panel, _chart
+
+SAFE_FIELD = re.compile(r"^\w+$")
+
+
+def _fields(spec):
+    for panel in spec["concat"]:
+        yield from panel["transform"][0]["fold"]
+        yield from (channel["field"] for channel in panel["encoding"].values() if "field" in channel)
+
+
+def test_dotted_and_bracketed_columns_are_shipped_under_safe_names():
+    names = ("Valuation ($) · Decay 2.5%", "ETH [v2].pool", "plain")
+    df = pd.DataFrame({name: np.arange(10.0) * i for i, name in enumerate(names)},
+                      index=pd.RangeIndex(10, name="Week"))
+    data, spec = _chart(df, [Panel("dotted", names[:2]), Panel("plain", names[2:], labels=("Plain",))], 500, 2)
+
+    assert all(SAFE_FIELD.match(column) for column in data.columns)
+    assert set(_fields(spec)) <= set(data.columns) | {"Series", "Value"}
+    # values reach the browser unchanged, and the legend shows the original names
+    assert np.array_equal(data["s0"], df[names[0]]) and np.array_equal(data["s1"], df[names[1]])
+    assert names[0] in spec["concat"][0]["transform"][1]["calculate"]
+    assert '"Plain"' in spec["concat"][1]["transform"][1]["calculate"]
+    assert spec["concat"][0]["encoding"]["x"]["title"] == "Week"
+
+
+def test_columnar_results_are_thinned_to_the_budget():
+    result = ColumnarResult.from_arrays(np.arange(2000), {"a.b": np.sin(np.arange(2000) / 30)})
+    data, _ = _chart(result, [Panel("a", ("a.b",))], 100, 1)
+    assert len(data) <= 100 and list(data.columns) == ["x", "s0"]
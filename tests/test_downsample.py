@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from engine.downsample import downsample_frame, downsample_rows, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(1000)
+    rows = lttb_indices(x, np.sin(x / 50), 100)
+    assert len(rows) == 100
+    assert rows[0] == 0 and rows[-1] == 999
+
+
+def test_rows_stay_under_budget_for_many_series():
+    x = np.arange(5000)
+    rng = np.random.default_rng(0)
+    series = [rng.normal(size=x.size).cumsum() for _ in range(12)]
+    for budget in (10, 100, 500):
+        rows = downsample_rows(x, series, budget)
+        assert len(rows) <= budget
+        assert np.all(np.diff(rows) > 0)
+
+
+def test_short_series_are_not_thinned():
+    assert np.array_equal(downsample_rows(np.arange(50), [np.ones(50)], 500), np.arange(50))
+
+
+def test_frame_row_count():
+    df = pd.DataFrame({f"s{i}": np.random.default_rng(i).normal(size=2000) for i in range(8)})
+    assert len(downsample_frame(df, 300)) <= 300
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from engine import (
+    Custom,
+    EmissionCurve,
+    Geometric,
+    Halving,
+    LinearTaper,
+    Piecewise,
+    TokenomicsParams,
+    curve_for,
+    load_custom_emission,
+)
+
+WEEKS = 300
+CURVES = [
+    Geometric(500_000, 2.0),
+    Geometric(120_000, 0.0),
+    Halving(400_000, 26),
+    LinearTaper(600_000, 50_000, 80),
+    Custom.from_values([100.0, 0.0, 250.0, 75.5, 0.0, 10.0]),
+    Piecewise(((0, LinearTaper(300_000, 100_000, 20)), (20, Halving(100_000, 13)), (90, Geometric(20_000, 1.0)))),
+    Piecewise(((10, Geometric(50_000, 3.0)),)),
+]
+
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_cumulative_at_matches_summed_weekly(curve):
+    cumulative = np.cumsum(curve.weekly(WEEKS))
+    assert_allclose([curve.cumulative_at(week) for week in range(WEEKS)], cumulative, rtol=1e-12)
+    assert_allclose(curve.schedule(WEEKS).cumulative, cumulative, rtol=1e-12)
+
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_weeks_until_is_the_first_week_reaching_the_amount(curve):
+    weekly = curve.weekly(WEEKS)
+    cumulative = np.cumsum(weekly)
+    # halfway through each emitting week, clear of floating-point boundaries
+    for week in np.flatnonzero(weekly > 0)[::7]:
+        amount = cumulative[week] - weekly[week] / 2
+        assert curve.weeks_until(amount) == week, amount
+    for week in np.flatnonzero(weekly > 0)[::29]:
+        assert abs(curve.weeks_until(cumulative[week]) - week) <= 1
+
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_weeks_until_non_positive_amount_is_week_zero(curve):
+    assert curve.weeks_until(0) == 0
+    assert curve.weeks_until(-5.0) == 0
+
+
+def test_weeks_until_is_none_when_the_curve_never_gets_there():
+    geometric = Geometric(500_000, 2.0)
+    assert geometric.weeks_until(500_000 / 0.02 * 1.001) is None  # above the geometric limit
+    assert Custom.from_values([1.0, 2.0]).weeks_until(4.0) is None
+    assert Halving(100.0, 10).weeks_until(1e6, limit=1_000) is None
+
+
+def test_weeks_until_respects_the_search_limit():
+    flat = Geometric(1_000, 0.0)
+    assert flat.weeks_until(1_000_000) == 999
+    assert flat.weeks_until(1_000_000, limit=500) is None
+    assert LinearTaper(1_000, 1_000, 1).weeks_until(1_000_000, limit=500) is None
+
+
+@pytest.mark.parametrize("curve", CURVES)
+@pytest.mark.parametrize("steps_per_week", [7, 24])
+def test_steps_add_up_to_each_week(curve, steps_per_week):
+    weeks = 60
+    per_step = curve.per_step(np.arange(weeks * steps_per_week), steps_per_week)
+    assert_allclose(per_step.reshape(weeks, steps_per_week).sum(axis=1), curve.weekly(weeks), rtol=1e-9, atol=1e-9)
+
+
+def test_params_use_geometric_decay_unless_a_curve_is_set():
+    params = TokenomicsParams()
+    assert params.emission == Geometric(params.base_emission, params.decay_percent)
+    assert curve_for(params.base_emission, params.decay_percent, CURVES[2]) is CURVES[2]
+    assert params.replace(emission_curve=CURVES[2]).emission is CURVES[2]
+
+
+def test_geometric_batches_broadcast_over_rows():
+    curve = Geometric(np.array([[1_000.0], [2_000.0]]), np.array([[1.0], [5.0]]))
+    weekly = curve.weekly(10)
+    assert weekly.shape == (2, 10)
+    assert_allclose(weekly[1], Geometric(2_000.0, 5.0).weekly(10))
+
+
+def test_curves_must_implement_weekly_and_cumulative_at():
+    class WeeklyOnly(EmissionCurve):
+        def weekly(self, weeks):
+            return np.ones(weeks)
+
+    with pytest.raises(TypeError, match="cumulative_at"):
+        WeeklyOnly()
+
+
+def test_uploaded_custom_curves_are_parsed_once_per_content():
+    data = b"emission\n100\n50\n25\n"
+    curve = load_custom_emission(data)
+    assert curve == Custom.from_values([100.0, 50.0, 25.0])
+    assert load_custom_emission(data) is curve
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from engine import TokenomicsParams, UserParams, active_view, main_frame, passive_view
+
+SCENARIOS = [
+    TokenomicsParams(),
+    TokenomicsParams(decay_percent=0.0, weekly_fees=55_000, initial_price=1.2, weeks=52),
+    TokenomicsParams(initial_xtokens=2_000_000, base_emission=80_000, decay_percent=7.5, weeks=260),
+]
+USERS = [
+    UserParams(),
+    UserParams(my_tokens=250.0, voting_tokens=0.0, multiplier_tokens=0.0, user_volume=10_000),
+    UserParams(my_tokens=5e6, voting_tokens=4e6, multiplier_tokens=1e6, asset_weight=0.4),
+]
+
+
+def baseline_supply(params):
+    """The main page's original emission and supply code."""
+    weekly = params.base_emission * (1 - params.decay_percent / 100) ** np.arange(params.weeks)
+    circulating = params.initial_xtokens + np.cumsum(weekly)
+    return weekly, circulating
+
+
+def baseline_passive(params, my_tokens):
+    """The Passive page's original self-voting code (the lsToken loop is covered in test_lstoken.py)."""
+    _, supply = baseline_supply(params)
+    fees, price = params.weekly_fees, params.initial_price
+    weekly = my_tokens / supply * fees
+    cumulative = np.cumsum(weekly)
+    return {
+        "Your Weekly Fees": weekly,
+        "Cumulative Fees": cumulative,
+        "Relative Earnings (%)": cumulative / (my_tokens * price) * 100,
+    }
+
+
+def baseline_active(params, user):
+    """The Active page's original voting and volume code."""
+    emissions, supply = baseline_supply(params)
+    fees, price = params.weekly_fees, params.initial_price
+    voting_weekly = user.voting_tokens / supply * fees
+    voting_cumulative = np.cumsum(voting_weekly)
+
+    asset_emissions = emissions * user.asset_weight
+    effective_stake = user.multiplier_tokens * 1.05 ** np.arange(params.weeks)
+    multiplier = 1 + effective_stake / (effective_stake + user.reference_stake) * 10
+    effective_volume = user.user_volume * multiplier
+    adjusted_total = user.total_volume - user.user_volume + effective_volume
+    rewards = effective_volume / adjusted_total * asset_emissions
+    with np.errstate(divide="ignore", invalid="ignore"):
+        voting_apr = np.where(user.voting_tokens > 0, voting_weekly * 52 / (user.voting_tokens * price) * 100, 0)
+        volume_apr = np.where(user.multiplier_tokens > 0, rewards * 52 / user.multiplier_tokens * 100, 0)
+    baseline = user.user_volume / user.total_volume * asset_emissions
+    return {
+        "Voting Weekly Fees": voting_weekly,
+        "Cumulative Voting Fees": voting_cumulative,
+        "Relative Voting Earnings (%)": voting_cumulative / (user.my_tokens * price) * 100,
+        "Volume Weekly Rewards": rewards,
+        "Cumulative Volume Rewards": np.cumsum(rewards),
+        "Baseline Volume Rewards (No Multiplier)": np.cumsum(baseline),
+        "Baseline Weekly Rewards (No Multiplier)": baseline,
+        "Multiplier": multiplier,
+        "Voting APR (%)": voting_apr,
+        "Volume APR (%)": volume_apr,
+    }
+
+
+@pytest.mark.parametrize("params", SCENARIOS)
+def test_main_frame_matches_baseline(params):
+    weekly, circulating = baseline_supply(params)
+    frame = main_frame(params)
+    fdv_supply = params.locked_tokens + params.initial_xtokens + np.cumsum(weekly)
+    expected = {
+        "Weekly Emission": weekly,
+        "Circulating Voting Supply": circulating,
+        "Total Supply (FDV)": fdv_supply,
+        "Valuation ($)": circulating * params.initial_price,
+        "FDV ($)": fdv_supply * params.initial_price,
+        "Cumulative Fees ($)": np.cumsum(np.full(params.weeks, params.weekly_fees)),
+    }
+    for column, values in expected.items():
+        assert_allclose(frame[column], values, rtol=1e-12, err_msg=column)
+
+
+@pytest.mark.parametrize("params", SCENARIOS)
+@pytest.mark.parametrize("my_tokens", [1.0, 10_000.0, 3e6])
+def test_passive_view_matches_baseline(params, my_tokens):
+    view = passive_view(params, my_tokens)
+    for column, values in baseline_passive(params, my_tokens).items():
+        assert_allclose(view[column], values, rtol=1e-12, err_msg=column)
+
+
+@pytest.mark.parametrize("params", SCENARIOS)
+@pytest.mark.parametrize("user", USERS)
+def test_active_view_matches_baseline(params, user):
+    view = active_view(params, user)
+    for column, values in baseline_active(params, user).items():
+        assert_allclose(view[column], values, rtol=1e-12, err_msg=column)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from engine import TokenomicsParams, lstoken_earnings, lstoken_growth, passive_view
+
+SCENARIOS = [
+    TokenomicsParams(),
+    TokenomicsParams(decay_percent=0.0, weekly_fees=55_000, initial_price=1.2, weeks=52),
+    TokenomicsParams(initial_xtokens=2_000_000, base_emission=80_000, decay_percent=7.5, weeks=260),
+]
+
+
+def baseline_lstoken(supply, my_tokens, fees, price):
+    """The Passive page's original per-week reinvestment loop."""
+    ls_tokens, holdings, weekly = my_tokens, [], []
+    for week in range(len(supply)):
+        fee = ls_tokens / supply[week] * fees
+        ls_tokens += fee / price
+        holdings.append(ls_tokens)
+        weekly.append(fee)
+    cumulative = np.cumsum(weekly)
+    return {
+        "lsToken Weekly Fees": weekly,
+        "lsToken Cumulative Fees": cumulative,
+        "lsToken Relative Earnings (%)": cumulative / (my_tokens * price) * 100,
+        "lsToken Holdings": holdings,
+    }
+
+
+def supply_of(params):
+    weekly = params.base_emission * (1 - params.decay_percent / 100) ** np.arange(params.weeks)
+    return params.initial_xtokens + np.cumsum(weekly)
+
+
+@pytest.mark.parametrize("params", SCENARIOS)
+@pytest.mark.parametrize("my_tokens", [1.0, 10_000.0, 3e6])
+def test_cumulative_product_matches_the_loop(params, my_tokens):
+    view = passive_view(params, my_tokens)
+    expected = baseline_lstoken(supply_of(params), my_tokens, params.weekly_fees, params.initial_price)
+    for column, values in expected.items():
+        assert_allclose(view[column], values, rtol=1e-12, err_msg=column)
+
+
+def test_holder_batches_scale_one_per_token_path():
+    params = SCENARIOS[0]
+    supply = supply_of(params)
+    holdings = np.array([[1.0], [500.0], [2e6]])
+    batch = lstoken_earnings(holdings, supply, params.weekly_fees, params.initial_price)
+    assert batch.holdings.shape == (3, params.weeks)
+    for row, my_tokens in enumerate(holdings[:, 0]):
+        expected = baseline_lstoken(supply, my_tokens, params.weekly_fees, params.initial_price)
+        assert_allclose(batch.holdings[row], expected["lsToken Holdings"], rtol=1e-12)
+        assert_allclose(batch.relative_pct[row], expected["lsToken Relative Earnings (%)"], rtol=1e-12)
+    assert_allclose(lstoken_growth(supply, params.weekly_fees, params.initial_price), batch.holdings[0])
+
+
+def test_entry_price_sets_the_roi_basis_for_price_paths():
+    params = SCENARIOS[0]
+    supply = supply_of(params)
+    prices = np.linspace(0.45, 0.9, params.weeks)
+    result = lstoken_earnings(10_000.0, supply, params.weekly_fees, prices, entry_price=0.45)
+    assert_allclose(result.relative_pct, result.cumulative_fees / (10_000 * 0.45) * 100)
@@ -0,0 +1,45 @@
+import io
+
+import numpy as np
+import pytest
+
+from engine import Population, TokenomicsParams, read_population_csv, sample_population, simulate_population
+
+
+def test_fee_share_is_the_voting_balance_over_supply():
+    params = TokenomicsParams()
+    population = Population(np.array([1e6, 2e6]), np.array([0, 0], dtype=np.int8))
+    result = simulate_population(params, population)
+    supply = params.initial_xtokens + np.cumsum(params.emission.schedule(params.weeks).weekly)
+    np.testing.assert_allclose(result.fee_share, 3e6 / supply * 100)
+
+
+def test_population_larger_than_supply_collects_at_most_all_fees():
+    params = TokenomicsParams()
+    population = sample_population(100_000, seed=42)
+    result = simulate_population(params, population)
+    assert result.capped_weeks == params.weeks
+    np.testing.assert_allclose(result.fee_share, 100)
+    assert np.isfinite(result.roi).all()
+
+
+def test_population_outgrowing_supply_is_capped_from_that_week():
+    params = TokenomicsParams(weekly_fees=2e6)
+    population = Population(np.array([1.4e7]), np.array([1], dtype=np.int8))  # one compounding lsToken wallet
+    result = simulate_population(params, population)
+    assert 0 < result.capped_weeks < params.weeks
+    assert result.fee_share.max() <= 100 + 1e-9
+    assert result.fee_share[0] < 100 and np.isclose(result.fee_share[-1], 100)
+
+
+def test_zero_fees_give_a_zero_share():
+    result = simulate_population(TokenomicsParams(weekly_fees=0), sample_population(100))
+    assert np.array_equal(result.fee_share, np.zeros(104))
+    assert np.isfinite(result.roi).all()
+
+
+@pytest.mark.parametrize("balance", ["0", "-5", ""])
+def test_csv_with_non_positive_or_missing_balances_is_rejected(balance):
+    source = io.StringIO(f"balance,strategy\n100,lsToken\n{balance},active\n")
+    with pytest.raises(ValueError, match="lines 3"):
+        read_population_csv(source)
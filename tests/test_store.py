@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from engine import ColumnarResult, ScenarioStore, TokenomicsParams, main_frame, run_sweep, scenario_key
+
+
+def frame(weeks, offset=0.0):
+    return ColumnarResult.from_arrays(np.arange(weeks), {"A": np.arange(weeks) + offset, "B.c": np.ones(weeks)})
+
+
+def stored_size(tmp_path, result):
+    probe = ScenarioStore(tmp_path / "probe")
+    probe.save("probe", "frame", {}, result)
+    return probe.nbytes
+
+
+def test_scenario_key_ignores_number_types_and_tracks_changes():
+    params = TokenomicsParams()
+    assert scenario_key("main", {"params": params}) == scenario_key("main", {"params": params.replace(weeks=104.0)})
+    assert scenario_key("main", {"params": params}) != scenario_key("main", {"params": params.replace(weeks=105)})
+    assert scenario_key("main", {"params": params}) != scenario_key("passive", {"params": params})
+
+
+def test_columnar_round_trip(tmp_path):
+    store = ScenarioStore(tmp_path)
+    result = main_frame(TokenomicsParams())
+    store.save("main", "main", {"params": TokenomicsParams()}, result, label="Defaults")
+    loaded = store.load("main")
+    assert loaded.names == result.names and loaded.index_name == result.index_name
+    assert_array_equal(loaded.block, result.block)
+    assert_array_equal(loaded.index, result.index)
+    assert not loaded.block.flags.writeable
+    assert [scenario.label for scenario in store.scenarios()] == ["Defaults"]
+
+
+def test_sweep_round_trip(tmp_path):
+    store = ScenarioStore(tmp_path)
+    ranges = {"weekly_fees": np.array([1e4, 2e4]), "decay_percent": np.array([1.0, 2.0, 3.0])}
+    result = run_sweep(TokenomicsParams(), ranges)
+    store.save("sweep", "sweep", {}, result)
+    loaded = store.load("sweep")
+    assert loaded.grid_shape == result.grid_shape and loaded.weeks == result.weeks
+    assert list(loaded.axes) == list(result.axes) and list(loaded.metrics) == list(result.metrics)
+    for name, values in result.metrics.items():
+        assert_array_equal(loaded.metrics[name], values)
+
+
+def test_get_or_compute_computes_once(tmp_path):
+    store = ScenarioStore(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return frame(10)
+
+    inputs = {"params": TokenomicsParams()}
+    first = store.get_or_compute("frame", inputs, compute)
+    second = store.get_or_compute("frame", inputs, compute)
+    assert len(calls) == 1 and scenario_key("frame", inputs) in store
+    assert_array_equal(first.block, second.block)
+
+
+def test_least_recently_used_scenarios_are_evicted(tmp_path):
+    size = stored_size(tmp_path, frame(100))
+    store = ScenarioStore(tmp_path / "store", max_bytes=3 * size)
+    for key in "abc":
+        store.save(key, "frame", {}, frame(100))
+    store.load("a")  # now more recent than b
+    store.save("d", "frame", {}, frame(100))
+    assert "b" not in store and all(key in store for key in "acd")
+    assert store.nbytes <= store.max_bytes
+    assert not (tmp_path / "store" / "b").exists()
+
+
+def test_result_larger_than_the_store_is_not_kept(tmp_path):
+    store = ScenarioStore(tmp_path, max_bytes=stored_size(tmp_path, frame(100)))
+    store.save("small", "frame", {}, frame(100))
+    store.save("big", "frame", {}, frame(10_000))
+    assert "big" not in store and "small" in store and len(store) == 1
+
+
+def test_delete_and_clear(tmp_path):
+    store = ScenarioStore(tmp_path)
+    for key in "ab":
+        store.save(key, "frame", {}, frame(5))
+    store.delete("a")
+    assert "a" not in store and store.load("a") is None and len(store) == 1
+    store.clear()
+    assert len(store) == 0 and store.nbytes == 0
+
+
+def test_unknown_results_are_rejected(tmp_path):
+    with pytest.raises(TypeError):
+        ScenarioStore(tmp_path).save("x", "x", {}, object())
+
+
+def test_unusable_store_computes_without_keeping(tmp_path):
+    blocked = tmp_path / "not-a-directory"
+    blocked.write_text("")
+    store = ScenarioStore(blocked / "store")
+    calls = []
+    for _ in range(2):
+        result = store.get_or_compute("frame", {}, lambda: calls.append(1) or frame(3))
+        assert_array_equal(result.block, frame(3).block)
+    assert len(calls) == 2 and scenario_key("frame", {}) not in store
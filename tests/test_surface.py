@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from engine import Halving, TokenomicsParams, passive_view, roi_surface_for
+
+
+@pytest.mark.parametrize("params", [TokenomicsParams(), TokenomicsParams(weeks=300, emission_curve=Halving(5e5, 26))])
+@pytest.mark.parametrize("my_tokens", [1, 7.3, 10_000, 1e12])
+def test_lookup_matches_the_exact_path(params, my_tokens):
+    scaled = roi_surface_for(params).lookup(my_tokens, params.weeks)
+    exact = passive_view(params, my_tokens)
+    for name in exact.columns:
+        np.testing.assert_allclose(scaled[name], exact[name], rtol=1e-12)
+
+
+def test_shorter_horizons_share_the_yearly_rows():
+    params = TokenomicsParams(weeks=100)
+    assert roi_surface_for(params) is roi_surface_for(params.replace(weeks=97))
+    assert not roi_surface_for(params).covers(0, 100)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from engine import (
+    BATCH_METRICS,
+    Halving,
+    TokenomicsParams,
+    UserParams,
+    active_view,
+    evaluate_batch,
+    main_frame,
+    passive_view,
+    run_sweep,
+    swept_parameters,
+)
+
+
+def test_fixed_emission_curve_cannot_sweep_emission_axes():
+    params = TokenomicsParams(emission_curve=Halving(500_000, 52))
+    assert swept_parameters(params) == ("weekly_fees", "initial_price")
+    with pytest.raises(ValueError, match="Cannot sweep over \\['decay_percent'\\]"):
+        run_sweep(params, {"decay_percent": np.linspace(1, 3, 3)})
+    result = run_sweep(params, {"weekly_fees": np.array([1e4, 2e4])})
+    assert result.grid_shape == (1, 1, 2, 1)
+
+
+def test_batch_rows_match_the_single_scenario_views():
+    scenarios = [TokenomicsParams(), TokenomicsParams(decay_percent=5.0, weekly_fees=40_000, initial_price=0.8)]
+    user = UserParams()
+    columns = {name: np.array([[float(getattr(params, name))] for params in scenarios])
+               for name in ("base_emission", "decay_percent", "weekly_fees", "initial_price", "initial_xtokens",
+                            "locked_tokens")}
+    columns.update(user.to_dict())
+    block = evaluate_batch(columns, 104)
+    assert set(block) == set(BATCH_METRICS)
+    for row, params in enumerate(scenarios):
+        views = [main_frame(params), passive_view(params, user.my_tokens), active_view(params, user)]
+        for metric, values in block.items():
+            view = next(view for view in views if metric in view)
+            assert_allclose(values[row], view[metric], rtol=1e-12, err_msg=metric)
@@ -0,0 +1,35 @@
+import numpy as np
+
+from engine import TokenomicsParams, VestingSchedule, main_frame, passive_view, unlock_schedule
+
+
+def test_linear_tranche_with_cliff():
+    unlocks = unlock_schedule([100.0], [0], [4], [10], 12)
+    assert unlocks[4] == 40.0
+    assert np.allclose(unlocks[5:11], 10.0)
+    assert unlocks.sum() == 100.0
+
+
+def test_non_voting_unlocks_circulate_without_voting():
+    vesting = VestingSchedule.from_tranches([2e7, 3e7], [0, 0], [10, 0], [50, 100], [True, False])
+    params = TokenomicsParams(vesting=vesting)
+    frame = main_frame(params)
+    plain = main_frame(TokenomicsParams(vesting=VestingSchedule.from_tranches(2e7, 0, 10, 50, True)))
+
+    non_voting = np.asarray(frame["Unlocked Non-Voting Tokens"])
+    assert non_voting[-1] == 3e7
+    # voting supply, and so every fee share, ignores the non-voting tranche
+    assert np.array_equal(np.asarray(frame["Circulating Voting Supply"]), np.asarray(plain["Circulating Voting Supply"]))
+    voting_only = params.replace(vesting=VestingSchedule.from_tranches(2e7, 0, 10, 50, True))
+    assert np.array_equal(np.asarray(passive_view(params, 10_000)["Cumulative Fees"]),
+                          np.asarray(passive_view(voting_only, 10_000)["Cumulative Fees"]))
+    circulating = np.asarray(frame["Circulating Supply (incl. Non-Voting)"])
+    assert np.allclose(circulating, np.asarray(frame["Circulating Voting Supply"]) + non_voting)
+    assert np.allclose(np.asarray(frame["Valuation ($)"]), circulating * params.initial_price)
+    # unlocking moves tokens out of the locked pool without minting any
+    assert np.array_equal(np.asarray(frame["Total Supply (FDV)"]), np.asarray(plain["Total Supply (FDV)"]))
+
+
+def test_voting_only_schedules_have_no_non_voting_columns():
+    frame = main_frame(TokenomicsParams(vesting=VestingSchedule.from_tranches(1e7, 0, 0, 52)))
+    assert "Unlocked Non-Voting Tokens" not in frame.columns
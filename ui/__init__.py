@@ -0,0 +1,6 @@
+"""Streamlit-side helpers shared by the pages. The simulation itself lives in ``engine``."""
+from .charts import DEFAULT_POINT_BUDGET, ChartReport, Panel, render_panels
+from .compare import pin_scenario, pinned_scenarios
+from .profiling import begin_profile, profile_log_path, profiling_defaults, render_profile
+from .sensitivity import render_sensitivity
+from .table import render_table
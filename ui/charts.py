@@ -0,0 +1,116 @@
+"""Consolidated chart rendering.
+
+All panels of a page are drawn as one Vega-Lite ``concat`` over a single
+dataset, so the result frame is serialized and shipped to the browser once
+instead of once per ``st.line_chart``. Rows are thinned with LTTB whenever a
+series is longer than the point budget. A ``ColumnarResult`` is turned into
+a frame only for the columns and rows that are drawn.
+"""
+import json
+import time
+from dataclasses import dataclass
+
+import pyarrow as pa
+import streamlit as st
+
+from engine import ColumnarResult
+from engine.profiling import timed
+from engine.downsample import downsample_frame, downsample_rows
+
+DEFAULT_POINT_BUDGET = 500
+PANEL_WIDTH = 560
+PANEL_HEIGHT = 240
+
+
+@dataclass(frozen=True)
+class Panel:
+    title: str
+    columns: tuple
+    description: str = ""
+    labels: tuple = ()  # legend names for ``columns``, when they should not be the column names
+
+
+@dataclass(frozen=True)
+class ChartReport:
+    panels: int
+    rows: int
+    source_rows: int
+    payload_bytes: int
+    seconds: float
+
+
+def _panel_spec(panel, fields, x_title):
+    title = {"text": panel.title, "anchor": "start"}
+    if panel.description:
+        title["subtitle"] = panel.description
+    folded = [fields[column] for column in panel.columns]
+    names = json.dumps(dict(zip(folded, panel.labels or panel.columns)), ensure_ascii=False)
+    return {
+        "title": title,
+        "width": PANEL_WIDTH,
+        "height": PANEL_HEIGHT,
+        "transform": [
+            {"fold": folded, "as": ["Series", "Value"]},
+            {"calculate": f"{names}[datum.Series]", "as": "Series"},
+        ],
+        "mark": {"type": "line"},
+        "encoding": {
+            "x": {"field": "x", "type": "quantitative", "title": x_title},
+            "y": {"field": "Value", "type": "quantitative", "title": None},
+            "color": {"field": "Series", "type": "nominal", "legend": {"orient": "bottom", "title": None}},
+            "tooltip": [
+                {"field": "x", "type": "quantitative", "title": x_title},
+                {"field": "Series", "type": "nominal"},
+                {"field": "Value", "type": "quantitative", "format": ",.4~g"},
+            ],
+        },
+    }
+
+
+def _chart(df, panels, point_budget, columns):
+    """The thinned dataset and the concat spec drawing ``panels`` from it.
+
+    Vega-Lite reads ``.``, ``[`` and ``]`` in field names as nested paths, so
+    the columns are shipped under positional names (``x``, ``s0``, ``s1``, …)
+    and the display names travel in the spec.
+    """
+    used = list(dict.fromkeys(column for panel in panels for column in panel.columns))
+    if isinstance(df, ColumnarResult):
+        rows = slice(None) if len(df) <= point_budget else downsample_rows(
+            df.index, (df[column] for column in used), point_budget)
+        data = df.to_pandas(used, rows).reset_index()
+    else:
+        data = downsample_frame(df[used], point_budget).reset_index()
+    x_title = str(data.columns[0])
+    fields = {column: f"s{i}" for i, column in enumerate(used)}
+    data.columns = ["x", *fields.values()]
+    spec = {
+        "columns": columns,
+        "concat": [_panel_spec(panel, fields, x_title) for panel in panels],
+        "resolve": {"scale": {"color": "independent", "y": "independent"}},
+    }
+    return data, spec
+
+
+@timed("charts")
+def render_panels(df, panels, point_budget=None, columns=2):
+    """Draw ``panels`` from ``df`` as one chart element and report payload size and build time."""
+    started = time.perf_counter()
+    if point_budget is None:
+        point_budget = st.session_state.get("chart_point_budget", DEFAULT_POINT_BUDGET)
+
+    data, spec = _chart(df, panels, point_budget, columns)
+    st.vega_lite_chart(data, spec)
+
+    report = ChartReport(
+        panels=len(panels),
+        rows=len(data),
+        source_rows=len(df),
+        payload_bytes=pa.Table.from_pandas(data, preserve_index=False).nbytes,
+        seconds=time.perf_counter() - started,
+    )
+    st.caption(
+        f"{report.panels} charts from one dataset · {report.rows:,} of {report.source_rows:,} rows · "
+        f"{report.payload_bytes / 1024:,.1f} KB payload · built in {report.seconds * 1000:,.0f} ms"
+    )
+    return report
@@ -0,0 +1,31 @@
+"""Scenarios pinned for the Compare Scenarios page, kept in the session."""
+import streamlit as st
+
+from engine import MAX_SCENARIOS
+
+PINS_KEY = "pinned_scenarios"
+
+
+def pinned_scenarios():
+    """Pinned scenarios in pinning order, name -> ``TokenomicsParams``."""
+    return st.session_state.setdefault(PINS_KEY, {})
+
+
+def pin_scenario(params, name=""):
+    """Pin ``params`` under ``name`` (``"Scenario N"`` when blank); returns why it could not be pinned, if so."""
+    pins = pinned_scenarios()
+    for other, pinned in pins.items():
+        if pinned == params:
+            return f"These settings are already pinned as **{other}**."
+    if len(pins) >= MAX_SCENARIOS:
+        return f"At most {MAX_SCENARIOS} scenarios can be pinned. Unpin one on the Compare Scenarios page first."
+    name = name.strip()
+    if not name:
+        number = len(pins) + 1
+        while f"Scenario {number}" in pins:
+            number += 1
+        name = f"Scenario {number}"
+    if name in pins:
+        return f"A scenario named **{name}** is already pinned."
+    pins[name] = params
+    return None
@@ -0,0 +1,70 @@
+"""Sidebar panel for the per-rerun stage timings in ``engine.profiling``.
+
+Profiling is switched on from the main page sidebar and applies to every
+page. Each page calls ``begin_profile`` right after ``st.set_page_config``,
+``lap`` at its section boundaries and ``render_profile`` at the very end.
+Setting ``EMSETUP_PROFILE_LOG`` switches profiling on by default and
+appends every rerun to that JSONL file. The log path comes only from the
+server's environment; visitors cannot point it anywhere else.
+"""
+import os
+
+import streamlit as st
+
+from engine.profiling import (
+    append_profile_log,
+    current_profile,
+    latency_percentiles,
+    read_profile_log,
+    start_profile,
+    stop_profile,
+)
+
+PROFILING_KEY = "profiling"
+LOG_ENV = "EMSETUP_PROFILE_LOG"
+
+
+def profiling_defaults():
+    """Session-state defaults for the main page."""
+    return {PROFILING_KEY: bool(profile_log_path())}
+
+
+def profile_log_path():
+    """The JSONL log set by the server's ``EMSETUP_PROFILE_LOG``, or ``None``."""
+    return os.environ.get(LOG_ENV) or None
+
+
+def begin_profile(page):
+    """Start timing this rerun if profiling is switched on."""
+    stop_profile()
+    if st.session_state.get(PROFILING_KEY, bool(profile_log_path())):
+        start_profile(page)
+
+
+def render_profile():
+    """Finish the rerun's profile and show it (plus logged percentiles) in the sidebar."""
+    profile = current_profile()
+    if profile is None:
+        return
+    stages = profile.to_frame()
+    record = stop_profile()
+
+    log = profile_log_path()
+    with st.sidebar.expander("⏱️ Rerun Profile", expanded=True):
+        st.markdown(f"**{record['total_ms']:,.1f} ms** in total · cache {record['cache_hits']:,} hits / "
+                    f"{record['cache_misses']:,} misses")
+        st.dataframe(stages, column_config={
+            "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+            "Share (%)": st.column_config.NumberColumn("Share (%)", format="%.0f"),
+        })
+        if log:
+            try:
+                append_profile_log(log, record)
+                percentiles = latency_percentiles(read_profile_log(log), page=record["page"])
+            except OSError as exc:
+                st.error(f"⚠️ Could not use the profile log: {exc}")
+            else:
+                st.caption("Latency percentiles (ms) over the last reruns of this page, from the server's profile log.")
+                st.dataframe(percentiles, column_config={
+                    name: st.column_config.NumberColumn(name, format="%.1f") for name in percentiles.columns
+                })
@@ -0,0 +1,50 @@
+"""Tornado chart and per-week elasticities for ``engine.sensitivity`` results."""
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from .charts import Panel, render_panels
+
+TOP_PARAMETERS = 5
+
+
+def _tornado_chart(tornado, swing):
+    bars = pd.concat([
+        pd.DataFrame({"Parameter": tornado.index, "Change": f"-{swing:.0%}", "From": tornado["Base"],
+                      "To": tornado["Low"]}),
+        pd.DataFrame({"Parameter": tornado.index, "Change": f"+{swing:.0%}", "From": tornado["Base"],
+                      "To": tornado["High"]}),
+    ])
+    order = list(tornado.index)
+    chart = alt.Chart(bars).mark_bar().encode(
+        y=alt.Y("Parameter:N", sort=order, title=None),
+        x=alt.X("From:Q", title="Final-week value", scale=alt.Scale(zero=False)),
+        x2="To:Q",
+        color=alt.Color("Change:N", legend=alt.Legend(orient="bottom", title=None)),
+        tooltip=["Parameter", "Change", alt.Tooltip("To:Q", format=",.3f", title="Value")],
+    )
+    base = alt.Chart(pd.DataFrame({"Base": [tornado["Base"].iloc[0]]})).mark_rule(color="black").encode(x="Base:Q")
+    return chart + base
+
+
+def render_sensitivity(result, metrics, key):
+    """Ranked tornado chart for one of ``metrics``, its elasticities and their evolution over the weeks."""
+    metric = st.selectbox("Metric", metrics, key=f"{key}_metric")
+    tornado = result.tornado(metric)
+    moving = tornado[tornado["Impact"] > 0]
+    if moving.empty:
+        st.info(f"No input moves the final-week {metric} for the current settings.")
+        return
+
+    st.altair_chart(_tornado_chart(moving, result.swing))
+    st.caption(f"Final-week {metric} with each input {result.swing:.0%} lower or higher, largest effect first. "
+               f"{len(tornado) - len(moving)} inputs have no effect on it.")
+    st.dataframe(moving[["Elasticity", "Low", "Base", "High"]], column_config={
+        name: st.column_config.NumberColumn(name, format="%.3f") for name in ("Elasticity", "Low", "Base", "High")
+    })
+
+    top = tuple(moving.index[:TOP_PARAMETERS])
+    render_panels(result.elasticity_series(metric, top), [
+        Panel(f"📈 Elasticity of {metric} over time", top,
+              "% change in the metric per 1% change in each input, for the most influential inputs."),
+    ], columns=1)
@@ -0,0 +1,46 @@
+"""Paginated data table without pandas Styler.
+
+Nothing is sliced, formatted or sent to the browser until the table is
+switched on. Numbers are formatted client-side through column config, and
+only the current page of rows is passed to ``st.dataframe`` (and, for a
+``ColumnarResult``, converted to pandas).
+"""
+import math
+
+import streamlit as st
+
+from engine import ColumnarResult
+from engine.profiling import timed
+
+PAGE_SIZES = (25, 50, 100, 250, 1000)
+DEFAULT_PAGE_SIZE = 50
+
+
+@timed("table")
+def render_table(df, formats, label="📋 Show Data Table", key="data_table", description=None):
+    """Show ``df`` one page at a time; ``formats`` maps column names to printf-style formats."""
+    if not st.toggle(label, key=f"{key}_open"):
+        return
+
+    with st.container(border=True):
+        if description:
+            st.markdown(description)
+
+        col1, col2, col3 = st.columns([1, 1, 2])
+        page_size = col1.selectbox("Rows per Page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                   key=f"{key}_page_size")
+        pages = max(1, math.ceil(len(df) / page_size))
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        page = col2.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+
+        start = (page - 1) * page_size
+        end = min(start + page_size, len(df))
+        col3.markdown(f"Rows {start + 1:,}–{end:,} of {len(df):,} (page {page} of {pages})")
+
+        rows = df.to_pandas(rows=slice(start, end)) if isinstance(df, ColumnarResult) else df.iloc[start:end]
+        st.dataframe(
+            rows,
+            column_config={name: st.column_config.NumberColumn(name, format=fmt) for name, fmt in formats.items()},
+        )